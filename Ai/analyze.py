@@ -1,26 +1,13 @@
 # analyze.py
-import requests
-import json
 
-def analyze_bias(captions, model_name="llama3.2:3b"):
-    prompt = f"""
-    Here are the object-level captions extracted from the image:
-    {json.dumps(captions, indent=2)}
+from fairguard.llm import DEFAULT_MODEL, analyze_captions
 
-    1) Describe the overall scene.
-    2) Are there signs of bias in gender, age, race, religion, or other factors?
-    3) Suggest ways to make the image more inclusive if needed.
+def analyze_bias(captions, model_name=DEFAULT_MODEL, image_size=None):
     """
-
-    payload = {
-        "model": model_name,
-        "prompt": prompt
-    }
-
-    response = requests.post(
-        "http://localhost:11434/api/generate",
-        headers={"Content-Type": "application/json"},
-        json=payload
-    )
-
-    return response.text
+    Asks the local Ollama model for a structured bias analysis of the object captions.
+    Captions are compacted to a token budget first (pass the image's (width, height) to drop
+    tiny boxes), and identical caption sets are answered from the cache (see fairguard/llm.py).
+    Returns:
+        {"scene", "bias_categories", "suggestions", "model", "prompt_metrics"}
+    """
+    return analyze_captions(captions, model=model_name, image_size=image_size)
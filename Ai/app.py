@@ -1,11 +1,18 @@
 import streamlit as st
-import easyocr
-import numpy as np
-from PIL import Image
-import io # To handle uploaded file bytes
-import re # For regex in PII detection
 import pandas as pd # For audience segmentation simulation
-from transformers import pipeline # For image captioning
+import os
+from fairguard import pipeline # Locked model calls and the batch image pipeline
+from fairguard.engine import analyze_visual, overall_bias_score # Shared analysis engine
+from fairguard.audience import simulate_audience_data, analyze_audience_bias # Audience (disparate impact) engine
+from fairguard.result_model import FlagTable, make_record # Compact result records
+from fairguard.result_store import ResultStore # Local audit store
+from fairguard.schema_profiler import get_schema # Sensitive-column detection
+from fairguard.rule_stats import RULE_STATS # Optional per-rule counters
+from fairguard.prefilter import analyze_copy # Fast all-clear path for clean copies
+from fairguard.memo import MemoCache, content_hash # Memoized, off-thread model calls
+from fairguard.batch_ingest import open_creatives, run_batched # Lazy zip/PDF ingestion, bounded batch pipeline
+from fairguard.representation import CampaignAggregator # Campaign-level representation counters
+from fairguard.warmup import FAILED, READINESS, format_report, parse_names, warm_up_in_background # Model warm-up
 
 # --- Page Configuration ---
 # THIS MUST BE THE VERY FIRST STREAMLIT COMMAND IN YOUR SCRIPT
@@ -16,383 +23,142 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# --- EasyOCR Reader Initialization ---
+# --- Models ---
+# EasyOCR, the BLIP captioning pipeline and YOLO (person boxes for the batch page) are loaded
+# by fairguard.models and shared by all sessions. They are warmed up (loaded + one dummy inference) on a background thread as soon as
+# the app first runs, so the text and audience pages are usable meanwhile; image analysis waits
+# for readiness. FAIRGUARD_MODEL_DIR loads them from a local directory without network access.
 @st.cache_resource
-def get_easyocr_reader():
+def start_model_warm_up():
     """
-    Initializes and returns an EasyOCR reader.
-    Models are downloaded on the first run.
+    Starts the one-time, process-wide model warm-up (FAIRGUARD_WARMUP_MODELS, default
+    "ocr,caption,detect").
     """
-    return easyocr.Reader(['en'], gpu=False) # Set gpu=True if you have a compatible GPU and drivers
+    return warm_up_in_background(parse_names(os.environ.get("FAIRGUARD_WARMUP_MODELS", "ocr,caption,detect")))
 
-# Initialize the OCR reader globally
-reader = get_easyocr_reader()
+model_warm_up = start_model_warm_up()
 
-# --- Image Captioning Pipeline Initialization ---
+def wait_for_models():
+    """
+    Blocks (with a spinner) until the warm-up has finished; reports a failed warm-up.
+    """
+    if not READINESS.is_ready and model_warm_up.is_alive():
+        with st.spinner("Loading and warming up models... (first start only)"):
+            model_warm_up.join()
+    if READINESS.state == FAILED:
+        st.warning(format_report(READINESS.snapshot()))
+
+# --- Results Store Initialization ---
+@st.cache_resource
+def get_result_store():
+    """
+    Opens the local audit store that every analysis is recorded into.
+    Set FAIRGUARD_STORE to change its location.
+    """
+    return ResultStore(os.environ.get("FAIRGUARD_STORE", "fairguard_results.db")), FlagTable()
+
+result_store, flag_table = get_result_store()
+
+# --- Campaign Representation ---
 @st.cache_resource
-def get_image_captioning_pipeline():
+def get_campaign_aggregator():
     """
-    Initializes and returns a Hugging Face image-to-text pipeline (BLIP model).
-    This model generates a descriptive caption for the image.
+    Process-wide representation counters keyed by the sidebar campaign name, so a campaign
+    uploaded over several batches (or sessions) is judged as a whole.
     """
-    # Using Salesforce/blip-image-captioning-base for general image captioning.
-    # We'll use default generation parameters as custom ones caused issues.
-    return pipeline("image-to-text", model="Salesforce/blip-image-captioning-base")
+    return CampaignAggregator()
 
-# Initialize the image captioning pipeline globally
-image_captioner = get_image_captioning_pipeline()
+campaign_aggregator = get_campaign_aggregator()
+
+# --- Model Result Cache ---
+@st.cache_resource
+def get_model_cache():
+    """
+    Process-wide memo of OCR and caption results keyed by image content hash, shared by all
+    sessions (bounded size, 1 hour TTL). Misses run on a small background pool so the
+    script thread can render partial results while the models work.
+    """
+    return MemoCache(max_entries=256, ttl=3600, max_workers=2)
+
+model_cache = get_model_cache()
+
+@st.cache_data(max_entries=4096, ttl=3600, show_spinner=False)
+def cached_analyze_copy(copy):
+    """
+    Memoized bias/PII/harmful-content analysis of one ad copy.
+    """
+    return analyze_copy(copy)
 
 
 # --- Utility Function for OCR ---
-def extract_text_from_image(image_bytes):
+def run_ocr(image_bytes):
     """
-    Extracts text from an image using EasyOCR.
+    Extracts text from an image using EasyOCR. Safe to call off the script thread; the OCR
+    lock in fairguard.pipeline keeps it from overlapping a batch.
     Args:
         image_bytes: Bytes of the image file (e.g., from st.file_uploader).
     Returns:
-        A string containing all extracted text, or an empty string.
+        A string containing all extracted text.
     """
-    try:
-        image = Image.open(io.BytesIO(image_bytes)).convert("RGB")
-        image_np = np.array(image)
-        results = reader.readtext(image_np, detail=0) 
-        return " ".join(results)
-    except Exception as e:
-        st.error(f"Error extracting text from image: {e}")
-        return ""
+    return pipeline.ocr_text(image_bytes)
+
+# --- Utility Function for Image Captioning ---
+def generate_image_caption(image_bytes):
+    """
+    Generates a descriptive caption with the BLIP pipeline. Safe to call off the script thread;
+    the captioning lock in fairguard.pipeline keeps it from overlapping a batch.
+    Returns:
+        The caption, or an empty string if the model produced none.
+    """
+    return pipeline.caption_image(image_bytes)
 
 # --- New: Function for Visual Context Analysis (using Image Captioning) ---
-def analyze_image_for_visual_context(image_bytes, extracted_text=""):
+def analyze_image_for_visual_context(image_bytes, extracted_text="", generated_caption=None):
     """
     Generates a descriptive caption for the image and analyzes it for potential biases.
     Also attempts to flag sensitive visual contexts based on caption content and OCR text.
+    Pass `generated_caption` to reuse a caption that was already computed.
     Returns categorized bias flags and a score.
     """
-    visual_bias_categories = {
-        "gender": [],
-        "age": [],
-        "stereotypical_role": [],
-        "benevolent_sexism": [],
-        "racial_socioeconomic": [],
-        "ableism": []
-    }
-    visual_bias_score = 0
-    generated_caption = ""
-    all_visual_flags = [] # To collect all raw flags for overall check
-
     try:
-        image = Image.open(io.BytesIO(image_bytes)).convert("RGB")
-        
-        caption_results = image_captioner(image) 
-        if caption_results and caption_results[0] and 'generated_text' in caption_results[0]:
-            generated_caption = caption_results[0]['generated_text']
+        if generated_caption is None:
+            generated_caption = generate_image_caption(image_bytes)
+        if generated_caption:
             st.write(f"**Generated Image Caption:** `{generated_caption}`")
-            
-            # Analyze the generated caption for bias using the text bias detector
-            # This will populate the bias_categories based on the caption text
-            caption_bias_analysis = analyze_text_for_bias(generated_caption)
-            
-            # Merge bias categories and score from caption analysis
-            for category, flags in caption_bias_analysis['bias_categories'].items():
-                visual_bias_categories[category].extend(flags)
-                all_visual_flags.extend(flags) # Add to general list for overall check
-            visual_bias_score += caption_bias_analysis['bias_score']
-
-            # --- Advanced (Rule-based) Visual Bias Detection based on Caption and OCR text ---
-            caption_lower = generated_caption.lower()
-            text_lower = extracted_text.lower() # Use OCR text for contextual flagging
-
-            # Heuristic for detecting contrasting individuals in a "struggle/freedom" narrative (from previous example)
-            if ('man' in caption_lower and 'suit' in caption_lower) and \
-               ('man' in caption_lower or 'person' in caption_lower or 'people' in caption_lower) and \
-               ('struggling' in text_lower or 'money' in text_lower or 'financial freedom' in text_lower):
-                flag = "Potential racial/socio-economic stereotype implied by contrasting individuals in a financial narrative. **Requires Human Review.**"
-                visual_bias_categories["racial_socioeconomic"].append(flag)
-                all_visual_flags.append(flag)
-                visual_bias_score += 5 
-                
-            # Heuristic: Detecting "Benevolent Sexism/Vulnerability" in visuals (from previous example)
-            if ('woman' in caption_lower or 'female' in caption_lower) and \
-               ('car' in caption_lower or 'vehicle' in caption_lower) and \
-               ('safety' in text_lower or 'safe' in text_lower or 'protection' in text_lower or 'confidence starts with feeling safe' in text_lower) and \
-               ('especially for women' in text_lower or 'for women' in text_lower): 
-                flag = "Potential benevolent sexism/vulnerability stereotype (e.g., implying women need special safety). **Requires Human Review.**"
-                visual_bias_categories["benevolent_sexism"].append(flag)
-                all_visual_flags.append(flag)
-                visual_bias_score += 4 
-
-            # NEW HEURISTIC: Detecting potential ableism/exclusion in active contexts (more specific to caption)
-            active_sport_keywords = ['skateboard', 'skateboarding', 'sport', 'active', 'run', 'jump', 'play']
-            if ('person' in caption_lower or 'man' in caption_lower or 'people' in caption_lower) and \
-               any(keyword in text_lower for keyword in active_sport_keywords) and \
-               ('sitting' in caption_lower or 'seated' in caption_lower or 'wheelchair' in caption_lower or 'bench' in caption_lower): 
-                flag = "Potential ableism/exclusion in active sport context (e.g., person in wheelchair with active sport ad). **Requires Human Review.**"
-                visual_bias_categories["ableism"].append(flag)
-                all_visual_flags.append(flag)
-                visual_bias_score += 4 
-
         else:
             st.warning("Could not generate a descriptive caption for the image.")
+        return analyze_visual(generated_caption, extracted_text)
 
     except Exception as e:
         st.error(f"Error analyzing image visual context: {e}")
-        all_visual_flags.append("Error during visual analysis.")
-
-    return {
-        "generated_caption": generated_caption,
-        "visual_flags": all_visual_flags, # Keep for backward compatibility if needed, but categories are primary
-        "bias_categories": visual_bias_categories,
-        "is_visually_biased": len(all_visual_flags) > 0,
-        "visual_bias_score": visual_bias_score
-    }
-
-
-# --- Enhanced Bias Detection and Security Guardrails ---
-
-def analyze_text_for_bias(text):
-    """
-    Analyzes text for potential gender, racial, age, or other biases.
-    Uses simple keyword matching and stereotypical context detection.
-    Returns categorized bias flags and a score.
-    """
-    bias_categories = {
-        "gender": [],
-        "age": [],
-        "stereotypical_role": [],
-        "benevolent_sexism": [],
-        "racial_socioeconomic": [],
-        "ableism": []
-    }
-    suggestions = []
-    bias_score = 0 # Initialize bias score
-    all_flags = [] # To collect all raw flags for overall check
-
-    text_lower = text.lower()
-
-    # Gender Bias (direct language) - Score: +1 for each
-    gender_keywords_male = ['businessman', 'he', 'his', 'him', 'gentleman']
-    gender_keywords_female = ['businesswoman', 'she', 'her', 'lady']
-    
-    if any(keyword in text_lower for keyword in gender_keywords_male) and \
-       not any(keyword in text_lower for keyword in gender_keywords_female) and \
-       not any(k in text_lower for k in ['person', 'individual', 'they', 'their', 'everyone']):
-        flag = "Male-centric language detected."
-        bias_categories["gender"].append(flag)
-        all_flags.append(flag)
-        suggestions.append("Consider using gender-neutral terms like 'business professional', 'they/their', 'individuals'.")
-        bias_score += 1
-    elif any(keyword in text_lower for keyword in gender_keywords_female) and \
-         not any(keyword in text_lower for keyword in gender_keywords_male) and \
-         not any(k in text_lower for k in ['person', 'individual', 'they', 'their', 'everyone']):
-        flag = "Female-centric language detected."
-        bias_categories["gender"].append(flag)
-        all_flags.append(flag)
-        suggestions.append("Consider using gender-neutral terms like 'business professional', 'they/their', 'individuals'.")
-        bias_score += 1
-
-    # Age Bias (simple keywords) - Score: +1 for each
-    age_keywords_old = ['retiree', 'elderly', 'senior citizen', 'golden years', 'pensioner']
-    age_keywords_young = ['youth', 'millennial', 'gen z', 'youngster']
-
-    if any(keyword in text_lower for keyword in age_keywords_old) and \
-       not any(keyword in text_lower for keyword in ['all ages', 'everyone', 'diverse', 'inclusive']):
-        flag = "Targeting only older demographic, potentially excluding others."
-        bias_categories["age"].append(flag)
-        all_flags.append(flag)
-        suggestions.append("Ensure target audience is clearly defined. Use inclusive language if the product is for all ages.")
-        bias_score += 1
-    if any(keyword in text_lower for keyword in age_keywords_young) and \
-       not any(keyword in text_lower for k in ['all ages', 'everyone', 'diverse', 'inclusive']):
-        flag = "Targeting only younger demographic, potentially excluding others."
-        bias_categories["age"].append(flag)
-        all_flags.append(flag)
-        suggestions.append("Ensure target audience is clearly defined. Use inclusive language if the product is for all ages.")
-        bias_score += 1
-
-    # Stereotypical Role Bias (Textual) - Score: +2 for each strong match
-    gender_best_phrases = [
-        'women know best', 'men know best', 'ladies first', 'gentlemen only',
-        'woman\'s touch', 'man of the house', 'for her', 'for him'
-    ]
-
-    female_stereotypical_products_roles = ['scrub', 'clean', 'kitchen', 'home', 'dishes', 'laundry', 'cooking', 'beauty', 'makeup', 'fashion', 'jewelry', 'nurture', 'family', 'diet', 'weight loss']
-    male_stereotypical_products_roles = ['tools', 'cars', 'garage', 'finance', 'business', 'power', 'strength', 'sports', 'tech', 'gadgets', 'gaming', 'investing']
-
-    # Check for female stereotypical bias
-    if any(phrase in text_lower for phrase in gender_best_phrases) and \
-       any(prod_role in text_lower for prod_role in female_stereotypical_products_roles):
-        flag = "Linking women to domestic/beauty roles."
-        bias_categories["stereotypical_role"].append(flag)
-        all_flags.append(flag)
-        suggestions.append("Avoid reinforcing traditional gender stereotypes. Focus on product benefits for all users, regardless of gender. Use gender-neutral phrasing and imagery.")
-        bias_score += 2
-
-    # Check for male stereotypical bias
-    if any(phrase in text_lower for phrase in gender_best_phrases) and \
-       any(prod_role in text_lower for prod_role in male_stereotypical_products_roles):
-        flag = "Linking men to power/tech/sports roles."
-        bias_categories["stereotypical_role"].append(flag)
-        all_flags.append(flag)
-        suggestions.append("Avoid reinforcing traditional gender stereotypes. Focus on product benefits for all users, regardless of gender. Use gender-neutral phrasing and imagery.")
-        bias_score += 2
-    
-    # Benevolent Sexism / Vulnerability Bias (Textual) - Score: +4 for strong match
-    if ('especially for women' in text_lower or 'for women' in text_lower) and \
-       ('safety' in text_lower or 'safe' in text_lower or 'protection' in text_lower or 'confidence starts with feeling safe' in text_lower):
-        flag = "Implies women need special safety/protection or derive confidence from it. **Requires Human Review.**"
-        bias_categories["benevolent_sexism"].append(flag)
-        all_flags.append(flag)
-        suggestions.append("Ensure safety messages are universal or focus on features, not gender-specific vulnerability. Confidence should stem from internal agency.")
-        bias_score += 4 
-
-    # Racial/Socio-economic/Ableism Sensitive Bias (Conceptual for text-only keywords)
-    problematic_terms = ['primitive', 'backward', 'exotic', 'foreigner', 'ghetto', 'terrorist', 'struggling', 'poverty', 'wealth', 'freedom', 'disabled', 'handicap', 'wheelchair'] 
-    if any(term in text_lower for term in problematic_terms):
-        flag = "Use of problematic or stereotypical language related to race/origin/religion/socio-economic status/disability. Requires urgent human review."
-        # This flag can cover multiple categories, for simplicity in hackathon, we combine.
-        if 'struggling' in text_lower or 'poverty' in text_lower or 'wealth' in text_lower or 'freedom' in text_lower:
-            bias_categories["racial_socioeconomic"].append(flag)
-        if 'disabled' in text_lower or 'handicap' in text_lower or 'wheelchair' in text_lower:
-            bias_categories["ableism"].append(flag)
-        
-        # If it's not specifically socio-economic or ableism, but still problematic
-        if not bias_categories["racial_socioeconomic"] and not bias_categories["ableism"]:
-            bias_categories["racial_socioeconomic"].append(flag) # Default to this for other problematic terms
-
-        all_flags.append(flag)
-        suggestions.append("Review language for any unintended racial, cultural, religious, socio-economic, or disability-related stereotypes/insensitivities.")
-        bias_score += 3 # Higher score for sensitive categories
-
-    return {
-        "is_biased": len(all_flags) > 0,
-        "bias_categories": bias_categories,
-        "suggestions": suggestions,
-        "bias_score": bias_score
-    }
-
-def check_for_pii(text):
+        results = analyze_visual("", extracted_text)
+        results["visual_flags"].append("Error during visual analysis.")
+        results["is_visually_biased"] = True
+        return results
+
+# --- Batch Analysis (multi-file, zip and PDF uploads) ---
+# The pipeline itself (and the per-model locks it shares with the single-image path) lives in
+# fairguard/pipeline.py
+BATCH_SIZE = int(os.environ.get("FAIRGUARD_BATCH_SIZE", "8"))
+BATCH_IN_FLIGHT = 2 # Batches decoded/analyzed at once; bounds memory regardless of archive size
+
+def show_representation(report):
     """
-    Checks text for common patterns of Personal Identifiable Information (PII).
+    Campaign representation panel for the batch page (see fairguard/representation.py).
     """
-    pii_found = []
-
-    # Email addresses
-    emails = re.findall(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', text)
-    if emails:
-        pii_found.extend([f"Email: {e}" for e in emails])
-
-    # Phone numbers (simple patterns: XXX-XXX-XXXX, (XXX) XXX-XXXX, XXX XXX XXXX)
-    phone_numbers = re.findall(r'\b(?:\d{3}[-.\s]??\d{3}[-.\s]??\d{4}|\(\d{3}\)\s*\d{3}[-.\s]??\d{4})\b', text)
-    if phone_numbers:
-        pii_found.extend([f"Phone: {p}" for p in phone_numbers])
-
-    # Basic credit card pattern (highly simplified and not robust for real security)
-    # This is just for demo purposes in a hackathon, real CC detection is complex.
-    cc_numbers = re.findall(r'\b(?:\d{4}[- ]){3}\d{4}\b', text)
-    if cc_numbers:
-        pii_found.extend([f"Credit Card (potential): {c}" for c in cc_numbers])
-
-    return {
-        "has_pii": len(pii_found) > 0,
-        "detected_items": pii_found
-    }
-
-def check_for_harmful_content(text):
-    """
-    Checks text for overtly harmful, offensive, or manipulative content.
-    """
-    harmful_terms = [
-        'kill', 'hate', 'destroy', 'bomb', 'attack', 'violence', 'exploit',
-        'manipulate', 'deceive', 'fraud', 'illegal', 'scam', 'cheat', 'offensive',
-        'slur', 'discriminat', 'sexist', 'racist' # Added more
-    ]
-    detected_harm = [term for term in harmful_terms if term in text.lower()]
-
-    return {
-        "has_harmful_content": len(detected_harm) > 0,
-        "detected_items": detected_harm
-    }
-
-def simulate_audience_data(num_samples=1000):
-    """
-    Simulates an audience dataset with intentional biases.
-    """
-    data = {
-        'customer_id': range(num_samples),
-        'age_group': np.random.choice(['18-25', '26-40', '41-60', '60+'], num_samples, p=[0.25, 0.35, 0.25, 0.15]),
-        'gender': np.random.choice(['Male', 'Female', 'Non-binary'], num_samples, p=[0.48, 0.48, 0.04]),
-        'income_level': np.random.choice(['Low', 'Medium', 'High'], num_samples, p=[0.3, 0.5, 0.2]),
-        'ad_targeted': False # Default
-    }
-    df = pd.DataFrame(data)
-
-    # Introduce bias:
-    # Bias 1: Less likely to target '60+' age group
-    df.loc[df['age_group'] == '60+', 'ad_targeted'] = np.random.rand(len(df[df['age_group'] == '60+'])) < 0.3 # 30% target rate
-    # Bias 2: Slightly less likely to target 'Non-binary' gender
-    df.loc[df['gender'] == 'Non-binary', 'ad_targeted'] = np.random.rand(len(df[df['gender'] == 'Non-binary'])) < 0.6 # 60% target rate
-    # General targeting for others
-    df.loc[df['ad_targeted'] == False, 'ad_targeted'] = np.random.rand(len(df[df['ad_targeted'] == False])) < 0.75 # 75% target rate for others
-
-    return df
-
-def analyze_audience_bias(df, protected_attribute, target_column='ad_targeted'):
-    """
-    Analyzes audience data for bias using disparate impact ratio.
-    Returns results including a bias score for the audience segmentation.
-    """
-    results = {}
-    audience_bias_score = 0 # Initialize score for audience bias
-    
-    if protected_attribute not in df.columns:
-        return {"error": f"Protected attribute '{protected_attribute}' not found in data."}
+    st.subheader("Campaign Representation")
+    st.write(f"{report['images']} creatives, {report['images_with_people']} showing people, "
+             f"{report['persons_detected']} person boxes detected.")
+    for attribute, summary in report["attributes"].items():
+        st.markdown(f"**{attribute.capitalize()}**")
+        st.dataframe(pd.DataFrame({"Mentions": summary["appearances"], "Share": summary["shares"]}))
+        for flag in summary["underrepresented_groups"]:
+            st.warning(f"Under-represented: {flag}")
+        for flag in summary["biased_roles"]:
+            st.warning(flag)
+    if not report["is_biased"]:
+        st.success("No representation imbalance detected across the campaign.")
 
-    groups = df[protected_attribute].unique()
-    
-    if len(groups) < 2:
-        return {"info": f"Not enough groups in '{protected_attribute}' to analyze bias."}
-
-    targeting_rates = df.groupby(protected_attribute)[target_column].mean()
-    privileged_group = targeting_rates.idxmax()
-    privileged_rate = targeting_rates.max()
-
-    results['privileged_group'] = privileged_group
-    results['targeting_rates'] = targeting_rates.to_dict()
-    results['disparate_impact_ratios'] = {}
-    results['biased_groups'] = []
-
-    for group in groups:
-        if group == privileged_group:
-            continue
-        
-        unprivileged_rate = targeting_rates[group]
-        if privileged_rate > 0: # Avoid division by zero
-            dir_value = unprivileged_rate / privileged_rate
-        else:
-            dir_value = 0 
-
-        results['disparate_impact_ratios'][group] = dir_value
-        
-        if dir_value < 0.8 or dir_value > 1.25:
-            results['biased_groups'].append(f"{group} (DIR: {dir_value:.2f})")
-            # Assign points for each biased group detected in audience segmentation
-            audience_bias_score += 1 
-
-    results['is_biased'] = len(results['biased_groups']) > 0
-    results['audience_bias_score'] = audience_bias_score # Add score to results
-    return results
-
-# --- New: Overall Bias Score Calculation ---
-def calculate_overall_bias_score(text_bias_score, visual_bias_score):
-    """
-    Calculates an overall bias score based on textual and visual analysis.
-    This is a simple sum for demonstration.
-    """
-    overall_score = text_bias_score + visual_bias_score
-    # Normalize to a 0-10 scale for easier interpretation (example scaling)
-    # Max possible score depends on your rule weighting. Let's assume max 10-15 for simplicity.
-    normalized_score = min(overall_score, 10) # Cap at 10 for display
-    return normalized_score
 
 # --- Header ---
 st.title("🛡️ FairGuard: Ethical AI Guardrail for Marketing Automation")
@@ -409,6 +175,15 @@ page_selection = st.sidebar.radio(
     ("Ad Copy Bias & Security", "Audience Segmentation Bias", "Image Ad Analysis")
 )
 
+campaign_name = st.sidebar.text_input("Campaign (for audit records):", value="", key="campaign_name")
+
+if RULE_STATS.enabled:
+    with st.sidebar.expander("Rule statistics"):
+        st.dataframe(pd.DataFrame(RULE_STATS.report()))
+
+with st.sidebar.expander(f"Model status: {READINESS.state}"):
+    st.text(format_report(READINESS.snapshot()))
+
 st.sidebar.markdown("---")
 st.sidebar.info(
     "FairGuard helps marketing teams identify and mitigate biases, "
@@ -431,7 +206,11 @@ if page_selection == "Ad Copy Bias & Security":
         key="ad_copy_input"
     )
 
-    if st.button("Analyze Ad Copies", key="analyze_ad_copy_btn"):
+    analyze_clicked = st.button("Analyze Ad Copies", key="analyze_ad_copy_btn")
+    # Keep showing results on reruns triggered by other widgets, as long as the input is unchanged
+    if analyze_clicked:
+        st.session_state['analyzed_ad_copy_input'] = ad_copy_input
+    if analyze_clicked or (ad_copy_input and st.session_state.get('analyzed_ad_copy_input') == ad_copy_input):
         if ad_copy_input:
             ad_copies = [copy.strip() for copy in ad_copy_input.split('\n') if copy.strip()]
             st.subheader("Analysis Results:")
@@ -442,7 +221,8 @@ if page_selection == "Ad Copy Bias & Security":
                 
                 # Perform Bias Analysis
                 st.markdown("##### Bias Analysis:")
-                bias_results = analyze_text_for_bias(copy)
+                # Clean copies are proven all-clear by the pre-screen without the full rule engine
+                bias_results, pii_results, harmful_results = cached_analyze_copy(copy)
                 
                 if bias_results['is_biased']:
                     st.error("Potential Bias Detected!")
@@ -460,8 +240,6 @@ if page_selection == "Ad Copy Bias & Security":
                 
                 # Perform Security Checks
                 st.markdown("##### Security Checks:")
-                pii_results = check_for_pii(copy)
-                harmful_results = check_for_harmful_content(copy)
 
                 compliance_risk = False
                 if pii_results['has_pii']:
@@ -483,6 +261,12 @@ if page_selection == "Ad Copy Bias & Security":
                 else:
                     st.success("Compliance Risk: LOW")
 
+                if analyze_clicked: # Record once per click, not on every rerun
+                    result_store.add_records(
+                        [make_record(flag_table, copy, bias_results, pii_results, harmful_results, campaign=campaign_name)],
+                        flag_table
+                    )
+
         else:
             st.warning("Please enter some ad copies to analyze.")
 
@@ -495,10 +279,21 @@ elif page_selection == "Audience Segmentation Bias":
 
     st.info("Using a simulated dataset for demonstration purposes with intentional biases.")
     
-    if st.button("Generate & Analyze Simulated Audience Data", key="load_audience_data_btn"):
+    analyze_clicked = st.button("Generate & Analyze Simulated Audience Data", key="load_audience_data_btn")
+    regenerate_clicked = st.button("Regenerate Data", key="regenerate_audience_data_btn")
+
+    # The simulated dataset and its analyses live in session state: reruns and repeated clicks
+    # reuse them, and only "Regenerate Data" draws a new sample.
+    new_data = (analyze_clicked and 'simulated_audience_df' not in st.session_state) or regenerate_clicked
+    if new_data:
         with st.spinner("Generating and analyzing data..."):
             simulated_df = simulate_audience_data(num_samples=1000)
             st.session_state['simulated_audience_df'] = simulated_df # Store in session state
+            st.session_state['audience_bias_analyses'] = {}
+
+    if 'simulated_audience_df' in st.session_state:
+        simulated_df = st.session_state['simulated_audience_df']
+        audience_bias_analyses = st.session_state.setdefault('audience_bias_analyses', {})
 
         st.subheader("Simulated Audience Data (First 5 rows):")
         st.dataframe(simulated_df.head())
@@ -506,10 +301,15 @@ elif page_selection == "Audience Segmentation Bias":
         st.subheader("Bias Analysis by Protected Attribute:")
         
         overall_audience_bias_score = 0
-        protected_attributes = ['gender', 'age_group', 'income_level']
+        # Protected attributes are inferred from column names and values (cached per header row)
+        protected_attributes = [
+            attr for attr in get_schema(simulated_df)['protected_attributes'] if attr != 'ad_targeted'
+        ]
         for attr in protected_attributes:
             st.markdown(f"##### Analyzing Bias for: **{attr.replace('_', ' ').title()}**")
-            bias_analysis = analyze_audience_bias(simulated_df, attr)
+            if attr not in audience_bias_analyses:
+                audience_bias_analyses[attr] = analyze_audience_bias(simulated_df, attr)
+            bias_analysis = audience_bias_analyses[attr]
             
             if "error" in bias_analysis:
                 st.error(bias_analysis["error"])
@@ -535,6 +335,13 @@ elif page_selection == "Audience Segmentation Bias":
                 st.bar_chart(df_plot.set_index(attr))
                 st.markdown("---")
         
+        if new_data and campaign_name: # Record each generated dataset once, under its content hash
+            result_store.add_audience_stats(
+                campaign_name,
+                content_hash(simulated_df.to_csv(index=False)),
+                {attr: simulated_df[attr].value_counts().to_dict() for attr in protected_attributes}
+            )
+
         st.subheader("Overall Audience Segmentation Bias Score:")
         st.metric("Audience Bias Score (sum of flags per attribute)", overall_audience_bias_score)
 
@@ -550,31 +357,54 @@ elif page_selection == "Image Ad Analysis":
     and analyze it for biases and security concerns.
     """)
 
-    uploaded_file = st.file_uploader(
-        "Choose an image file...", type=["png", "jpg", "jpeg"], key="image_uploader"
+    upload_mode = st.radio(
+        "Upload mode:", ("Single image", "Batch (images, zip archives, PDFs)"),
+        horizontal=True, key="image_upload_mode"
     )
 
-    if uploaded_file is not None:
-        st.image(uploaded_file, caption='Uploaded Image', use_column_width=True)
-        st.write("") # Add some space
-
-        if st.button("Analyze Image Ad", key="analyze_image_btn"):
-            with st.spinner("Extracting text and analyzing... This might take a moment (especially on first run for models)."):
-                # --- OCR Text Extraction ---
-                extracted_text = extract_text_from_image(uploaded_file.getvalue()) 
+    if upload_mode == "Single image":
+        uploaded_file = st.file_uploader(
+            "Choose an image file...", type=["png", "jpg", "jpeg"], key="image_uploader"
+        )
+
+        if uploaded_file is not None:
+            st.image(uploaded_file, caption='Uploaded Image', use_column_width=True)
+            st.write("") # Add some space
+
+            image_bytes = uploaded_file.getvalue()
+            image_key = content_hash(image_bytes)
+            analyze_clicked = st.button("Analyze Image Ad", key="analyze_image_btn")
+            if analyze_clicked:
+                st.session_state['analyzed_image_key'] = image_key
+
+            # Re-render (from cache) on reruns as long as the same image is loaded
+            if analyze_clicked or st.session_state.get('analyzed_image_key') == image_key:
+                wait_for_models()
+                # OCR and captioning start together on the background pool (or resolve instantly
+                # from the cache); text-based results render as soon as OCR is done.
+                ocr_future = model_cache.submit(("ocr", image_key), run_ocr, image_bytes)
+                caption_future = model_cache.submit(("caption", image_key), generate_image_caption, image_bytes)
+
+                with st.spinner("Extracting text... This might take a moment (especially on first run for models)."):
+                    # --- OCR Text Extraction ---
+                    try:
+                        extracted_text = ocr_future.result()
+                    except Exception as e:
+                        st.error(f"Error extracting text from image: {e}")
+                        extracted_text = ""
                 
                 st.subheader("Extracted Text:")
                 if extracted_text:
                     st.info(extracted_text)
                 else:
                     st.warning("No text could be extracted from the image or an error occurred. Please try a different image or ensure text is clear.")
-                
+            
                 st.subheader("Bias & Security Analysis of Ad Content:")
-                
+            
                 # --- Textual Bias Analysis (from OCR) ---
                 st.markdown("##### Textual Bias Analysis (from OCR):")
-                text_bias_results = analyze_text_for_bias(extracted_text)
-                
+                text_bias_results, pii_results, harmful_results = cached_analyze_copy(extracted_text)
+            
                 if text_bias_results['is_biased']:
                     st.error("Potential Textual Bias Detected!")
                     for category, flags in text_bias_results['bias_categories'].items():
@@ -587,11 +417,35 @@ elif page_selection == "Image Ad Analysis":
                 else:
                     st.success("No significant textual bias detected.")
                     st.metric("Textual Bias Score (0-10)", text_bias_results['bias_score'])
-                
+
+                # --- Security Checks (only need the OCR text, so shown before the caption is ready) ---
+                st.markdown("##### Security Checks:")
+
+                compliance_risk = False
+                if pii_results['has_pii']:
+                    st.error(f"PII Detected! Found: {', '.join(pii_results['detected_items'])}. This information should be redacted.")
+                    st.write("Suggestions: Remove or redact sensitive personal information before public display.")
+                    compliance_risk = True
+                else:
+                    st.success("No Personal Identifiable Information (PII) found.")
+
+                if harmful_results['has_harmful_content']:
+                    st.error(f"Harmful Content Detected! Found: {', '.join(harmful_results['detected_items'])}. Review for offensive or manipulative language.")
+                    st.write("Suggestions: Remove or rephrase offensive/manipulative language to maintain a positive brand image and ethical standards.")
+                    compliance_risk = True
+                else:
+                    st.success("No harmful content detected.")
+            
                 # --- Visual Context Analysis (from Image Captioning) ---
                 st.markdown("##### Visual Context Analysis (from Image Captioning):")
-                visual_analysis_results = analyze_image_for_visual_context(uploaded_file.getvalue(), extracted_text)
-                
+                with st.spinner("Generating image caption..."):
+                    try:
+                        generated_caption = caption_future.result()
+                    except Exception as e:
+                        st.error(f"Error generating image caption: {e}")
+                        generated_caption = ""
+                visual_analysis_results = analyze_image_for_visual_context(image_bytes, extracted_text, generated_caption)
+            
                 if visual_analysis_results['is_visually_biased']:
                     st.error("Potential Visual Bias Detected!")
                     for category, flags in visual_analysis_results['bias_categories'].items():
@@ -604,37 +458,16 @@ elif page_selection == "Image Ad Analysis":
                 else:
                     st.success("No significant visual stereotypical context detected based on analysis of the caption.")
                     st.metric("Visual Bias Score (0-10)", visual_analysis_results['visual_bias_score'])
-                
+            
                 # --- Overall Bias Score ---
-                overall_bias_score = calculate_overall_bias_score(
+                combined_bias_score = overall_bias_score(
                     text_bias_results['bias_score'], 
                     visual_analysis_results['visual_bias_score']
                 )
                 st.markdown("---")
                 st.subheader("Overall Ad Bias Score:")
-                st.metric("Combined Bias Score (0-10)", overall_bias_score, help="A higher score indicates more potential bias. This is a simplified score for demonstration.")
-                st.markdown("---")
-
-                # --- Security Checks and Compliance Risk ---
-                st.markdown("##### Security Checks:")
-                pii_results = check_for_pii(extracted_text)
-                harmful_results = check_for_harmful_content(extracted_text)
-
-                compliance_risk = False
-                if pii_results['has_pii']:
-                    st.error(f"PII Detected! Found: {', '.join(pii_results['detected_items'])}. This information should be redacted.")
-                    st.write("Suggestions: Remove or redact sensitive personal information before public display.")
-                    compliance_risk = True
-                else:
-                    st.success("No Personal Identifiable Information (PII) found.")
-
-                if harmful_results['has_harmful_content']:
-                    st.error(f"Harmful Content Detected! Found: {', '.join(harmful_results['detected_items'])}. Review for offensive or manipulative language.")
-                    st.write("Suggestions: Remove or rephrase offensive/manipulative language to maintain a positive brand image and ethical standards.")
-                    compliance_risk = True
-                else:
-                    st.success("No harmful content detected.")
-                
+                st.metric("Combined Bias Score (0-10)", combined_bias_score, help="A higher score indicates more potential bias. This is a simplified score for demonstration.")
+            
                 st.markdown("---")
                 st.subheader("Compliance Risk Summary:")
                 if compliance_risk:
@@ -644,6 +477,64 @@ elif page_selection == "Image Ad Analysis":
                     st.success("Compliance Risk: LOW (no PII or harmful content detected)")
                     st.write("Status: Ad content appears to meet basic security and ethical content standards.")
 
+                if analyze_clicked: # Record once per click, not on every rerun
+                    result_store.add_records(
+                        [make_record(flag_table, image_bytes, text_bias_results, pii_results,
+                                     harmful_results, visual_analysis_results, campaign=campaign_name)],
+                        flag_table
+                    )
+
+        else:
+            st.info("Upload an image to start the analysis.")
+
     else:
-        st.info("Upload an image to start the analysis.")
+        st.markdown("""
+        Upload several images, zip archives of creatives or multi-page PDFs (one creative per page).
+        Creatives are decoded lazily and analyzed in small batches; the summary table fills in as
+        each batch finishes. Click a column header to sort.
+        """)
+        uploaded_files = st.file_uploader(
+            "Choose images, zip archives or PDFs...", type=["png", "jpg", "jpeg", "zip", "pdf"],
+            accept_multiple_files=True, key="batch_uploader"
+        )
+
+        if uploaded_files:
+            if st.button("Analyze Batch", key="analyze_batch_btn"):
+                wait_for_models()
+                progress = st.empty()
+                summary_table = st.empty()
+                rows = []
+                try:
+                    with open_creatives(uploaded_files) as creatives: # Closes PDFs even if the run fails
+                        for batch_results in run_batched(creatives, pipeline.analyze_creatives,
+                                                         batch_size=BATCH_SIZE, max_in_flight=BATCH_IN_FLIGHT):
+                            records = []
+                            for item in batch_results:
+                                rows.append(pipeline.summarize_creative(item))
+                                campaign_aggregator.add_image(campaign_name, item['caption'], item['detections'],
+                                                              item['visual'], key=content_hash(item['content']))
+                                records.append(make_record(flag_table, item['content'], item['text_bias'], item['pii'],
+                                                           item['harmful'], item['visual'], campaign=campaign_name))
+                            result_store.add_records(records, flag_table)
+                            progress.text(f"Analyzed {len(rows)} creatives...")
+                            summary_table.dataframe(
+                                pd.DataFrame(rows).sort_values("Overall Score", ascending=False),
+                                use_container_width=True
+                            )
+                except ImportError as e:
+                    st.error(str(e))
+                except Exception as e:
+                    st.error(f"Error during batch analysis: {e}")
+                progress.text(f"Analyzed {len(rows)} creatives.")
+                st.session_state['batch_rows'] = rows
+                show_representation(campaign_aggregator.report(campaign_name))
+            elif st.session_state.get('batch_rows'):
+                # Keep the last summary on reruns (e.g. after sorting or switching modes)
+                st.dataframe(
+                    pd.DataFrame(st.session_state['batch_rows']).sort_values("Overall Score", ascending=False),
+                    use_container_width=True
+                )
+                show_representation(campaign_aggregator.report(campaign_name))
+        else:
+            st.info("Upload images, zip archives or PDFs to start the batch analysis.")
 
@@ -1,35 +1,22 @@
 # caption.py
 
-import requests
-import base64
+from fairguard import models
 
 def generate_caption(image_path):
     """
-    Example: using local Ollama LLaMA3.2 or phi4 to caption image
-    But Ollama does NOT do direct image input — so we use a simple workaround:
-    - convert image to base64
-    - prompt the local LLM with a description prompt
+    Captions the whole image with the shared BLIP model.
+    (This used to prompt the local LLM with a truncated base64 snippet of the image, which a
+    text-only model cannot see; it only made the prompt longer.)
     """
+    return models.caption_image(image_path)
 
-    # Convert image to base64 string (optional, or describe filename)
-    with open(image_path, "rb") as f:
-        img_bytes = f.read()
-    encoded = base64.b64encode(img_bytes).decode('utf-8')
 
-    prompt = f"""You are an image captioning assistant.
-    Here is an image in base64:
-    {encoded[:100]}... (truncated)
-
-    Based on this, write a detailed caption describing everything you can see."""
-
-    response = requests.post(
-        "http://localhost:11434/api/generate",
-        json={"model": "llama3.2:3b", "prompt": prompt},
-        stream=False
-    )
-
-    if response.ok:
-        result = response.text
-        return result
-    else:
-        return "❌ Captioning failed: check Ollama is running."
+def generate_captions(image_path, boxes):
+    """
+    Captions every detected object: each box is cropped out of the image and the crops are
+    captioned in batches with the shared BLIP model.
+    Returns:
+        A list of {"box": [x1, y1, x2, y2], "caption": str}, one per usable box, plus "conf"
+        when the boxes carry a confidence (x1, y1, x2, y2, conf).
+    """
+    return models.caption_regions(image_path, boxes)
@@ -1,19 +1,20 @@
 # detect.py
 
-from ultralytics import YOLO
 import cv2
 
-# Load YOLO model once
-model = YOLO("yolov8n.pt")  # Make sure this file is in your project folder
+from fairguard import models # YOLO is loaded on first use and shared with the other front-ends
+from fairguard.detections import PERSON, draw_boxes
 
-def detect_objects(img_path):
-    results = model(img_path)
-    boxes = results[0].boxes.xyxy.cpu().numpy().tolist()
-    return boxes
+# Regions worth captioning for representation: people, above YOLO's own 0.25 threshold
+CAPTION_CLASSES = (PERSON,)
+CAPTION_MIN_CONF = 0.4
 
-def save_results(img_path, boxes, output_path):
+def detect_objects(img_path, classes=CAPTION_CLASSES, min_conf=CAPTION_MIN_CONF, merge_iou=0.5):
+    # Filtering and merging run on the detection arrays; no per-box Python lists.
+    # Pass classes=None to keep every class.
+    detections = models.detect_objects(img_path)
+    return detections.select(classes=classes, min_conf=min_conf).merge_overlapping(merge_iou)
+
+def save_results(img_path, detections, output_path):
     img = cv2.imread(img_path)
-    for box in boxes:
-        x1, y1, x2, y2 = map(int, box)
-        cv2.rectangle(img, (x1, y1), (x2, y2), (0, 255, 0), 2)
-    cv2.imwrite(output_path, img)
+    cv2.imwrite(output_path, draw_boxes(img, detections))
@@ -0,0 +1,11 @@
+# fairguard/__init__.py
+#
+# FairGuard core: rule engines (bias_rules, prefilter, with obfuscation-resistant matching in
+# normalize), PII/harm checks (security_checks), the audience engines (audience,
+# audience_stats, schema_profiler), campaign representation counters (representation) sharing
+# the disparate impact test (fairness), lazily loaded model adapters (models) and result
+# storage (result_model, result_store).
+#
+# Submodules are imported individually and this file imports none of them, so a text-only
+# consumer (`from fairguard.engine import analyze_text`) never loads pandas, PIL or torch.
+# `python -m fairguard.importcheck` checks that budget.
@@ -0,0 +1,74 @@
+# audience.py
+#
+# Audience segmentation bias (disparate impact) for targeting data held in a DataFrame.
+
+import numpy as np
+import pandas as pd
+
+from .fairness import disparate_impact
+
+
+def simulate_audience_data(num_samples=1000):
+    """
+    Simulates an audience dataset with intentional biases.
+    """
+    data = {
+        'customer_id': range(num_samples),
+        'age_group': np.random.choice(['18-25', '26-40', '41-60', '60+'], num_samples, p=[0.25, 0.35, 0.25, 0.15]),
+        'gender': np.random.choice(['Male', 'Female', 'Non-binary'], num_samples, p=[0.48, 0.48, 0.04]),
+        'income_level': np.random.choice(['Low', 'Medium', 'High'], num_samples, p=[0.3, 0.5, 0.2]),
+        'ad_targeted': False # Default
+    }
+    df = pd.DataFrame(data)
+
+    # Introduce bias:
+    # Bias 1: Less likely to target '60+' age group
+    df.loc[df['age_group'] == '60+', 'ad_targeted'] = np.random.rand(len(df[df['age_group'] == '60+'])) < 0.3 # 30% target rate
+    # Bias 2: Slightly less likely to target 'Non-binary' gender
+    df.loc[df['gender'] == 'Non-binary', 'ad_targeted'] = np.random.rand(len(df[df['gender'] == 'Non-binary'])) < 0.6 # 60% target rate
+    # General targeting for others
+    df.loc[df['ad_targeted'] == False, 'ad_targeted'] = np.random.rand(len(df[df['ad_targeted'] == False])) < 0.75 # 75% target rate for others
+
+    return df
+
+
+def analyze_audience_bias(df, protected_attribute, target_column='ad_targeted'):
+    """
+    Analyzes audience data for bias using disparate impact ratio.
+    Returns results including a bias score for the audience segmentation.
+    """
+    results = {}
+    audience_bias_score = 0 # Initialize score for audience bias
+
+    if protected_attribute not in df.columns:
+        return {"error": f"Protected attribute '{protected_attribute}' not found in data."}
+
+    groups = df[protected_attribute].unique()
+
+    if len(groups) < 2:
+        return {"info": f"Not enough groups in '{protected_attribute}' to analyze bias."}
+
+    targeting_rates = df.groupby(protected_attribute)[target_column].mean()
+    privileged_group = targeting_rates.idxmax()
+    privileged_rate = targeting_rates.max()
+
+    results['privileged_group'] = privileged_group
+    results['targeting_rates'] = targeting_rates.to_dict()
+    results['disparate_impact_ratios'] = {}
+    results['biased_groups'] = []
+
+    for group in groups:
+        if group == privileged_group:
+            continue
+
+        dir_value, is_biased = disparate_impact(targeting_rates[group], privileged_rate)
+        results['disparate_impact_ratios'][group] = dir_value
+
+        if is_biased:
+            results['biased_groups'].append(f"{group} (DIR: {dir_value:.2f})")
+            # Assign points for each biased group detected in audience segmentation
+            audience_bias_score += 1
+
+    results['is_biased'] = len(results['biased_groups']) > 0
+    results['audience_bias_score'] = audience_bias_score # Add score to results
+    return results
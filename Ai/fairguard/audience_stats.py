@@ -0,0 +1,122 @@
+# audience_stats.py
+
+import math
+
+import pandas as pd
+
+from .schema_profiler import get_schema
+
+DEFAULT_CHUNK_SIZE = 200_000
+
+
+def _parse_ages(values):
+    """
+    Vectorized equivalent of JavaScript's `parseInt(value) || 0`.
+    """
+    return pd.to_numeric(values.str.extract(r'^\s*([+-]?\d+)', expand=False), errors='coerce').fillna(0).astype('int64')
+
+
+def _add_counts(target, counts):
+    for key, count in counts.items():
+        target[key] = target.get(key, 0) + int(count)
+
+
+def compute_audience_match(source, gender='both', age_min=18, age_max=65, chunksize=DEFAULT_CHUNK_SIZE,
+                           sensitive_params=None):
+    """
+    Computes the audience match score, age-bucket histogram and per-parameter value counts
+    for a CSV audience export, reading it in chunks so memory stays flat for very large files.
+    Args:
+        source: Path or binary/text file object of the CSV.
+        gender: Target gender ('both', 'male' or 'female').
+        age_min, age_max: Inclusive target age range.
+        chunksize: Rows per chunk.
+        sensitive_params: Optional {param_type: header} mapping. By default the columns are
+            classified by schema_profiler from the first chunk (cached per header row).
+    Returns:
+        A small JSON-serializable dict: match percentages and score, the detected parameters with
+        their chart data, parameter statistics and a (gender, age) histogram that lets callers
+        re-score other targeting choices without re-reading the data.
+    """
+    gender = (gender or 'both').lower()
+    reader = pd.read_csv(source, dtype=str, keep_default_na=False, skipinitialspace=True,
+                         chunksize=chunksize)
+
+    params = None
+    data = {}
+    parameter_stats = {}
+    age_stats = None
+    match_histogram = {}
+    total = gender_matches = age_matches = both_matches = 0
+
+    for chunk in reader:
+        chunk.columns = [str(c).strip() for c in chunk.columns]
+        if params is None:
+            params = sensitive_params or get_schema(chunk)['sensitive_params']
+            data = {param_type: {} for param_type in params}
+        chunk = chunk.apply(lambda col: col.str.strip())
+        total += len(chunk)
+
+        # --- Target match ---
+        gender_col = chunk[params['gender']].str.lower() if 'gender' in params else None
+        age_col = _parse_ages(chunk[params['age']]) if 'age' in params else None
+
+        gender_ok = pd.Series(True, index=chunk.index) if gender_col is None or gender == 'both' \
+            else gender_col == gender
+        age_ok = pd.Series(True, index=chunk.index) if age_col is None \
+            else age_col.between(age_min, age_max)
+        gender_matches += int(gender_ok.sum())
+        age_matches += int(age_ok.sum())
+        both_matches += int((gender_ok & age_ok).sum())
+
+        keys = pd.DataFrame({
+            'gender': gender_col if gender_col is not None else '',
+            'age': age_col if age_col is not None else -1,
+        }, index=chunk.index)
+        for (g, a), count in keys.value_counts(sort=False).items():
+            match_histogram[(g, int(a))] = match_histogram.get((g, int(a)), 0) + int(count)
+
+        # --- Parameter statistics (empty values are skipped) ---
+        for param_type, header in params.items():
+            column = chunk[header]
+            column = column[column != '']
+            if column.empty:
+                continue
+            stats = parameter_stats.setdefault(param_type, {})
+            if param_type == 'age':
+                ages = _parse_ages(column)
+                buckets = (ages // 10) * 10
+                _add_counts(data['age'], {f"{b}-{b + 9}": c for b, c in buckets.value_counts().items()})
+                chunk_stats = (int(ages.min()), int(ages.max()), int(ages.sum()), int(len(ages)))
+                if age_stats is None:
+                    age_stats = list(chunk_stats)
+                else:
+                    age_stats = [min(age_stats[0], chunk_stats[0]), max(age_stats[1], chunk_stats[1]),
+                                 age_stats[2] + chunk_stats[2], age_stats[3] + chunk_stats[3]]
+            else:
+                counts = column.str.lower().value_counts()
+                _add_counts(data[param_type], counts)
+                _add_counts(stats, counts)
+
+    if params is None:
+        params = {}
+    if age_stats is not None:
+        age_min_seen, age_max_seen, age_sum, age_count = age_stats
+        parameter_stats['age']['stats'] = {
+            'min': age_min_seen, 'max': age_max_seen, 'sum': age_sum, 'count': age_count,
+            'avg': math.floor(age_sum / age_count + 0.5)
+        }
+
+    gender_pct = gender_matches / total * 100 if total else 0
+    age_pct = age_matches / total * 100 if total else 0
+    return {
+        'totalRecords': total,
+        'matchedRecords': both_matches,
+        'genderMatch': gender_pct,
+        'ageMatch': age_pct,
+        'matchScore': math.floor(gender_pct * 0.4 + age_pct * 0.6 + 0.5),
+        'sensitiveParams': {param_type: {'name': header, 'data': data.get(param_type, {})}
+                            for param_type, header in params.items()},
+        'parameterStats': parameter_stats,
+        'matchHistogram': [[g, a, c] for (g, a), c in match_histogram.items()],
+    }
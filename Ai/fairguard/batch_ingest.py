@@ -0,0 +1,206 @@
+# batch_ingest.py
+
+import io
+import os
+import threading
+import zipfile
+from collections import deque
+from contextlib import contextmanager
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from .preprocess import for_ocr
+
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".webp", ".bmp", ".gif", ".tif", ".tiff")
+PDF_RENDER_DPI = 150
+
+# pdfium is not thread-safe, not even across documents: every call into it holds this lock
+_pdfium_lock = threading.Lock()
+
+
+class Creative:
+    """
+    One ad creative pulled from an upload: display name, a content key for audit records
+    (raw bytes for image files, "<file>#page<N>" for PDF pages) and a decoder that produces
+    the RGB image only when the pipeline gets to it.
+    """
+    __slots__ = ("name", "content", "_load")
+
+    def __init__(self, name, content, load):
+        self.name = name
+        self.content = content
+        self._load = load
+
+    def load(self):
+        return self._load()
+
+
+def _decode(data):
+    # Reduced-scale decode at OCR resolution; captioning downsizes further from this
+    return for_ocr(data)
+
+
+def _iter_zip(name, fileobj, opened):
+    with zipfile.ZipFile(fileobj) as archive:
+        for info in archive.infolist():
+            member = info.filename
+            if info.is_dir() or os.path.basename(member).startswith(".") or "__MACOSX" in member:
+                continue
+            if member.lower().endswith(IMAGE_EXTENSIONS):
+                data = archive.read(info)  # one member in memory at a time
+                yield Creative(f"{name}/{member}", data, lambda data=data: _decode(data))
+            elif member.lower().endswith(".pdf"):
+                yield from _iter_pdf(f"{name}/{member}", io.BytesIO(archive.read(info)), opened)
+
+
+class _SharedPdf:
+    """
+    One open PDF shared by the Creatives of its pages. The document is closed once the
+    generator and every yielded page have released it: pages are rendered on batch worker
+    threads, long after the generator has moved on. close() ends it early, for pages that
+    will never be loaded because the run was aborted.
+    """
+
+    def __init__(self, document):
+        self.document = document
+        self._refs = 1  # Held by the generator until it finishes
+        self._released = set()
+        self._closed = False
+
+    def acquire(self):
+        with _pdfium_lock:
+            self._refs += 1
+
+    def release(self, index=None):
+        with _pdfium_lock:
+            if self._closed:
+                return
+            if index is not None:
+                if index in self._released:  # A page loaded twice only releases once
+                    return
+                self._released.add(index)
+            self._refs -= 1
+            if self._refs == 0:
+                self._closed = True
+                self.document.close()
+
+    def close(self):
+        """
+        Closes the document now, whatever references are left. Pages not loaded yet fail to load.
+        """
+        with _pdfium_lock:
+            if not self._closed:
+                self._closed = True
+                self.document.close()
+
+    def render(self, index):
+        try:
+            with _pdfium_lock:
+                if self._closed:
+                    raise RuntimeError("PDF document was closed before the page was loaded.")
+                if index in self._released:
+                    raise RuntimeError("PDF page was already loaded and its document released.")
+                page = self.document[index]
+                try:
+                    image = page.render(scale=PDF_RENDER_DPI / 72).to_pil()
+                finally:
+                    page.close()
+        finally:
+            self.release(index)
+        return for_ocr(image)  # Decoding and resizing run outside the lock
+
+
+def _iter_pdf(name, fileobj, opened):
+    try:
+        import pypdfium2 as pdfium  # Optional: PDF page rendering
+    except ImportError:
+        raise ImportError("PDF uploads need pypdfium2 (pip install pypdfium2).")
+
+    with _pdfium_lock:
+        document = pdfium.PdfDocument(fileobj)
+        page_count = len(document)
+    pdf = _SharedPdf(document)
+    opened.append(pdf)
+    try:
+        for index in range(page_count):
+            pdf.acquire()
+            yield Creative(f"{name}#page{index + 1}", f"{name}#page{index + 1}",
+                           lambda index=index: pdf.render(index))
+    finally:
+        pdf.release()
+
+
+def iter_creatives(uploaded_files, opened=None):
+    """
+    Lazily expands uploaded files (images, zip archives, PDFs) into Creatives.
+    Archives are read member by member and PDF pages are rendered only when loaded, so memory
+    does not grow with archive size.
+    Args:
+        opened: Optional list that collects every PDF document opened, see open_creatives().
+    """
+    opened = [] if opened is None else opened
+    for uploaded in uploaded_files:
+        name = getattr(uploaded, "name", "upload")
+        lower = name.lower()
+        if lower.endswith(".zip"):
+            yield from _iter_zip(name, uploaded, opened)
+        elif lower.endswith(".pdf"):
+            yield from _iter_pdf(name, uploaded, opened)
+        else:
+            data = uploaded.getvalue() if hasattr(uploaded, "getvalue") else uploaded.read()
+            yield Creative(name, data, lambda data=data: _decode(data))
+
+
+@contextmanager
+def open_creatives(uploaded_files):
+    """
+    iter_creatives() as a context manager. On exit every PDF it opened is closed, including
+    documents whose pages were pulled but never loaded because the batch run raised or was
+    stopped; a completed run has already closed them.
+    """
+    opened = []
+    creatives = iter_creatives(uploaded_files, opened)
+    try:
+        yield creatives
+    finally:
+        creatives.close()
+        for pdf in opened:
+            pdf.close()
+
+
+def _take(iterator, n):
+    batch = []
+    for item in iterator:
+        batch.append(item)
+        if len(batch) == n:
+            break
+    return batch
+
+
+def run_batched(items, process_batch, batch_size=8, max_in_flight=2):
+    """
+    Feeds `items` through `process_batch(list) -> list` on a thread pool, keeping at most
+    `max_in_flight` batches outstanding, and yields each batch's results as it completes.
+    At most batch_size * max_in_flight items are held at any time. If the caller stops early
+    or a batch raises, batches not started yet are cancelled.
+    """
+    iterator = iter(items)
+    with ThreadPoolExecutor(max_workers=max_in_flight, thread_name_prefix="fairguard-batch") as executor:
+        pending = deque()
+        exhausted = False
+        try:
+            while True:
+                while not exhausted and len(pending) < max_in_flight:
+                    batch = _take(iterator, batch_size)
+                    if not batch:
+                        exhausted = True
+                        break
+                    pending.append(executor.submit(process_batch, batch))
+                if not pending:
+                    return
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    pending.remove(future)
+                    yield future.result()
+        finally:
+            for future in pending:
+                future.cancel()
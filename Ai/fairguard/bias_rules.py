@@ -0,0 +1,247 @@
+# bias_rules.py
+#
+# Rule tables for the text and visual bias checks. Each rule is a small named function that
+# returns a hit (categories, flag, suggestion, score) or None, so rules can be counted, timed
+# and reordered individually (see rule_stats.py).
+
+from .result_model import CATEGORIES
+from .rule_stats import run_rules
+
+# --- Vocabularies ---
+GENDER_KEYWORDS_MALE = ['businessman', 'he', 'his', 'him', 'gentleman']
+GENDER_KEYWORDS_FEMALE = ['businesswoman', 'she', 'her', 'lady']
+GENDER_NEUTRAL_KEYWORDS = ['person', 'individual', 'they', 'their', 'everyone']
+
+AGE_KEYWORDS_OLD = ['retiree', 'elderly', 'senior citizen', 'golden years', 'pensioner']
+AGE_KEYWORDS_YOUNG = ['youth', 'millennial', 'gen z', 'youngster']
+AGE_INCLUSIVE_KEYWORDS = ['all ages', 'everyone', 'diverse', 'inclusive']
+
+GENDER_BEST_PHRASES = [
+    'women know best', 'men know best', 'ladies first', 'gentlemen only',
+    'woman\'s touch', 'man of the house', 'for her', 'for him'
+]
+FEMALE_STEREOTYPICAL_PRODUCTS_ROLES = ['scrub', 'clean', 'kitchen', 'home', 'dishes', 'laundry', 'cooking', 'beauty', 'makeup', 'fashion', 'jewelry', 'nurture', 'family', 'diet', 'weight loss']
+MALE_STEREOTYPICAL_PRODUCTS_ROLES = ['tools', 'cars', 'garage', 'finance', 'business', 'power', 'strength', 'sports', 'tech', 'gadgets', 'gaming', 'investing']
+
+WOMEN_TARGETING_PHRASES = ['especially for women', 'for women']
+SAFETY_KEYWORDS = ['safety', 'safe', 'protection', 'confidence starts with feeling safe']
+
+PROBLEMATIC_TERMS = ['primitive', 'backward', 'exotic', 'foreigner', 'ghetto', 'terrorist', 'struggling', 'poverty', 'wealth', 'freedom', 'disabled', 'handicap', 'wheelchair']
+SOCIOECONOMIC_TERMS = ['struggling', 'poverty', 'wealth', 'freedom']
+DISABILITY_TERMS = ['disabled', 'handicap', 'wheelchair']
+
+ACTIVE_SPORT_KEYWORDS = ['skateboard', 'skateboarding', 'sport', 'active', 'run', 'jump', 'play']
+
+GENDER_NEUTRAL_SUGGESTION = "Consider using gender-neutral terms like 'business professional', 'they/their', 'individuals'."
+AGE_SUGGESTION = "Ensure target audience is clearly defined. Use inclusive language if the product is for all ages."
+STEREOTYPE_SUGGESTION = "Avoid reinforcing traditional gender stereotypes. Focus on product benefits for all users, regardless of gender. Use gender-neutral phrasing and imagery."
+
+
+def _any(terms, text):
+    return any(term in text for term in terms)
+
+
+# --- Text rules: rule(text_lower) -> hit or None ---
+
+# Gender Bias (direct language) - Score: +1
+def _gender_centric(text_lower):
+    if _any(GENDER_NEUTRAL_KEYWORDS, text_lower):
+        return None
+    has_male = _any(GENDER_KEYWORDS_MALE, text_lower)
+    has_female = _any(GENDER_KEYWORDS_FEMALE, text_lower)
+    if has_male and not has_female:
+        return (("gender",), "Male-centric language detected.", GENDER_NEUTRAL_SUGGESTION, 1)
+    if has_female and not has_male:
+        return (("gender",), "Female-centric language detected.", GENDER_NEUTRAL_SUGGESTION, 1)
+    return None
+
+
+# Age Bias (simple keywords) - Score: +1 for each
+def _age_older(text_lower):
+    if _any(AGE_KEYWORDS_OLD, text_lower) and not _any(AGE_INCLUSIVE_KEYWORDS, text_lower):
+        return (("age",), "Targeting only older demographic, potentially excluding others.", AGE_SUGGESTION, 1)
+    return None
+
+
+def _age_younger(text_lower):
+    if _any(AGE_KEYWORDS_YOUNG, text_lower) and not _any(AGE_INCLUSIVE_KEYWORDS, text_lower):
+        return (("age",), "Targeting only younger demographic, potentially excluding others.", AGE_SUGGESTION, 1)
+    return None
+
+
+# Stereotypical Role Bias (Textual) - Score: +2 for each strong match
+def _stereotype_female(text_lower):
+    if _any(GENDER_BEST_PHRASES, text_lower) and _any(FEMALE_STEREOTYPICAL_PRODUCTS_ROLES, text_lower):
+        return (("stereotypical_role",), "Linking women to domestic/beauty roles.", STEREOTYPE_SUGGESTION, 2)
+    return None
+
+
+def _stereotype_male(text_lower):
+    if _any(GENDER_BEST_PHRASES, text_lower) and _any(MALE_STEREOTYPICAL_PRODUCTS_ROLES, text_lower):
+        return (("stereotypical_role",), "Linking men to power/tech/sports roles.", STEREOTYPE_SUGGESTION, 2)
+    return None
+
+
+# Benevolent Sexism / Vulnerability Bias (Textual) - Score: +4 for strong match
+def _benevolent_sexism(text_lower):
+    if _any(WOMEN_TARGETING_PHRASES, text_lower) and _any(SAFETY_KEYWORDS, text_lower):
+        return (
+            ("benevolent_sexism",),
+            "Implies women need special safety/protection or derive confidence from it. **Requires Human Review.**",
+            "Ensure safety messages are universal or focus on features, not gender-specific vulnerability. Confidence should stem from internal agency.",
+            4,
+        )
+    return None
+
+
+# Racial/Socio-economic/Ableism Sensitive Bias (Conceptual for text-only keywords) - Score: +3
+def _problematic_language(text_lower):
+    if not _any(PROBLEMATIC_TERMS, text_lower):
+        return None
+    categories = []
+    if _any(SOCIOECONOMIC_TERMS, text_lower):
+        categories.append("racial_socioeconomic")
+    if _any(DISABILITY_TERMS, text_lower):
+        categories.append("ableism")
+    if not categories:
+        # If it's not specifically socio-economic or ableism, but still problematic
+        categories.append("racial_socioeconomic")
+    return (
+        tuple(categories),
+        "Use of problematic or stereotypical language related to race/origin/religion/socio-economic status/disability. Requires urgent human review.",
+        "Review language for any unintended racial, cultural, religious, socio-economic, or disability-related stereotypes/insensitivities.",
+        3,
+    )
+
+
+TEXT_RULES = [
+    ("text.gender_centric", _gender_centric),
+    ("text.age_older", _age_older),
+    ("text.age_younger", _age_younger),
+    ("text.stereotype_female", _stereotype_female),
+    ("text.stereotype_male", _stereotype_male),
+    ("text.benevolent_sexism", _benevolent_sexism),
+    ("text.problematic_language", _problematic_language),
+]
+
+
+# --- Visual rules: rule(caption_lower, text_lower) -> hit or None ---
+
+# Contrasting individuals in a "struggle/freedom" narrative - Score: +5
+def _visual_financial_narrative(caption_lower, text_lower):
+    if ('man' in caption_lower and 'suit' in caption_lower) and \
+       ('struggling' in text_lower or 'money' in text_lower or 'financial freedom' in text_lower):
+        return (
+            ("racial_socioeconomic",),
+            "Potential racial/socio-economic stereotype implied by contrasting individuals in a financial narrative. **Requires Human Review.**",
+            None,
+            5,
+        )
+    return None
+
+
+# "Benevolent Sexism/Vulnerability" in visuals - Score: +4
+def _visual_benevolent_sexism(caption_lower, text_lower):
+    if ('woman' in caption_lower or 'female' in caption_lower) and \
+       ('car' in caption_lower or 'vehicle' in caption_lower) and \
+       _any(SAFETY_KEYWORDS, text_lower) and _any(WOMEN_TARGETING_PHRASES, text_lower):
+        return (
+            ("benevolent_sexism",),
+            "Potential benevolent sexism/vulnerability stereotype (e.g., implying women need special safety). **Requires Human Review.**",
+            None,
+            4,
+        )
+    return None
+
+
+# Potential ableism/exclusion in active contexts - Score: +4
+def _visual_ableism(caption_lower, text_lower):
+    if ('person' in caption_lower or 'man' in caption_lower or 'people' in caption_lower) and \
+       _any(ACTIVE_SPORT_KEYWORDS, text_lower) and \
+       ('sitting' in caption_lower or 'seated' in caption_lower or 'wheelchair' in caption_lower or 'bench' in caption_lower):
+        return (
+            ("ableism",),
+            "Potential ableism/exclusion in active sport context (e.g., person in wheelchair with active sport ad). **Requires Human Review.**",
+            None,
+            4,
+        )
+    return None
+
+
+# Terms at least one of which must occur (as a substring of the lowercased text) for each
+# text rule to fire. Used by prefilter.py to skip rules that cannot match.
+TEXT_RULE_TRIGGERS = {
+    "text.gender_centric": GENDER_KEYWORDS_MALE + GENDER_KEYWORDS_FEMALE,
+    "text.age_older": AGE_KEYWORDS_OLD,
+    "text.age_younger": AGE_KEYWORDS_YOUNG,
+    "text.stereotype_female": GENDER_BEST_PHRASES,
+    "text.stereotype_male": GENDER_BEST_PHRASES,
+    "text.benevolent_sexism": WOMEN_TARGETING_PHRASES,
+    "text.problematic_language": PROBLEMATIC_TERMS,
+}
+
+VISUAL_RULES = [
+    ("visual.financial_narrative", _visual_financial_narrative),
+    ("visual.benevolent_sexism", _visual_benevolent_sexism),
+    ("visual.ableism", _visual_ableism),
+]
+
+
+def build_text_result(hits):
+    """
+    Turns text-rule hits into the analyze_text_for_bias() result dict.
+    """
+    bias_categories = {category: [] for category in CATEGORIES}
+    suggestions = []
+    bias_score = 0
+
+    for categories, flag, suggestion, score in hits:
+        for category in categories:
+            bias_categories[category].append(flag)
+        suggestions.append(suggestion)
+        bias_score += score
+
+    return {
+        "is_biased": len(hits) > 0,
+        "bias_categories": bias_categories,
+        "suggestions": suggestions,
+        "bias_score": bias_score
+    }
+
+
+def analyze_text_for_bias(text, rules=TEXT_RULES):
+    """
+    Analyzes text for potential gender, racial, age, or other biases.
+    Uses simple keyword matching and stereotypical context detection.
+    Returns categorized bias flags and a score. `rules` may be narrowed to a subset of
+    TEXT_RULES when the caller knows the others cannot fire.
+    """
+    return build_text_result(run_rules(rules, text.lower()))
+
+
+def analyze_caption_for_bias(caption, extracted_text=""):
+    """
+    Rule-based visual bias detection from an image caption and the ad's OCR text.
+    The caption is run through the text rules, then the caption/OCR co-occurrence heuristics.
+    Returns categorized bias flags, the flat flag list and a score.
+    """
+    visual_bias_categories = {category: [] for category in CATEGORIES}
+    all_visual_flags = []
+
+    caption_bias_analysis = analyze_text_for_bias(caption)
+    for category, flags in caption_bias_analysis['bias_categories'].items():
+        visual_bias_categories[category].extend(flags)
+        all_visual_flags.extend(flags)
+    visual_bias_score = caption_bias_analysis['bias_score']
+
+    for categories, flag, _, score in run_rules(VISUAL_RULES, caption.lower(), extracted_text.lower()):
+        for category in categories:
+            visual_bias_categories[category].append(flag)
+        all_visual_flags.append(flag)
+        visual_bias_score += score
+
+    return {
+        "bias_categories": visual_bias_categories,
+        "visual_flags": all_visual_flags,
+        "visual_bias_score": visual_bias_score
+    }
@@ -0,0 +1,74 @@
+# engine.py
+#
+# The analysis entry points shared by the Streamlit app, the CLI and the API server. Text
+# analysis only needs the rule tables; image analysis reaches the models through pipeline.py,
+# which serializes calls into each model (models.py loads them on first use).
+
+from .bias_rules import analyze_caption_for_bias
+from .normalize import canonical_text
+from .prefilter import analyze_copy
+from .result_model import CATEGORIES
+
+MAX_DISPLAY_SCORE = 10
+
+
+def analyze_text(text):
+    """
+    Runs the bias, PII and harmful-content checks on one piece of ad copy.
+    Returns:
+        A dict with "bias", "pii" and "harmful" results.
+    """
+    bias_results, pii_results, harmful_results = analyze_copy(text)
+    return {"bias": bias_results, "pii": pii_results, "harmful": harmful_results}
+
+
+def analyze_visual(caption, extracted_text=""):
+    """
+    Analyzes an image caption (and the ad's OCR text) for visual bias. The OCR text is read
+    through canonical_text(), like ad copy, so garbled or obfuscated terms still match.
+    Returns categorized bias flags, the flat flag list and a score; an empty caption
+    yields an empty result.
+    """
+    if caption:
+        results = analyze_caption_for_bias(caption, canonical_text(extracted_text))
+    else:
+        results = {
+            "bias_categories": {category: [] for category in CATEGORIES},
+            "visual_flags": [],
+            "visual_bias_score": 0
+        }
+    results["generated_caption"] = caption
+    results["is_visually_biased"] = len(results["visual_flags"]) > 0
+    return results
+
+
+def overall_bias_score(text_bias_score, visual_bias_score):
+    """
+    Combines the textual and visual scores, capped at 10 for display.
+    """
+    return min(text_bias_score + visual_bias_score, MAX_DISPLAY_SCORE)
+
+
+def analyze_image(image, extracted_text=None, caption=None):
+    """
+    Full analysis of one image ad: OCR, captioning, text checks on the OCR text and the
+    visual rules. Pass `extracted_text` or `caption` to reuse results already computed.
+    Args:
+        image: Image bytes, a file path or a PIL image.
+    Returns:
+        A dict with "extracted_text", "bias", "pii", "harmful", "visual" and "overall_score".
+    """
+    from . import pipeline # Imports this module; the model locks live there
+    from .preprocess import prepare
+    ocr_image, caption_image = prepare(image) # One decode, sized for each model
+    if extracted_text is None:
+        extracted_text = pipeline.ocr_text(ocr_image)
+    if caption is None:
+        caption = pipeline.caption_image(caption_image)
+
+    results = analyze_text(extracted_text)
+    results["extracted_text"] = extracted_text
+    results["visual"] = analyze_visual(caption, extracted_text)
+    results["overall_score"] = overall_bias_score(results["bias"]["bias_score"],
+                                                  results["visual"]["visual_bias_score"])
+    return results
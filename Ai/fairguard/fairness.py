@@ -0,0 +1,19 @@
+# fairness.py
+#
+# The disparate impact test shared by the audience engine (targeting rates in a DataFrame)
+# and the campaign representation counters (shares of depicted people). Kept free of pandas
+# so the streaming aggregation can use it without the audience stack.
+
+# Four-fifths rule: ratios outside this band flag a group as disparately treated
+DIR_LOWER = 0.8
+DIR_UPPER = 1.25
+
+
+def disparate_impact(rate, privileged_rate):
+    """
+    Disparate impact ratio of a group's rate against the privileged group's rate.
+    Returns:
+        (ratio, is_biased); the ratio is 0 when the privileged rate is 0.
+    """
+    ratio = rate / privileged_rate if privileged_rate > 0 else 0 # Avoid division by zero
+    return ratio, (ratio < DIR_LOWER or ratio > DIR_UPPER)
@@ -0,0 +1,72 @@
+# importcheck.py
+#
+# Import-time and memory budget for the text-only path. Run from the Ai folder:
+#   python -m fairguard.importcheck
+# Each measurement runs in a fresh interpreter; exits non-zero if a budget is exceeded or a
+# heavy module was imported.
+
+import json
+import os
+import subprocess
+import sys
+
+IMPORT_BUDGET_MS = 100
+RSS_BUDGET_MB = 8
+HEAVY_MODULES = ("torch", "transformers", "easyocr", "ultralytics", "cv2", "PIL", "numpy", "pandas")
+
+_PROBE = """
+import json, resource, sys, time
+baseline_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+start = time.perf_counter()
+from fairguard.engine import analyze_text
+import_ms = (time.perf_counter() - start) * 1000
+analyze_text("Are you a successful businessman? Call 555-123-4567.")
+print(json.dumps({
+    "import_ms": import_ms,
+    "rss_delta_mb": (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - baseline_kb) / 1024,
+    "heavy": [name for name in HEAVY if name in sys.modules],
+}))
+"""
+
+
+def measure(runs=5):
+    """
+    Imports fairguard.engine and analyzes one copy in `runs` fresh interpreters.
+    Returns:
+        The median import time (ms), the largest peak-RSS growth (MB) and any heavy modules seen.
+    """
+    ai_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    probe = f"HEAVY = {HEAVY_MODULES!r}\n" + _PROBE
+    samples = []
+    for _ in range(runs):
+        output = subprocess.run([sys.executable, "-c", probe], cwd=ai_dir, check=True,
+                                capture_output=True, text=True).stdout
+        samples.append(json.loads(output))
+    import_times = sorted(sample["import_ms"] for sample in samples)
+    return {
+        "import_ms": import_times[len(import_times) // 2],
+        "rss_delta_mb": max(sample["rss_delta_mb"] for sample in samples),
+        "heavy": sorted({name for sample in samples for name in sample["heavy"]}),
+    }
+
+
+def main():
+    result = measure()
+    failures = []
+    if result["heavy"]:
+        failures.append(f"heavy modules imported: {', '.join(result['heavy'])}")
+    if result["import_ms"] > IMPORT_BUDGET_MS:
+        failures.append(f"import took {result['import_ms']:.1f} ms (budget {IMPORT_BUDGET_MS} ms)")
+    if result["rss_delta_mb"] > RSS_BUDGET_MB:
+        failures.append(f"RSS grew {result['rss_delta_mb']:.1f} MB (budget {RSS_BUDGET_MB} MB)")
+
+    print(f"text path: import {result['import_ms']:.1f} ms, RSS +{result['rss_delta_mb']:.1f} MB")
+    for failure in failures:
+        print(f"  FAIL: {failure}")
+    if not failures:
+        print("  OK: within budget, no heavy modules imported")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,163 @@
+# llm.py
+#
+# Local-LLM (Ollama) bias analysis of object captions. The model is asked for JSON matching
+# ANALYSIS_SCHEMA, the streamed NDJSON reply is parsed line by line as it arrives, and results
+# are cached by (model, normalized prompt) with identical in-flight requests sharing one
+# generation. tests/test_llm.py checks it against a fake Ollama server.
+
+import copy
+import json
+import os
+import re
+import urllib.request
+
+from .memo import MemoCache, content_hash
+from .prompt import budget_captions, estimate_tokens
+from .result_model import CATEGORIES
+
+OLLAMA_URL = os.environ.get("FAIRGUARD_OLLAMA_URL", "http://localhost:11434")
+DEFAULT_MODEL = "llama3.2:3b"
+REQUEST_TIMEOUT = 120
+
+# Ollama structured outputs: the reply is constrained to this JSON schema
+ANALYSIS_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "scene": {"type": "string"},
+        "bias_categories": {
+            "type": "object",
+            "properties": {category: {"type": "array", "items": {"type": "string"}} for category in CATEGORIES},
+        },
+        "suggestions": {"type": "array", "items": {"type": "string"}},
+    },
+    "required": ["scene", "bias_categories", "suggestions"],
+}
+
+PROMPT_TEMPLATE = """You review advertising images for bias.
+Object-level captions extracted from the image (JSON):
+{captions}
+
+Describe the overall scene. List any signs of bias under these categories: {categories}.
+Use an empty list for categories with no signs. Suggest ways to make the image more inclusive if needed.
+Answer with JSON only."""
+
+# Shared across callers: bounded TTL cache + in-flight de-duplication (see memo.py)
+_cache = MemoCache(max_entries=512, ttl=24 * 3600, max_workers=4)
+
+
+class LLMError(RuntimeError):
+    pass
+
+
+def build_prompt(captions, image_size=None, budget=None):
+    """
+    Builds the analysis prompt from object captions (strings or {"caption", "box", "conf"}
+    dicts), compacted to the caption token budget (see prompt.py).
+    Returns:
+        (prompt, metrics) where metrics include "prompt_tokens" and "prompt_chars".
+    """
+    caption_list, metrics = budget_captions(captions, image_size, budget)
+    prompt = PROMPT_TEMPLATE.format(captions=caption_list, categories=", ".join(CATEGORIES))
+    metrics["prompt_tokens"] = estimate_tokens(prompt)
+    metrics["prompt_chars"] = len(prompt)
+    return prompt, metrics
+
+
+def normalize_prompt(prompt):
+    """
+    Collapses whitespace so prompts that differ only in layout share a cache entry.
+    """
+    return re.sub(r"\s+", " ", prompt).strip()
+
+
+def cache_key(prompt, model):
+    """
+    Cache key for one generation: hash of the model name and the normalized prompt.
+    """
+    return content_hash(f"{model}\n{normalize_prompt(prompt)}")
+
+
+def iter_ndjson(lines):
+    """
+    Decodes Ollama's streamed NDJSON one line at a time, yielding each chunk's "response"
+    text. Raises LLMError on an "error" chunk; stops at the chunk with "done": true.
+    """
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        chunk = json.loads(line)
+        if "error" in chunk:
+            raise LLMError(chunk["error"])
+        if chunk.get("response"):
+            yield chunk["response"]
+        if chunk.get("done"):
+            return
+
+
+def parse_analysis(text):
+    """
+    Parses the model's JSON reply into {"scene", "bias_categories", "suggestions"}, filling
+    in anything the model left out.
+    """
+    try:
+        data = json.loads(text)
+    except json.JSONDecodeError:
+        # Fall back to the outermost {...} if the model wrapped the JSON in prose
+        start, end = text.find("{"), text.rfind("}")
+        if start < 0 or end <= start:
+            raise LLMError(f"Model did not return JSON: {text[:200]!r}")
+        data = json.loads(text[start:end + 1])
+
+    categories = data.get("bias_categories") or {}
+    return {
+        "scene": str(data.get("scene", "")),
+        "bias_categories": {category: [str(flag) for flag in categories.get(category) or []] for category in CATEGORIES},
+        "suggestions": [str(s) for s in data.get("suggestions") or []],
+    }
+
+
+def _generate(prompt, model, on_text=None):
+    payload = {"model": model, "prompt": prompt, "format": ANALYSIS_SCHEMA, "stream": True,
+               "options": {"temperature": 0}}
+    request = urllib.request.Request(
+        f"{OLLAMA_URL}/api/generate",
+        data=json.dumps(payload).encode("utf-8"),
+        headers={"Content-Type": "application/json"},
+    )
+    parts = []
+    with urllib.request.urlopen(request, timeout=REQUEST_TIMEOUT) as response:
+        for text in iter_ndjson(response):
+            parts.append(text)
+            if on_text is not None:
+                on_text(text)
+    result = parse_analysis("".join(parts))
+    result["model"] = model
+    return result
+
+
+def analyze_prompt(prompt, model=DEFAULT_MODEL, on_text=None, use_cache=True):
+    """
+    Runs one structured analysis. Cached by (model, normalized prompt); concurrent callers with
+    the same key wait on the same generation. `on_text` receives streamed text fragments of a
+    generation this call starts (not of cached or shared ones).
+    Returns:
+        {"scene", "bias_categories", "suggestions", "model"}, a copy the caller may modify.
+    """
+    if not use_cache:
+        return _generate(prompt, model, on_text)
+    # The cached dict is shared by every caller with this key; hand out copies
+    return copy.deepcopy(_cache.submit(cache_key(prompt, model), _generate, prompt, model, on_text).result())
+
+
+def analyze_captions(captions, model=DEFAULT_MODEL, on_text=None, use_cache=True, image_size=None):
+    """
+    Structured bias analysis of object captions with the local LLM.
+    Pass the image's (width, height) so tiny boxes can be dropped from the prompt.
+    Returns:
+        The analyze_prompt() result plus "prompt_metrics" (sizes, drops, merges, truncation).
+    """
+    prompt, metrics = build_prompt(captions, image_size)
+    result = analyze_prompt(prompt, model, on_text, use_cache)
+    result["prompt_metrics"] = metrics
+    return result
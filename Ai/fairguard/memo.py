@@ -0,0 +1,79 @@
+# memo.py
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+
+
+def content_hash(data):
+    """
+    SHA-256 hex digest of uploaded bytes (or text), used as the memoization key.
+    """
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    return hashlib.sha256(data).hexdigest()
+
+
+class MemoCache:
+    """
+    Thread-safe, size-bounded TTL cache for expensive model calls (OCR, captioning).
+    submit() runs misses on a background executor and de-duplicates in-flight work, so
+    concurrent sessions asking for the same key share one computation. Failures are not cached.
+    """
+
+    def __init__(self, max_entries=128, ttl=3600, max_workers=2):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()  # key -> (expires_at, value)
+        self._in_flight = {}  # key -> Future
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="fairguard-model")
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return default
+            self._entries.move_to_end(key)
+            return value
+
+    def put(self, key, value):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def submit(self, key, fn, *args):
+        """
+        Returns a Future for fn(*args): already resolved on a cache hit, shared with any
+        identical request still running, otherwise newly scheduled on the executor.
+        """
+        missing = object()
+        value = self.get(key, missing)
+        if value is not missing:
+            future = Future()
+            future.set_result(value)
+            return future
+
+        with self._lock:
+            future = self._in_flight.get(key)
+            if future is not None:
+                return future
+            future = self._executor.submit(fn, *args)
+            self._in_flight[key] = future
+
+        def _done(f):
+            with self._lock:
+                self._in_flight.pop(key, None)
+            if f.exception() is None:
+                self.put(key, f.result())
+
+        future.add_done_callback(_done)
+        return future
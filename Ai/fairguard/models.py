@@ -0,0 +1,218 @@
+# models.py
+#
+# Lazily loaded model adapters (EasyOCR, BLIP captioning, YOLO detection). Nothing heavy is
+# imported until a model is first used, so text-only consumers of the package never pay for
+# torch; each model is loaded once per process and shared by every front-end.
+#
+# Set FAIRGUARD_MODEL_DIR to load every model from a local directory with downloads disabled:
+#   $FAIRGUARD_MODEL_DIR/easyocr/                       EasyOCR detector + recognizer weights
+#   $FAIRGUARD_MODEL_DIR/blip-image-captioning-base/    save_pretrained() output of the BLIP model
+#   $FAIRGUARD_MODEL_DIR/yolov8n.pt                     YOLO weights
+
+import os
+import threading
+
+OCR_LANGUAGES = ['en']
+CAPTION_MODEL = "Salesforce/blip-image-captioning-base"
+DETECTION_MODEL = "yolov8n.pt"
+MODEL_NAMES = ("ocr", "caption", "detect")
+
+_models = {}
+_load_lock = threading.Lock()
+
+
+def _get(name, loader):
+    model = _models.get(name)
+    if model is None:
+        with _load_lock:
+            model = _models.get(name)
+            if model is None:
+                model = _models[name] = loader()
+    return model
+
+
+def model_dir():
+    """
+    The local model directory from FAIRGUARD_MODEL_DIR, or None to use the default caches.
+    """
+    return os.environ.get("FAIRGUARD_MODEL_DIR") or None
+
+
+def _require(path):
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"{path} not found; populate FAIRGUARD_MODEL_DIR before starting.")
+    return path
+
+
+def _load_ocr_reader():
+    import easyocr
+    local_dir = model_dir()
+    if local_dir is None:
+        return easyocr.Reader(OCR_LANGUAGES, gpu=False) # Set gpu=True if you have a compatible GPU and drivers
+    return easyocr.Reader(OCR_LANGUAGES, gpu=False, download_enabled=False,
+                          model_storage_directory=_require(os.path.join(local_dir, "easyocr")))
+
+
+def _load_captioner():
+    local_dir = model_dir()
+    if local_dir is None:
+        from transformers import pipeline
+        return pipeline("image-to-text", model=CAPTION_MODEL)
+    # Never reach for the Hub when models are provisioned locally
+    os.environ.setdefault("HF_HUB_OFFLINE", "1")
+    os.environ.setdefault("TRANSFORMERS_OFFLINE", "1")
+    from transformers import pipeline
+    return pipeline("image-to-text", model=_require(os.path.join(local_dir, CAPTION_MODEL.split("/")[-1])))
+
+
+def _load_detector():
+    from ultralytics import YOLO
+    local_dir = model_dir()
+    if local_dir is None:
+        return YOLO(DETECTION_MODEL)  # Make sure this file is in your project folder
+    return YOLO(_require(os.path.join(local_dir, DETECTION_MODEL)))
+
+
+def get_ocr_reader():
+    """
+    Returns the process-wide EasyOCR reader, loading it on first use.
+    Models are downloaded on the first run unless FAIRGUARD_MODEL_DIR is set.
+    """
+    return _get("ocr", _load_ocr_reader)
+
+
+def get_captioner():
+    """
+    Returns the process-wide Hugging Face image-to-text pipeline (BLIP), loading it on first use.
+    """
+    return _get("caption", _load_captioner)
+
+
+def get_detector():
+    """
+    Returns the process-wide YOLO object detector, loading it on first use.
+    """
+    return _get("detect", _load_detector)
+
+
+def get_model(name):
+    """
+    Returns the model registered under `name` ("ocr", "caption" or "detect").
+    """
+    return {"ocr": get_ocr_reader, "caption": get_captioner, "detect": get_detector}[name]()
+
+
+def is_loaded(name):
+    """
+    True once the model registered under `name` has been loaded in this process.
+    """
+    return name in _models
+
+
+def load_image(image):
+    """
+    Accepts image bytes, a file path or a PIL image and returns an RGB PIL image.
+    """
+    from PIL import Image
+    if isinstance(image, (bytes, bytearray)):
+        import io
+        return Image.open(io.BytesIO(image)).convert("RGB")
+    if isinstance(image, str):
+        return Image.open(image).convert("RGB")
+    return image.convert("RGB")
+
+
+def ocr_text(image):
+    """
+    Extracts text from an image with EasyOCR, after downscaling it to the OCR input size.
+    Args:
+        image: Image bytes, a file path or a PIL image.
+    Returns:
+        A string containing all extracted text.
+    """
+    import numpy as np
+    from .preprocess import for_ocr
+    results = get_ocr_reader().readtext(np.asarray(for_ocr(image)), detail=0)
+    return " ".join(results)
+
+
+def _caption_text(output):
+    # The pipeline returns [{'generated_text': ...}] per image
+    if isinstance(output, list):
+        output = output[0] if output else None
+    if isinstance(output, dict):
+        return output.get('generated_text', "")
+    return ""
+
+
+def caption_image(image):
+    """
+    Generates a descriptive caption for one image.
+    Returns:
+        The caption, or an empty string if the model produced none.
+    """
+    from .preprocess import for_caption
+    return _caption_text(get_captioner()(for_caption(image)))
+
+
+def caption_images(images, batch_size=8):
+    """
+    Captions several images in batched BLIP calls.
+    Returns:
+        One caption per image, in order.
+    """
+    from .preprocess import for_caption
+    images = [for_caption(image) for image in images]
+    if not images:
+        return []
+    return [_caption_text(output) for output in get_captioner()(images, batch_size=batch_size)]
+
+
+def detect_objects(image_path):
+    """
+    Runs YOLO object detection.
+    Returns:
+        A Detections (boxes in pixel coordinates, confidences and class ids as arrays);
+        call .to_boxes() for plain lists.
+    """
+    from .detections import Detections
+    return Detections.from_result(get_detector()(image_path, verbose=False)[0])
+
+
+def detect_batch(images, batch_size=16):
+    """
+    Runs YOLO on several images (paths or arrays) in batched calls.
+    Returns:
+        One Detections per image, in order.
+    """
+    from .detections import Detections
+    detector, results = get_detector(), []
+    for start in range(0, len(images), batch_size):
+        results.extend(detector(list(images[start:start + batch_size]), verbose=False))
+    return [Detections.from_result(result) for result in results]
+
+
+def caption_regions(image_path, boxes, batch_size=8):
+    """
+    Captions each detected region: the image is cropped to every box and the crops are
+    captioned in batches.
+    Returns:
+        A list of {"box": [x1, y1, x2, y2], "caption": str}, one per box, with "conf" when the
+        boxes carry a fifth (confidence) value.
+    """
+    image = load_image(image_path)
+    width, height = image.size
+    crops, kept = [], []
+    for box in boxes:
+        x1, y1, x2, y2 = (int(round(v)) for v in box[:4])
+        x1, y1 = max(0, x1), max(0, y1)
+        x2, y2 = min(width, x2), min(height, y2)
+        if x2 - x1 < 2 or y2 - y1 < 2:
+            continue
+        crops.append(image.crop((x1, y1, x2, y2)))
+        region = {"box": [x1, y1, x2, y2]}
+        if len(box) > 4:
+            region["conf"] = float(box[4])
+        kept.append(region)
+    captions = caption_images(crops, batch_size=batch_size)
+    return [dict(region, caption=caption) for region, caption in zip(kept, captions)]
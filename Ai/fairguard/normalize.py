@@ -0,0 +1,320 @@
+# normalize.py
+#
+# Obfuscation- and OCR-resistant text for the keyword rules. Ad copy that dodges the term
+# lists ("sc@m", "k i l l", Cyrillic look-alikes) and noisy OCR output ("vio1ence",
+# "struggIing") are folded to one canonical lowercase form, and words within a small edit
+# distance of a term are corrected to it through a precomputed deletion index (SymSpell), so
+# the existing substring rules can run unchanged on the result. Correction is gated on
+# evidence of noise: words that folding changed or that mix case get any correction within
+# reach; plain words only typo-shaped ones (doubled letters, swapped neighbours, OCR
+# look-alikes), so "mouth" never becomes "youth".
+# Run `python -m fairguard.normalize` (from the Ai folder) for the recall and throughput benchmark.
+
+import re
+import unicodedata
+from functools import lru_cache
+
+from .bias_rules import TEXT_RULE_TRIGGERS
+from .security_checks import HARMFUL_TERMS
+
+# Look-alike letters from other scripts (Cyrillic, Greek, IPA) -> ASCII
+HOMOGLYPHS = {
+    "а": "a", "в": "b", "е": "e", "ё": "e", "к": "k", "м": "m", "н": "h", "о": "o", "р": "p", "с": "c",
+    "т": "t", "у": "y", "х": "x", "ѕ": "s", "і": "i", "ї": "i", "ј": "j", "ԁ": "d", "ԛ": "q", "ԝ": "w",
+    "α": "a", "β": "b", "ε": "e", "η": "n", "ι": "i", "κ": "k", "ν": "v", "ο": "o", "ρ": "p", "τ": "t",
+    "υ": "u", "χ": "x", "ɑ": "a", "ɡ": "g", "ı": "i", "ł": "l", "ø": "o", "ß": "ss", "€": "e",
+}
+ZERO_WIDTH = "­​‌‍⁠﻿"
+# Leetspeak, applied only inside words that also contain letters ("sc@m", not "555" or "$20")
+LEET = {"0": "o", "1": "i", "3": "e", "4": "a", "5": "s", "7": "t", "@": "a", "$": "s", "!": "i", "|": "l", "+": "t"}
+
+# Edit distance allowed when correcting a word of this length; shorter words are only
+# normalized ("hate" and "kill" are one edit from too many ordinary words)
+FUZZY_MIN_LENGTH = 5
+FUZZY_LONG_LENGTH = 9  # From here on two edits are allowed
+# Letters OCR mistakes for one another (digits and symbols are already folded as leetspeak)
+OCR_CONFUSABLE = {("i", "l"), ("l", "i"), ("i", "j"), ("j", "i"), ("c", "e"), ("e", "c"), ("u", "v"), ("v", "u")}
+
+_FOLD = str.maketrans({**HOMOGLYPHS, **{ch: None for ch in ZERO_WIDTH}})
+_LEET = str.maketrans(LEET)
+_LEET_WORD = re.compile(r"[a-z0-9@$!|+]*[a-z][a-z0-9@$!|+]*")
+# A letter next to a leet character; most copies have none and skip the word-by-word pass
+_LEET_HINT = re.compile(r"[a-z][0-9@$|+]|[0-9@$!|+][a-z]")
+# Three or more single characters split by spaces or punctuation: "k i l l", "s.c.a.m"
+_SPACED = re.compile(r"(?<![\w@$'])(?:[a-z0-9@$][ .\-_*]){2,}[a-z0-9@$](?![\w@$'])")
+_SPACER = re.compile(r"[ .\-_*]")
+_WORD = re.compile(r"[a-z]+")
+# A capital inside a lowercase word: OCR reading "l" as "I" ("struggIing")
+_MIXED_CASE = re.compile(r"[A-Za-z]*[a-z][A-Z][A-Za-z]*")
+
+
+def _unleet(match):
+    word = match.group(0).rstrip("!+")  # Trailing "!" is punctuation, not an "i"
+    if word.isalpha():
+        return match.group(0)
+    return word.translate(_LEET) + match.group(0)[len(word):]
+
+
+def fold(text):
+    """
+    Canonical lowercase form of `text`: Unicode NFKC, accents stripped, look-alike letters and
+    zero-width characters folded, leetspeak mapped inside words, spaced-out letters joined and
+    whitespace collapsed. Only for term matching: PII checks need the original text.
+    """
+    if not text.isascii():
+        text = unicodedata.normalize("NFKC", text).casefold().translate(_FOLD)
+        # Strip combining marks ("kïll" -> "kill")
+        text = "".join(ch for ch in unicodedata.normalize("NFD", text) if not unicodedata.combining(ch))
+    else:
+        text = text.lower()
+    text = _SPACED.sub(lambda match: _SPACER.sub("", match.group(0)), text)
+    if _LEET_HINT.search(text):
+        text = _LEET_WORD.sub(_unleet, text)
+    return " ".join(text.split())
+
+
+def edit_distance(a, b, limit):
+    """
+    Optimal string alignment distance (Levenshtein plus adjacent transpositions), or
+    limit + 1 as soon as it must exceed `limit`.
+    """
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous2, previous = None, list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = a[i - 1] != b[j - 1]
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                current[j] = min(current[j], previous2[j - 2] + 1)
+        if min(current) > limit:
+            return limit + 1
+        previous2, previous = previous, current
+    return previous[-1]
+
+
+def max_distance(length):
+    if length < FUZZY_MIN_LENGTH:
+        return 0
+    return 2 if length >= FUZZY_LONG_LENGTH else 1
+
+
+def _deletes(word, distance):
+    found, frontier = {word}, {word}
+    for _ in range(distance):
+        frontier = {candidate[:i] + candidate[i + 1:] for candidate in frontier for i in range(len(candidate))}
+        found |= frontier
+    return found
+
+
+class FuzzyIndex:
+    """
+    SymSpell-style deletion index over single-word terms: every term is stored under all
+    strings reachable by deleting up to max_distance() characters, so a lookup only generates
+    the deletes of the query word and checks the few candidates that share one.
+    """
+
+    def __init__(self, terms):
+        self.terms = sorted({term for term in terms if " " not in term and len(term) >= FUZZY_MIN_LENGTH})
+        self._index = {}
+        for term in self.terms:
+            for deleted in _deletes(term, max_distance(len(term))):
+                self._index.setdefault(deleted, []).append(term)
+
+    def lookup(self, word):
+        """
+        The closest term within the allowed edit distance of `word`, or None.
+        """
+        limit = max_distance(len(word))
+        if not limit:
+            return None
+        best, best_distance = None, limit + 1
+        for deleted in _deletes(word, limit):
+            for term in self._index.get(deleted, ()):
+                distance = edit_distance(word, term, min(limit, max_distance(len(term))))
+                if distance < best_distance or (distance == best_distance and term < best):
+                    best, best_distance = term, distance
+        return best
+
+
+TERM_INDEX = FuzzyIndex(sum(TEXT_RULE_TRIGGERS.values(), []) + HARMFUL_TERMS)
+
+
+def _is_typo(word, term):
+    """
+    True if `word` differs from `term` only by doubled letters, swapped neighbours or OCR
+    look-alike letters. Ordinary words near a term ("mouth"/"youth", "sexiest"/"sexist",
+    "retire"/"retiree") differ in other ways.
+    """
+    if len(word) > len(term):  # "frauud", "weallth"
+        j = 0
+        for i, ch in enumerate(word):
+            if j < len(term) and ch == term[j]:
+                j += 1
+            elif i == 0 or word[i - 1] != ch:
+                return False
+        return j == len(term)
+    if len(word) < len(term):
+        return False
+    i = 0
+    while i < len(word):
+        if word[i] == term[i] or (word[i], term[i]) in OCR_CONFUSABLE:
+            i += 1
+        elif i + 1 < len(word) and word[i] == term[i + 1] and word[i + 1] == term[i]:  # "wheelchiar"
+            i += 2
+        else:
+            return False
+    return True
+
+
+@lru_cache(maxsize=65536)
+def _correction(word):
+    # Ad vocabulary repeats heavily, so almost every word is a cache hit after warm-up
+    if len(word) < FUZZY_MIN_LENGTH:
+        return None
+    term = TERM_INDEX.lookup(word)
+    if term is None or term in word:  # Already an exact (substring) match
+        return None
+    return term
+
+
+@lru_cache(maxsize=65536)
+def _typo_correction(word):
+    term = _correction(word)
+    return term if term is not None and _is_typo(word, term) else None
+
+
+def _noisy_words(text, folded):
+    """
+    Words of `folded` that show signs of obfuscation or OCR noise: produced by folding (they
+    are not words of the plain lowercased text) or written in mixed case.
+    """
+    lowered = text.lower()
+    if folded == " ".join(lowered.split()):  # Folding only lowercased: no word was changed
+        noisy = set()
+    else:
+        noisy = set(_WORD.findall(folded)) - set(_WORD.findall(lowered))
+    if not text.islower():
+        noisy.update(word.lower() for word in _MIXED_CASE.findall(text))
+    return noisy
+
+
+def canonical_text(text, fuzzy=True):
+    """
+    fold() plus, with `fuzzy`, words within edit distance of a bias or harmful term replaced
+    by that term: any such word that shows signs of obfuscation or OCR noise, and otherwise
+    only typo-shaped ones. The result feeds the substring rules in place of text.lower().
+    """
+    folded = fold(text)
+    if not fuzzy:
+        return folded
+    candidates = {word for word in _WORD.findall(folded) if len(word) >= FUZZY_MIN_LENGTH and _correction(word)}
+    if not candidates:
+        return folded
+    noisy = _noisy_words(text, folded)
+    corrections = {word: _correction(word) if word in noisy else _typo_correction(word) for word in candidates}
+    if not any(corrections.values()):  # Only ordinary words near a term ("mouth", "Backyard")
+        return folded
+    return _WORD.sub(lambda match: corrections.get(match.group(0)) or match.group(0), folded)
+
+
+# Normalization plus fuzzy lookup may cost at most this factor over exact matching
+MAX_SLOWDOWN = 3.0
+
+
+def _benchmark(n=50000):
+    import random
+    import time
+
+    from .prefilter import analyze_copy
+
+    clean = [
+        "Get your exclusive offer today!",
+        "Discover our new summer collection, now in stores.",
+        "Fresh coffee, every morning. Order online and pick up in minutes.",
+        "Upgrade your phone plan and save on data.",
+        "Book your next adventure with flexible cancellation.",
+        "The smartest way to manage your team's projects.",
+        "Join thousands of happy customers who switched to us.",
+        "Stream the latest shows in stunning quality.",
+        "Handcrafted furniture built to last a lifetime.",
+        "Learn a new language in just ten minutes a day.",
+        "Cheap flights, health insurance and defensive driving courses.",
+        "Receive 20% off when you disable ads. Call 555-123-4567!",
+    ]
+    # Ordinary copy full of words within one or two edits of a term ("mouth"/"youth",
+    # "Backyard"/"backward", "sexiest"/"sexist", "retire"/"retiree")
+    near_miss = [
+        "Sunset views from our South Beach resort.",
+        "Fresh mouth wash for fresh breath all day.",
+        "Backyard BBQ season is here: grills from $99.",
+        "Wheat bread baked fresh every morning.",
+        "Our sexiest swimwear line yet.",
+        "The raciest thriller of the summer, now streaming.",
+        "Retire early with a plan that works for you.",
+        "Plan the trip you always wanted once you retire.",
+        "Our youngest chef wins the regional cook-off.",
+        "Cozy blankets made for snuggling on cold nights.",
+        "Check the weather before you head out.",
+        "A treasure chest of deals this weekend.",
+        "Attach files up to 2 GB with one click.",
+        "Erotic thrillers and romantic comedies on demand.",
+        "Ready for the Youth Olympics? Gear up with us.",
+        "Cheap seats, cheerful service.",
+        "Easy healthy lunches for busy weeks.",
+        "Wealthy in flavor, light on calories.",
+        "Mouthwatering deals on Southern comfort food.",
+        "Upgrade your backyard with outdoor lighting.",
+    ]
+    clean += near_miss
+    # (obfuscated or OCR-garbled copy, the term it hides)
+    hidden = [
+        ("It's not a sc@m, we promise", "scam"),
+        ("Don't k i l l your budget", "kill"),
+        ("No more vi0lence on screen", "violence"),
+        ("Escape p0v3rty today", "poverty"),
+        ("Ch3at the system", "cheat"),
+        ("Stop the frauud now", "fraud"),
+        ("Made for the struggIing family", "struggling"),
+        ("Perfect for every retir€e", "retiree"),
+        ("The ultimate bu$inessman watch", "businessman"),
+        ("Hаte speech is not welcome", "hate"),  # Cyrillic а
+        ("Say no to r a c i s t jokes", "racist"),
+        ("Find true weallth", "wealth"),
+        ("Our wheelchiar-friendly venue", "wheelchair"),
+        ("s.c.a.m alert", "scam"),
+        ("Ｂｏｍｂ deals this week", "bomb"),  # Full-width letters
+        ("Absolutely no viol​ence", "violence"),
+    ]
+
+    def found(result, term):
+        bias, _, harmful = result
+        return term in harmful["detected_items"] or bias["is_biased"]
+
+    def exact(text):
+        return analyze_copy(text, normalize=False)
+
+    exact_hits = sum(found(exact(text), term) for text, term in hidden)
+    fuzzy_hits = sum(found(analyze_copy(text), term) for text, term in hidden)
+    false_positives = sum(analyze_copy(text) != exact(text) for text in clean)
+    print(f"recall on {len(hidden)} obfuscated/OCR-noisy copies: exact {exact_hits}, normalized+fuzzy {fuzzy_hits}")
+    print(f"clean copies ({len(near_miss)} with near-miss words) whose result changed: {false_positives}/{len(clean)}")
+
+    rng = random.Random(7)
+    corpus = [rng.choice(hidden)[0] if rng.random() < 0.1 else rng.choice(clean) for _ in range(n)]
+    timings = {}
+    for label, fn in (("exact", exact), ("normalized+fuzzy", analyze_copy)):
+        start = time.perf_counter()
+        for text in corpus:
+            fn(text)
+        timings[label] = time.perf_counter() - start
+    for label, seconds in timings.items():
+        print(f"  {label:<17} {seconds * 1e6 / n:8.2f} us/copy")
+    factor = timings["normalized+fuzzy"] / timings["exact"]
+    print(f"  slowdown: {factor:.2f}x (budget {MAX_SLOWDOWN}x)")
+    return fuzzy_hits > exact_hits and not false_positives and factor <= MAX_SLOWDOWN
+
+
+if __name__ == "__main__":
+    raise SystemExit(0 if _benchmark() else 1)
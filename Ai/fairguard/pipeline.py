@@ -0,0 +1,126 @@
+# pipeline.py
+#
+# Image analysis pipeline shared by the front-ends: locked single-model calls for the
+# single-image path and the batch pipeline for multi-file uploads. EasyOCR, BLIP and YOLO are
+# not thread-safe, so every call into a model holds that model's lock here. One batch can be in
+# OCR while another is captioned, but no two calls (single image or batch, from any session)
+# run the same model at once.
+
+import threading
+
+from . import models
+from .engine import analyze_visual, overall_bias_score
+from .prefilter import analyze_copy
+
+_locks = {name: threading.Lock() for name in models.MODEL_NAMES}
+
+
+def ocr_text(image):
+    """
+    models.ocr_text() under the OCR lock. Safe to call off the script thread.
+    """
+    with _locks["ocr"]:
+        return models.ocr_text(image)
+
+
+def caption_image(image):
+    """
+    models.caption_image() under the captioning lock. Safe to call off the script thread.
+    """
+    with _locks["caption"]:
+        return models.caption_image(image)
+
+
+def caption_images(images):
+    """
+    Captions several images in one BLIP call, under the captioning lock.
+    """
+    with _locks["caption"]:
+        return models.caption_images(images, batch_size=len(images))
+
+
+def detect_batch(images):
+    """
+    Runs YOLO on several images in one call, under the detection lock.
+    """
+    with _locks["detect"]:
+        return models.detect_batch(images, batch_size=len(images))
+
+
+def analyze_creatives(creatives):
+    """
+    Decodes a batch of Creatives (see batch_ingest.py), runs OCR on each, captions and
+    detects people on the whole batch in one call per model, then applies the text and visual
+    rules. A failing step is reported in the creative's "error" and the rest still runs.
+    Returns:
+        A list of per-creative dicts: name, content key, error, extracted_text, caption,
+        detections (None if detection failed), text_bias, pii, harmful and visual.
+    """
+    images, results = [], []
+    for creative in creatives:
+        item = {"name": creative.name, "content": creative.content, "error": ""}
+        try:
+            images.append(creative.load())
+        except Exception as e:
+            images.append(None)
+            item["error"] = f"Could not decode: {e}"
+        results.append(item)
+
+    with _locks["ocr"]:
+        for image, item in zip(images, results):
+            item["extracted_text"] = ""
+            if image is not None:
+                try:
+                    item["extracted_text"] = models.ocr_text(image)
+                except Exception as e:
+                    item["error"] = f"OCR failed: {e}"
+
+    captions = [""] * len(images)
+    decoded = [i for i, image in enumerate(images) if image is not None]
+    if decoded:
+        try:
+            for i, caption in zip(decoded, caption_images([images[i] for i in decoded])):
+                captions[i] = caption
+        except Exception as e:
+            for i in decoded:
+                results[i]["error"] = results[i]["error"] or f"Captioning failed: {e}"
+
+    # Person boxes for the campaign representation counters; without them only caption cues count
+    detections = [None] * len(images)
+    if decoded:
+        try:
+            for i, found in zip(decoded, detect_batch([images[i] for i in decoded])):
+                detections[i] = found
+        except Exception as e:
+            for i in decoded:
+                results[i]["error"] = results[i]["error"] or f"Detection failed: {e}"
+    del images  # Decoded pages are released before the next batch is pulled in
+
+    for item, caption, found in zip(results, captions, detections):
+        item["text_bias"], item["pii"], item["harmful"] = analyze_copy(item["extracted_text"])
+        item["caption"] = caption
+        item["detections"] = found
+        item["visual"] = analyze_visual(caption, item["extracted_text"])
+    return results
+
+
+def summarize_creative(item):
+    """
+    One row of a batch summary table, from an analyze_creatives() item.
+    """
+    categories = sorted(
+        {category for category, flags in item["text_bias"]["bias_categories"].items() if flags} |
+        {category for category, flags in item["visual"]["bias_categories"].items() if flags}
+    )
+    return {
+        "Creative": item["name"],
+        "Overall Score": overall_bias_score(item["text_bias"]["bias_score"], item["visual"]["visual_bias_score"]),
+        "Text Score": item["text_bias"]["bias_score"],
+        "Visual Score": item["visual"]["visual_bias_score"],
+        "Bias Categories": ", ".join(category.replace('_', ' ') for category in categories),
+        "PII": ", ".join(item["pii"]["detected_items"]),
+        "Harmful": ", ".join(item["harmful"]["detected_items"]),
+        "Caption": item["caption"],
+        "Extracted Text": item["extracted_text"][:200],
+        "Error": item["error"],
+    }
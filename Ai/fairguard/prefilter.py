@@ -0,0 +1,152 @@
+# prefilter.py
+#
+# Fast pre-screen for ad copies. Every bias rule, harmful-content term and PII pattern needs
+# at least one specific substring (or a digit / "@") to fire, so one compiled scan over the
+# union of those triggers proves most clean copies "all clear" without running the rule engine.
+# Term checks see the copy through normalize.canonical_text(), so obfuscated terms still match.
+# Run `python -m fairguard.prefilter` (from the Ai folder) for the equivalence check and benchmark.
+
+import re
+
+from .normalize import canonical_text
+from .bias_rules import TEXT_RULES, TEXT_RULE_TRIGGERS, analyze_text_for_bias, build_text_result
+from .rule_stats import run_rules
+from .security_checks import HARMFUL_TERMS, check_for_harmful_content, check_for_pii
+
+# Rules whose triggers are so common in English that gating them would rarely skip anything
+# ('he' occurs in "the", "when", "here", ...). They are always evaluated, which is cheap.
+UNGATED_RULES = {"text.gender_centric"}
+
+
+def _minimal_terms(terms):
+    """
+    Drops every term that contains another term: if "he" is present, so is any "she" match.
+    """
+    unique = sorted(set(terms), key=len)
+    kept = []
+    for term in unique:
+        if not any(shorter in term for shorter in kept):
+            kept.append(term)
+    return kept
+
+
+def _trie_pattern(node):
+    branches = [re.escape(ch) + _trie_pattern(child) for ch, child in sorted(node.items()) if ch]
+    if not branches:
+        return ""
+    pattern = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+    return "(?:" + pattern + ")?" if "" in node else pattern
+
+
+def build_gate(terms):
+    """
+    Compiles the trigger terms into one trie-shaped regex ("b(?:ackward|omb)|..."), which the
+    regex engine scans far faster than a flat alternation of every term.
+    """
+    trie = {}
+    for term in _minimal_terms(terms):
+        node = trie
+        for ch in term:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+    return re.compile(_trie_pattern(trie))
+
+
+_GATED_TRIGGERS = [
+    term for name, terms in TEXT_RULE_TRIGGERS.items() if name not in UNGATED_RULES for term in terms
+] + HARMFUL_TERMS
+_TERM_GATE = build_gate(_GATED_TRIGGERS)
+# Every PII pattern needs an "@" (emails) or a digit (phones, cards)
+_PII_GATE = re.compile(r'[\d@]')
+_UNGATED_RULES = [(name, rule) for name, rule in TEXT_RULES if name in UNGATED_RULES]
+
+
+def needs_full_analysis(text, terms_text=None):
+    """
+    True if any gated rule, harmful term or PII pattern could match `text`. Terms are looked
+    for in `terms_text`, by default canonical_text(text) as in analyze_copy(); PII in `text`.
+    """
+    if terms_text is None:
+        terms_text = canonical_text(text)
+    return _PII_GATE.search(text) is not None or _TERM_GATE.search(terms_text) is not None
+
+
+def analyze_copy(text, normalize=True):
+    """
+    Runs bias, PII and harmful-content checks on one ad copy.
+    Returns (bias_results, pii_results, harmful_results), identical to calling
+    analyze_text_for_bias, check_for_pii and check_for_harmful_content directly, but clean
+    copies only pay for the pre-screen and the ungated rules. With `normalize`, the term
+    checks run on canonical_text(text), which undoes obfuscation and OCR noise (see
+    normalize.py); PII always runs on the original text.
+    """
+    terms_text = canonical_text(text) if normalize else text.lower()
+    if needs_full_analysis(text, terms_text):
+        return analyze_text_for_bias(terms_text), check_for_pii(text), check_for_harmful_content(terms_text)
+
+    return (
+        build_text_result(run_rules(_UNGATED_RULES, terms_text)),
+        {"has_pii": False, "detected_items": []},
+        {"has_harmful_content": False, "detected_items": []},
+    )
+
+
+def _benchmark(n=50000, dirty_share=0.1):
+    import random
+    import time
+
+    clean = [
+        "Get your exclusive offer today!",
+        "Discover our new summer collection, now in stores.",
+        "Fresh coffee, every morning. Order online and pick up in minutes.",
+        "Upgrade your phone plan and save on data.",
+        "Book your next adventure with flexible cancellation.",
+        "The smartest way to manage your team's projects.",
+        "Join thousands of happy customers who switched to us.",
+        "Stream the latest shows in stunning quality.",
+        "Handcrafted furniture built to last a lifetime.",
+        "Learn a new language in just ten minutes a day.",
+    ]
+    dirty = [
+        "Are you a successful businessman looking to grow your empire?",
+        "Retirees, find peace in our serene retirement community.",
+        "Call 555-123-4567 for your offer!",
+        "Safety features designed especially for women drivers.",
+        "A woman's touch makes every kitchen shine.",
+        "Escape poverty with this one weird trick - it's not a scam!",
+        "Email deals@example.com for your voucher.",
+        "For him: tools and gadgets he'll love.",
+    ]
+    rng = random.Random(7)
+    corpus = [rng.choice(dirty) if rng.random() < dirty_share else rng.choice(clean) for _ in range(n)]
+
+    def full(text):
+        terms_text = canonical_text(text)
+        return analyze_text_for_bias(terms_text), check_for_pii(text), check_for_harmful_content(terms_text)
+
+    # Equivalence: the realistic corpus plus random mixes of trigger terms, digits and filler
+    vocabulary = _GATED_TRIGGERS + sum(TEXT_RULE_TRIGGERS.values(), []) + [
+        "the", "they", "offer", "kitchen", "tools", "safe", "everyone", "all ages", "555", "@", "x.com",
+    ]
+    fuzz = [" ".join(rng.choice(vocabulary) for _ in range(rng.randint(0, 6))) for _ in range(n)]
+    mismatches = sum(full(text) != analyze_copy(text) for text in corpus + fuzz)
+    skipped = sum(not needs_full_analysis(text) for text in corpus)
+
+    timings = {}
+    for label, fn in (("full engine", full), ("pre-screened", analyze_copy)):
+        start = time.perf_counter()
+        for text in corpus:
+            fn(text)
+        timings[label] = time.perf_counter() - start
+
+    print(f"{n} copies, {dirty_share:.0%} dirty")
+    print(f"  identical results: {2 * n - mismatches}/{2 * n} (realistic + fuzzed)")
+    print(f"  skipped full analysis: {skipped}/{n}")
+    for label, seconds in timings.items():
+        print(f"  {label:<13} {seconds * 1e6 / n:8.2f} us/copy")
+    print(f"  speedup: {timings['full engine'] / timings['pre-screened']:.2f}x")
+    return mismatches
+
+
+if __name__ == "__main__":
+    raise SystemExit(1 if _benchmark() else 0)
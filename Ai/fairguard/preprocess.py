@@ -0,0 +1,162 @@
+# preprocess.py
+#
+# Decode-once, right-size image preprocessing for the models. Large JPEGs are decoded at a
+# reduced scale with PIL's draft() (the JPEG decoder skips 1/2, 1/4 or 1/8 of the work), EXIF
+# orientation is applied, palette/alpha images are flattened to RGB once, and the result is
+# downscaled to each model's effective input size: OCR keeps more resolution than captioning.
+# Run `python -m fairguard.preprocess [images...]` (from the Ai folder) to compare decode time,
+# decoded size and OCR output against full-resolution decoding on the sample images.
+
+import io
+import math
+
+from PIL import Image, ImageOps
+
+# EasyOCR's detector resizes to canvas_size (2560) on the long side, so more is wasted
+OCR_MAX_SIDE = 2560
+# BLIP base is fed 384x384; a little headroom keeps the processor's own resize sharp
+CAPTION_MAX_SIDE = 512
+EXIF_ORIENTATION = 0x0112
+# EXIF orientation tag -> transpose that makes the image upright (as ImageOps.exif_transpose)
+ORIENTATION_TRANSPOSE = {
+    2: Image.Transpose.FLIP_LEFT_RIGHT,
+    3: Image.Transpose.ROTATE_180,
+    4: Image.Transpose.FLIP_TOP_BOTTOM,
+    5: Image.Transpose.TRANSPOSE,
+    6: Image.Transpose.ROTATE_270,
+    7: Image.Transpose.TRANSVERSE,
+    8: Image.Transpose.ROTATE_90,
+}
+# image.info entries getexif() reads an orientation from (EXIF blocks and XMP packets)
+ORIENTATION_METADATA = ("exif", "Raw profile type exif", "XML:com.adobe.xmp", "xmp")
+
+
+def _open(image):
+    # Returns (image, opened here); only images opened here may be drafted
+    if isinstance(image, Image.Image):
+        return image, False
+    if isinstance(image, (bytes, bytearray)):
+        return Image.open(io.BytesIO(image)), True
+    return Image.open(image), True
+
+
+def _to_rgb(image):
+    if image.mode == "RGB":
+        return image
+    if image.mode == "P":
+        image = image.convert("RGBA" if "transparency" in image.info else "RGB")
+    if image.mode in ("RGBA", "LA", "PA"):
+        # Flatten transparency onto white (how creatives are shown); black would hide dark text
+        image = image.convert("RGBA")
+        background = Image.new("RGB", image.size, "white")
+        background.paste(image, mask=image.getchannel("A"))
+        return background
+    return image.convert("RGB")
+
+
+def decode(image, max_side=OCR_MAX_SIDE):
+    """
+    Decodes an image no larger than `max_side` on its long edge, upright and in RGB.
+    Args:
+        image: Image bytes, a file path or a PIL image. PIL images are never modified, so a
+            JPEG passed in unloaded is decoded at full size.
+        max_side: Long-edge limit in pixels; smaller images are left as they are.
+    Returns:
+        An RGB PIL image.
+    """
+    image, opened = _open(image)
+    if opened and image.format == "JPEG" and max(image.size) > max_side:
+        # Let the JPEG decoder scale down by the largest power of two that keeps the target size.
+        # draft() changes the image in place, so a caller's image is never drafted
+        scale = max_side / max(image.size)
+        image.draft("RGB", (math.ceil(image.width * scale), math.ceil(image.height * scale)))
+    orientation = image.getexif().get(EXIF_ORIENTATION, 1)
+    image = _to_rgb(image)
+    if max(image.size) > max_side:
+        # PIL's bilinear resize is antialiased and about 2x faster than Lanczos at these
+        # ratios; resize() returns a new image, so PIL images passed in are never modified
+        scale = max_side / max(image.size)
+        size = (max(1, round(image.width * scale)), max(1, round(image.height * scale)))
+        image = image.resize(size, Image.BILINEAR)
+    if orientation in ORIENTATION_TRANSPOSE:
+        # Rotate after downscaling: far fewer pixels to move
+        image = image.transpose(ORIENTATION_TRANSPOSE[orientation])
+        _drop_orientation(image)
+    return image
+
+
+def _drop_orientation(image):
+    # The pixels are upright now; without this, decoding the result again (prepare(), or a
+    # caller passing an already decoded image) would apply the EXIF orientation a second time.
+    # `image` is always a new image here, so dropping its metadata never touches the caller's.
+    for key in ORIENTATION_METADATA:
+        image.info.pop(key, None)
+
+
+def for_ocr(image):
+    """
+    Image sized for EasyOCR (long edge <= OCR_MAX_SIDE).
+    """
+    return decode(image, OCR_MAX_SIDE)
+
+
+def for_caption(image):
+    """
+    Image sized for BLIP captioning (long edge <= CAPTION_MAX_SIDE).
+    """
+    return decode(image, CAPTION_MAX_SIDE)
+
+
+def prepare(image):
+    """
+    Decodes once at OCR resolution and derives the smaller captioning image from it.
+    Returns:
+        (ocr_image, caption_image)
+    """
+    ocr_image = for_ocr(image)
+    return ocr_image, for_caption(ocr_image)
+
+
+def _compare(paths):
+    import difflib
+    import time
+
+    import numpy as np
+
+    from . import models
+
+    def full_decode(path):
+        return ImageOps.exif_transpose(Image.open(path)).convert("RGB")
+
+    print(f"{'image':<28}{'full px':>14}{'prepared px':>14}{'full ms':>10}{'prep ms':>10}{'OCR match':>11}")
+    worst = 1.0
+    for path in paths:
+        start = time.perf_counter()
+        full = full_decode(path)
+        full_ms = (time.perf_counter() - start) * 1000
+        start = time.perf_counter()
+        prepared = for_ocr(path)
+        prep_ms = (time.perf_counter() - start) * 1000
+
+        reader = models.get_ocr_reader()
+        full_text = " ".join(reader.readtext(np.array(full), detail=0)).lower()
+        prepared_text = " ".join(reader.readtext(np.asarray(prepared), detail=0)).lower()
+        match = difflib.SequenceMatcher(None, full_text.split(), prepared_text.split()).ratio() if full_text else 1.0
+        worst = min(worst, match)
+        print(f"{path[-28:]:<28}{'x'.join(map(str, full.size)):>14}{'x'.join(map(str, prepared.size)):>14}"
+              f"{full_ms:>10.1f}{prep_ms:>10.1f}{match:>11.2f}")
+    return worst
+
+
+if __name__ == "__main__":
+    import os
+    import sys
+
+    ai_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    samples = sys.argv[1:] or [
+        os.path.join(ai_dir, "image 2.jpg"),
+        os.path.join(ai_dir, "uploaded_image.jpg"),
+        os.path.join(ai_dir, "..", "Web2", "image2.jpg"),
+    ]
+    # OCR on the prepared images must read (nearly) the same words as on the originals
+    raise SystemExit(0 if _compare(samples) >= 0.9 else 1)
@@ -0,0 +1,159 @@
+# prompt.py
+#
+# Compact, token-budgeted caption lists for the LLM analysis prompt. Crowded images produce
+# dozens of near-identical crop captions ("a man in a suit", "man in suit"); prefill time grows
+# with prompt length, so low-confidence and tiny boxes are dropped, near-duplicates are merged
+# into one "caption x N" entry, the most salient captions go first and the list is cut to a
+# token budget.
+
+import json
+import os
+import re
+
+PROMPT_TOKEN_BUDGET = int(os.environ.get("FAIRGUARD_PROMPT_TOKENS", "384"))
+MIN_CONFIDENCE = 0.25
+MIN_AREA_SHARE = 0.005  # of the image area
+NEAR_DUPLICATE = 0.8  # word-set Jaccard similarity at which two captions are merged
+
+_STOP_WORDS = {"a", "an", "the", "of", "with", "and", "in", "on", "is", "are", "there", "this", "that"}
+_WORD = re.compile(r"[a-z0-9]+")
+_PIECE = re.compile(r"\w+|[^\w\s]")
+
+_tokenizer = None
+
+
+def _load_tokenizer():
+    # Optional: an exact count with the model's own tokenizer.json (FAIRGUARD_TOKENIZER)
+    global _tokenizer
+    path = os.environ.get("FAIRGUARD_TOKENIZER")
+    if _tokenizer is None and path:
+        from tokenizers import Tokenizer
+        _tokenizer = Tokenizer.from_file(path)
+    return _tokenizer
+
+
+def estimate_tokens(text):
+    """
+    Token count of `text`: exact with FAIRGUARD_TOKENIZER, otherwise a local BPE-style
+    estimate (one token per punctuation mark, about one per 4 characters of a word).
+    """
+    tokenizer = _load_tokenizer()
+    if tokenizer is not None:
+        return len(tokenizer.encode(text).ids)
+    return sum(1 + (len(piece) - 1) // 4 for piece in _PIECE.findall(text))
+
+
+def _caption_of(item):
+    return item if isinstance(item, str) else item.get("caption", "")
+
+
+def _content_words(caption):
+    return frozenset(word for word in _WORD.findall(caption.lower()) if word not in _STOP_WORDS)
+
+
+def _area_share(item, image_area):
+    box = item.get("box") if isinstance(item, dict) else None
+    if not box or not image_area:
+        return None
+    return max(0, box[2] - box[0]) * max(0, box[3] - box[1]) / image_area
+
+
+def compact_captions(captions, image_size=None, min_confidence=MIN_CONFIDENCE,
+                     min_area_share=MIN_AREA_SHARE, near_duplicate=NEAR_DUPLICATE):
+    """
+    Filters and de-duplicates object captions.
+    Args:
+        captions: Strings or {"caption", "box", "conf"} dicts (box/conf are optional).
+        image_size: (width, height), needed for the area filter.
+    Returns:
+        (entries, metrics): entries are [caption, count, salience], most salient first.
+    """
+    image_area = image_size[0] * image_size[1] if image_size else None
+    metrics = {"captions_in": len(captions), "dropped_low_confidence": 0, "dropped_small": 0,
+               "dropped_empty": 0, "merged_duplicates": 0}
+    groups = []  # [caption, words, count, salience]
+    for item in captions:
+        caption = " ".join(_caption_of(item).split())
+        words = _content_words(caption)
+        if not words:
+            metrics["dropped_empty"] += 1
+            continue
+        conf = item.get("conf") if isinstance(item, dict) else None
+        if conf is not None and conf < min_confidence:
+            metrics["dropped_low_confidence"] += 1
+            continue
+        area = _area_share(item, image_area)
+        if area is not None and area < min_area_share:
+            metrics["dropped_small"] += 1
+            continue
+
+        salience = (conf if conf is not None else 1.0) * (area if area is not None else 1.0)
+        for group in groups:
+            if len(words & group[1]) / len(words | group[1]) >= near_duplicate:
+                group[2] += 1
+                group[3] = max(group[3], salience)
+                metrics["merged_duplicates"] += 1
+                break
+        else:
+            groups.append([caption, words, 1, salience])
+
+    groups.sort(key=lambda group: group[3], reverse=True)
+    return [[caption, count, salience] for caption, _, count, salience in groups], metrics
+
+
+def serialize(entries):
+    """
+    Compact JSON list: ["man in a suit x3","red car"].
+    """
+    return json.dumps([caption if count == 1 else f"{caption} x{count}" for caption, count, _ in entries],
+                      separators=(",", ":"), ensure_ascii=False)
+
+
+def budget_captions(captions, image_size=None, budget=None):
+    """
+    Compacts the captions and keeps the most salient ones that fit in `budget` tokens
+    (default PROMPT_TOKEN_BUDGET).
+    Returns:
+        (serialized_captions, metrics) with counts of what was dropped, merged and truncated,
+        plus "caption_tokens".
+    """
+    budget = PROMPT_TOKEN_BUDGET if budget is None else budget
+    entries, metrics = compact_captions(captions, image_size)
+    kept = entries
+    text = serialize(kept)
+    tokens = estimate_tokens(text)
+    if tokens > budget:
+        # Grow the kept prefix while it still fits (entries are ordered by salience)
+        kept, text = [], serialize([])
+        for entry in entries:
+            candidate = serialize(kept + [entry])
+            if estimate_tokens(candidate) > budget:
+                break
+            kept.append(entry)
+            text = candidate
+        tokens = estimate_tokens(text)
+    metrics["captions_kept"] = len(kept)
+    metrics["truncated"] = len(entries) - len(kept)
+    metrics["caption_tokens"] = tokens
+    return text, metrics
+
+
+if __name__ == "__main__":
+    import random
+
+    # A crowded street scene: many near-identical person crops, a few objects, some noise boxes
+    rng = random.Random(3)
+    phrases = ["a man in a suit", "man in a suit walking", "a woman holding a bag", "a woman with a bag",
+               "a red car", "a red car parked on the street", "a person on a bench", "a dog"]
+    for n in (10, 50, 200):
+        crowd = []
+        for _ in range(n):
+            x, y = rng.randint(0, 1800), rng.randint(0, 1000)
+            w, h = rng.randint(5, 300), rng.randint(5, 400)
+            crowd.append({"caption": rng.choice(phrases), "box": [x, y, x + w, y + h], "conf": rng.random()})
+        verbatim = json.dumps(crowd, indent=2)
+        text, metrics = budget_captions(crowd, image_size=(1920, 1080))
+        print(f"{n:>4} boxes: verbatim {estimate_tokens(verbatim):>6} tokens -> {metrics['caption_tokens']:>4} tokens "
+              f"(kept {metrics['captions_kept']}, merged {metrics['merged_duplicates']}, "
+              f"low-conf {metrics['dropped_low_confidence']}, small {metrics['dropped_small']}, "
+              f"truncated {metrics['truncated']})")
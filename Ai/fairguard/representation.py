@@ -0,0 +1,338 @@
+# representation.py
+#
+# Campaign-level representation of the people shown in creatives. Per-image outputs (YOLO
+# person boxes and caption text) are consumed one image at a time and folded into fixed-size
+# counters keyed by the cue vocabularies below, so a campaign costs the same memory after 20
+# images as after 200,000. Shares of depicted groups, and how often each group appears in
+# each role, are tested with the same disparate impact rule as the audience engine.
+# Run `python -m fairguard.representation` (from the Ai folder) for a streaming benchmark.
+
+import hashlib
+import re
+import threading
+from collections import Counter
+
+from .fairness import disparate_impact
+
+PERSON = 0  # COCO class id (same as detections.PERSON, without importing NumPy)
+MIN_PERSON_CONFIDENCE = 0.25
+MIN_APPEARANCES = 5  # Fewer mentions are reported but not tested
+
+# attribute -> group -> caption words that indicate the group
+GROUP_CUES = {
+    "gender": {
+        "women": ("woman", "women", "girl", "girls", "lady", "ladies", "female", "mother", "businesswoman"),
+        "men": ("man", "men", "boy", "boys", "gentleman", "male", "father", "businessman", "guy"),
+    },
+    "age": {
+        "children": ("child", "children", "kid", "kids", "baby", "toddler", "boy", "girl", "boys", "girls"),
+        "young adults": ("young", "teenager", "teen", "student", "students"),
+        "older adults": ("old", "older", "elderly", "senior", "grandmother", "grandfather", "grandma", "grandpa"),
+    },
+}
+
+# role -> caption words that place the depicted person in that role
+ROLE_CUES = {
+    "professional": ("suit", "office", "business", "businessman", "businesswoman", "laptop", "desk", "meeting",
+                     "computer", "doctor"),
+    "domestic": ("kitchen", "cooking", "cleaning", "laundry", "dishes", "vacuum", "washing", "baby"),
+    "active": ("running", "skateboard", "skateboarding", "playing", "riding", "surfing", "sports", "ball",
+               "bike", "bicycle", "jumping"),
+    "passive": ("sitting", "seated", "lying", "bench", "wheelchair"),
+}
+
+_WORD = re.compile(r"[a-z]+")
+# word -> [(attribute, group)], word -> [role]: one dict lookup per caption word
+_GROUP_INDEX = {}
+for _attribute, _groups in GROUP_CUES.items():
+    for _group, _words in _groups.items():
+        for _word in _words:
+            _GROUP_INDEX.setdefault(_word, []).append((_attribute, _group))
+_ROLE_INDEX = {}
+for _role, _words in ROLE_CUES.items():
+    for _word in _words:
+        _ROLE_INDEX.setdefault(_word, []).append(_role)
+
+
+def caption_cues(caption):
+    """
+    Groups and roles a caption mentions.
+    Returns:
+        (groups, roles): a set of (attribute, group) pairs and a set of role names.
+    """
+    groups, roles = set(), set()
+    for word in _WORD.findall(caption.lower()):
+        groups.update(_GROUP_INDEX.get(word, ()))
+        roles.update(_ROLE_INDEX.get(word, ()))
+    return groups, roles
+
+
+def count_persons(detections, min_conf=MIN_PERSON_CONFIDENCE):
+    """
+    Number of person boxes in a Detections (or an int, passed through).
+    """
+    if detections is None:
+        return 0
+    if isinstance(detections, int):
+        return detections
+    return int(((detections.cls == PERSON) & (detections.conf >= min_conf)).sum())
+
+
+class CampaignRepresentation:
+    """
+    Fixed-size representation counters for one campaign. Every key comes from GROUP_CUES,
+    ROLE_CUES or the visual bias categories, so the size never depends on the image count.
+    """
+
+    def __init__(self):
+        self.images = 0
+        self.images_with_people = 0
+        self.persons_detected = 0
+        self.appearances = Counter()  # (attribute, group) -> captions mentioning the group
+        self.roles = Counter()  # (attribute, group, role) -> captions with the group in the role
+        self.flagged = Counter()  # visual bias category -> images flagged
+        self._lock = threading.Lock()
+
+    def add_image(self, captions, detections=None, visual=None):
+        """
+        Folds one image into the counters.
+        Args:
+            captions: The image caption, or a list of captions (e.g. one per person crop, where
+                each caption counts as one depicted person).
+            detections: The image's Detections from detect_objects(), or a person count.
+            visual: The analyze_visual() result, to count flagged bias categories.
+        """
+        if isinstance(captions, str):
+            captions = [captions]
+        cues = [caption_cues(caption) for caption in captions if caption]
+        persons = count_persons(detections)
+        categories = [category for category, flags in (visual or {}).get("bias_categories", {}).items() if flags]
+
+        with self._lock:
+            self.images += 1
+            self.persons_detected += persons
+            if persons or any(groups for groups, _ in cues):
+                self.images_with_people += 1
+            for groups, roles in cues:
+                for group in groups:
+                    self.appearances[group] += 1
+                    for role in roles:
+                        self.roles[group + (role,)] += 1
+            self.flagged.update(categories)
+
+    def __getstate__(self):
+        # Picklable for worker processes; the lock is per process
+        state = dict(self.__dict__)
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def merge(self, other):
+        """
+        Adds another campaign's counters (e.g. from a worker process) into this one.
+        """
+        with self._lock:
+            self.images += other.images
+            self.images_with_people += other.images_with_people
+            self.persons_detected += other.persons_detected
+            self.appearances.update(other.appearances)
+            self.roles.update(other.roles)
+            self.flagged.update(other.flagged)
+        return self
+
+    def report(self, min_appearances=MIN_APPEARANCES):
+        """
+        Representation shares and role rates per attribute, tested with disparate_impact().
+        The best-represented group (or the group most often in a role) is the reference.
+        Shares are tested once an attribute has `min_appearances` mentions in total; role rates
+        only for groups with that many mentions each.
+        Returns:
+            A dict with the image and person counts, per-attribute "shares",
+            "representation_ratios", "role_rates" and "role_ratios", the flagged lists,
+            "is_biased" and "representation_bias_score".
+        """
+        with self._lock:
+            appearances, roles = dict(self.appearances), dict(self.roles)
+            results = {
+                "images": self.images,
+                "images_with_people": self.images_with_people,
+                "persons_detected": self.persons_detected,
+                "flagged_categories": dict(self.flagged),
+                "attributes": {},
+            }
+
+        score = 0
+        for attribute, groups in GROUP_CUES.items():
+            counts = {group: appearances.get((attribute, group), 0) for group in groups}
+            total = sum(counts.values())
+            shares = {group: count / total if total else 0 for group, count in counts.items()}
+            tested = [group for group in groups if counts[group] >= min_appearances]
+            summary = {"appearances": counts, "shares": shares, "representation_ratios": {},
+                       "underrepresented_groups": [], "role_rates": {}, "role_ratios": {}, "biased_roles": []}
+
+            if total >= min_appearances:
+                privileged_group = max(groups, key=lambda group: shares[group])
+                summary["privileged_group"] = privileged_group
+                for group in groups:
+                    if group == privileged_group:
+                        continue
+                    ratio, is_biased = disparate_impact(shares[group], shares[privileged_group])
+                    summary["representation_ratios"][group] = ratio
+                    if is_biased:
+                        summary["underrepresented_groups"].append(f"{group} (DIR: {ratio:.2f})")
+                        score += 1
+
+            for role in ROLE_CUES:
+                rates = {group: roles.get((attribute, group, role), 0) / counts[group] for group in tested}
+                summary["role_rates"][role] = rates
+                if len(rates) < 2:
+                    continue
+                reference = max(rates, key=rates.get)
+                summary["role_ratios"][role] = {}
+                for group, rate in rates.items():
+                    if group == reference:
+                        continue
+                    ratio, is_biased = disparate_impact(rate, rates[reference])
+                    summary["role_ratios"][role][group] = ratio
+                    if is_biased:
+                        summary["biased_roles"].append(f"{group} shown as {role} less often than {reference} (DIR: {ratio:.2f})")
+                        score += 1
+            results["attributes"][attribute] = summary
+
+        results["is_biased"] = score > 0
+        results["representation_bias_score"] = score
+        return results
+
+
+class SeenFilter:
+    """
+    Fixed-size Bloom filter of image keys (e.g. content hashes), allocated once: remembering
+    200,000 images costs the same 512 KiB as remembering 20. A key that was never added is
+    reported as seen with a small probability (about 1 in 7,000 after 200,000 keys), so an
+    image is very rarely left uncounted; an added key is always reported.
+    """
+    BITS = 1 << 22
+    HASHES = 7
+
+    def __init__(self):
+        self._bits = bytearray(self.BITS // 8)
+
+    def _positions(self, key):
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=3 * self.HASHES).digest()
+        return [int.from_bytes(digest[i:i + 3], "big") % self.BITS for i in range(0, len(digest), 3)]
+
+    def add(self, key):
+        """
+        Adds `key`. Returns False if it was (probably) added before.
+        """
+        new = False
+        for position in self._positions(key):
+            byte, bit = divmod(position, 8)
+            if not self._bits[byte] & (1 << bit):
+                self._bits[byte] |= 1 << bit
+                new = True
+        return new
+
+
+class CampaignAggregator:
+    """
+    One CampaignRepresentation per campaign name, created on first use. Images added with a
+    key (e.g. a content hash) are counted once per campaign, so analyzing the same upload
+    again does not inflate the counters; keys are kept in a fixed-size SeenFilter.
+    """
+
+    def __init__(self):
+        self._campaigns = {}
+        self._seen = {}
+        self._lock = threading.Lock()
+
+    def campaign(self, name):
+        with self._lock:
+            representation = self._campaigns.get(name)
+            if representation is None:
+                representation = self._campaigns[name] = CampaignRepresentation()
+            return representation
+
+    def add_image(self, campaign, captions, detections=None, visual=None, key=None):
+        """
+        Adds one image to `campaign`. Returns False (and counts nothing) if `key` was already
+        added to that campaign.
+        """
+        if key is not None:
+            with self._lock:
+                seen = self._seen.get(campaign)
+                if seen is None:
+                    seen = self._seen[campaign] = SeenFilter()
+                if not seen.add(key):
+                    return False
+        self.campaign(campaign).add_image(captions, detections, visual)
+        return True
+
+    def campaigns(self):
+        with self._lock:
+            return list(self._campaigns)
+
+    def report(self, campaign, min_appearances=MIN_APPEARANCES):
+        return self.campaign(campaign).report(min_appearances)
+
+
+if __name__ == "__main__":
+    import random
+    import time
+    import tracemalloc
+
+    rng = random.Random(7)
+    subjects = ["a man", "a woman", "a young woman", "an elderly man", "a boy", "a businessman", "a girl"]
+    scenes = ["in a suit at a desk", "cooking in a kitchen", "riding a bike", "sitting on a bench",
+              "holding a laptop", "playing with a ball", "standing in a park"]
+
+    def creative():
+        # Slightly skewed toward men in professional roles, like many stock-photo campaigns
+        subject = rng.choice(subjects + ["a man", "a businessman"])
+        return f"{subject} {rng.choice(scenes)}", rng.randint(0, 4)
+
+    # Every image is added with a content key, as the batch page does; one in ten is a
+    # re-analysis of an earlier image and must not be counted again
+    tracemalloc.start()
+    aggregator = CampaignAggregator()
+    representation = aggregator.campaign("benchmark")
+    checkpoints = {}
+    distinct = repeats = rejected = 0
+    start = time.perf_counter()
+    for i in range(1, 200_001):
+        caption, persons = creative()
+        if distinct and rng.random() < 0.1:
+            key, repeats = f"creative-{rng.randint(1, distinct)}", repeats + 1
+        else:
+            distinct += 1
+            key = f"creative-{distinct}"
+        rejected += not aggregator.add_image("benchmark", caption, persons, key=key)
+        if i in (2_000, 20_000, 200_000):
+            checkpoints[i] = tracemalloc.get_traced_memory()[0]
+    elapsed = time.perf_counter() - start
+    tracemalloc.stop()
+
+    for images, size in checkpoints.items():
+        print(f"{images:>7} images: counters hold {len(representation.appearances) + len(representation.roles):>3} keys, "
+              f"traced memory {size / 1024:.1f} KiB")
+    print(f"throughput: {200_000 / elapsed:,.0f} images/s")
+    print(f"{distinct} distinct images, {repeats} repeats: {rejected} rejected "
+          f"({rejected - repeats} new images wrongly rejected)")
+
+    # Two halves merged (e.g. two workers) must equal one sequential pass
+    rng.seed(11)
+    stream = [creative() for _ in range(5_000)]
+    whole, left, right = CampaignRepresentation(), CampaignRepresentation(), CampaignRepresentation()
+    for i, (caption, persons) in enumerate(stream):
+        whole.add_image(caption, persons)
+        (left if i % 2 else right).add_image(caption, persons)
+    print(f"merged halves == sequential: {left.merge(right).report() == whole.report()}")
+
+    report = representation.report()
+    for attribute, summary in report["attributes"].items():
+        print(f"{attribute}: shares " + ", ".join(f"{g} {s:.2f}" for g, s in summary["shares"].items()))
+        for flag in summary["underrepresented_groups"] + summary["biased_roles"]:
+            print(f"  - {flag}")
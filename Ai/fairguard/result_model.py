@@ -0,0 +1,292 @@
+# result_model.py
+
+import hashlib
+import json
+import os
+import time
+import zlib
+from dataclasses import dataclass
+
+try:
+    import msgpack  # Optional: compact binary log format
+except ImportError:
+    msgpack = None
+
+# --- Bias categories as bit flags ---
+# Order is part of the on-disk format: only ever append new categories.
+CATEGORIES = (
+    "gender",
+    "age",
+    "stereotypical_role",
+    "benevolent_sexism",
+    "racial_socioeconomic",
+    "ableism",
+)
+CATEGORY_BITS = {name: 1 << i for i, name in enumerate(CATEGORIES)}
+
+# PII kinds as bit flags (the detected values themselves are never persisted)
+PII_KINDS = ("Email", "Phone", "Credit Card")
+PII_BITS = {name: 1 << i for i, name in enumerate(PII_KINDS)}
+
+# Record kinds
+KIND_TEXT = 0
+KIND_IMAGE = 1
+
+# Score of an analysis that produces no score (e.g. the LLM stage reports flags, not rule
+# weights); excluded from score averages in the audit store
+UNSCORED = -1
+
+
+def categories_to_mask(bias_categories):
+    """
+    Converts a {category: [flags]} dict into an int bitmask of the non-empty categories.
+    """
+    mask = 0
+    for category, flags in bias_categories.items():
+        if flags:
+            mask |= CATEGORY_BITS[category]
+    return mask
+
+
+def mask_to_categories(mask):
+    """
+    Returns the category names set in a bitmask, in CATEGORIES order.
+    """
+    return [name for name in CATEGORIES if mask & CATEGORY_BITS[name]]
+
+
+def pii_items_to_mask(detected_items):
+    """
+    Converts check_for_pii()['detected_items'] strings ("Email: ...") into a PII-kind bitmask.
+    """
+    mask = 0
+    for item in detected_items:
+        for kind, bit in PII_BITS.items():
+            if item.startswith(kind):
+                mask |= bit
+    return mask
+
+
+# --- Flag interning ---
+def flag_id(message):
+    """
+    Returns the stable 64-bit ID of a flag message (signed, so it fits an SQLite INTEGER).
+    IDs are content-derived, so independent writers never need to coordinate; at 64 bits a
+    million distinct messages collide with odds of about 1 in 40 million, and intern() refuses
+    a collision rather than returning another message's ID. Logs written with the earlier
+    32-bit IDs still load: their sidecar maps each stored ID to its message.
+    """
+    digest = hashlib.blake2b(message.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big", signed=True)
+
+
+class FlagTable:
+    """
+    Interns flag messages to int IDs and remembers which ones are new.
+    """
+    __slots__ = ("messages", "pending")
+
+    def __init__(self):
+        self.messages = {}
+        self.pending = []
+
+    def intern(self, message):
+        fid = flag_id(message)
+        known = self.messages.get(fid)
+        if known is None:
+            self.messages[fid] = message
+            self.pending.append(fid)
+        elif known != message:
+            raise ValueError(f"Flag ID {fid} already belongs to {known!r}, not {message!r}.")
+        return fid
+
+    def lookup(self, fid):
+        return self.messages.get(fid, f"<unknown flag {fid}>")
+
+
+@dataclass(slots=True)
+class AnalysisRecord:
+    """
+    Compact result of one text or image analysis.
+    Category flags are bitmasks, flag messages are interned IDs and scores are small ints
+    (UNSCORED when the analysis has no score). `details` holds free-form narrative fields
+    (e.g. the LLM scene description, suggestions and captions) or None.
+    """
+    kind: int
+    content_id: str
+    category_mask: int
+    flag_ids: tuple
+    bias_score: int
+    visual_bias_score: int = 0
+    pii_mask: int = 0
+    harm_ids: tuple = ()
+    campaign: str = ""
+    created_at: int = 0
+    details: dict = None
+
+    def to_row(self):
+        row = [
+            self.kind, self.content_id, self.category_mask, list(self.flag_ids),
+            self.bias_score, self.visual_bias_score, self.pii_mask,
+            list(self.harm_ids), self.campaign, self.created_at,
+        ]
+        if self.details is not None:  # Rows without details keep the original ten fields
+            row.append(self.details)
+        return row
+
+    @classmethod
+    def from_row(cls, row):
+        kind, content_id, category_mask, flag_ids, bias_score, visual_bias_score, \
+            pii_mask, harm_ids, campaign, created_at = row[:10]
+        return cls(kind, content_id, category_mask, tuple(flag_ids), bias_score,
+                   visual_bias_score, pii_mask, tuple(harm_ids), campaign, created_at,
+                   row[10] if len(row) > 10 else None)
+
+    @property
+    def is_biased(self):
+        return self.category_mask != 0
+
+
+def content_id_for(content):
+    """
+    Short, stable identifier for a piece of ad content (text or image bytes).
+    """
+    if isinstance(content, str):
+        content = content.encode("utf-8")
+    return f"{zlib.crc32(content):08x}-{len(content):x}"
+
+
+def make_record(flag_table, content, bias_results, pii_results=None, harmful_results=None,
+                visual_results=None, campaign="", details=None):
+    """
+    Builds an AnalysisRecord from the dicts returned by the analyzers.
+    Args:
+        flag_table: FlagTable used to intern flag and harm-term messages.
+        content: The analyzed text, or the image bytes for image analyses.
+        bias_results: Output of analyze_text_for_bias(), or None if no text was analyzed
+            (the text score is then UNSCORED).
+        pii_results / harmful_results: Outputs of check_for_pii() / check_for_harmful_content().
+        visual_results: Output of analyze_image_for_visual_context(), for image analyses.
+            Without a "visual_bias_score" (e.g. LLM results) the visual score is UNSCORED.
+        campaign: Optional campaign label stored with the record.
+        details: Optional JSON-serializable dict of narrative fields stored with the record.
+    Returns:
+        An AnalysisRecord.
+    """
+    category_mask = 0
+    flags = []
+    bias_score = UNSCORED
+    if bias_results is not None:
+        category_mask = categories_to_mask(bias_results["bias_categories"])
+        flags = [flag for flags in bias_results["bias_categories"].values() for flag in flags]
+        bias_score = int(bias_results["bias_score"])
+    visual_bias_score = 0
+    kind = KIND_TEXT
+    if visual_results is not None:
+        kind = KIND_IMAGE
+        category_mask |= categories_to_mask(visual_results["bias_categories"])
+        flags.extend(flag for flags in visual_results["bias_categories"].values() for flag in flags)
+        visual_bias_score = int(visual_results.get("visual_bias_score", UNSCORED))
+
+    return AnalysisRecord(
+        kind=kind,
+        content_id=content_id_for(content),
+        category_mask=category_mask,
+        flag_ids=tuple(flag_table.intern(flag) for flag in flags),
+        bias_score=bias_score,
+        visual_bias_score=visual_bias_score,
+        pii_mask=pii_items_to_mask(pii_results["detected_items"]) if pii_results else 0,
+        harm_ids=tuple(flag_table.intern(term) for term in harmful_results["detected_items"])
+        if harmful_results else (),
+        campaign=campaign,
+        created_at=int(time.time()),
+        details=details,
+    )
+
+
+# --- Append-only result log ---
+class ResultWriter:
+    """
+    Append-only writer for AnalysisRecords.
+    Uses msgpack when the path ends in ".msgpack" (and msgpack is installed), otherwise
+    compact JSON Lines. New flag messages go to a "<path>.flags" sidecar so the log itself
+    only stores IDs. Each record is a single append write, so concurrent runs can share a log
+    without clobbering each other.
+    """
+
+    def __init__(self, path, flag_table=None):
+        self.path = path
+        self.binary = path.endswith(".msgpack")
+        if self.binary and msgpack is None:
+            raise ImportError("msgpack is required for .msgpack result logs (pip install msgpack).")
+        self.flag_table = flag_table if flag_table is not None else FlagTable()
+        self._file = open(path, "ab" if self.binary else "a", encoding=None if self.binary else "utf-8")
+        self._flags_file = open(path + ".flags", "a", encoding="utf-8")
+
+    def write(self, record):
+        self.write_many((record,))
+
+    def write_many(self, records):
+        # Encode the whole batch first and hand it to the OS in one append, so lines from
+        # concurrent writers never interleave mid-record.
+        rows = [record.to_row() for record in records]
+        self._flush_flags()
+        if self.binary:
+            self._file.write(b"".join(msgpack.packb(row) for row in rows))
+        else:
+            self._file.write("".join(json.dumps(row, separators=(",", ":")) + "\n" for row in rows))
+        self._file.flush()
+
+    def _flush_flags(self):
+        if not self.flag_table.pending:
+            return
+        lines = "".join(
+            json.dumps([fid, self.flag_table.messages[fid]], separators=(",", ":")) + "\n"
+            for fid in self.flag_table.pending
+        )
+        self._flags_file.write(lines)
+        self._flags_file.flush()
+        self.flag_table.pending.clear()
+
+    def close(self):
+        self._flush_flags()
+        self._file.close()
+        self._flags_file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def load_flag_table(path):
+    """
+    Loads the flag sidecar of a result log into a FlagTable.
+    """
+    table = FlagTable()
+    flags_path = path + ".flags"
+    if os.path.exists(flags_path):
+        with open(flags_path, encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    fid, message = json.loads(line)
+                    table.messages[fid] = message
+    return table
+
+
+def read_records(path):
+    """
+    Streams AnalysisRecords back from a result log written by ResultWriter.
+    """
+    if path.endswith(".msgpack"):
+        if msgpack is None:
+            raise ImportError("msgpack is required for .msgpack result logs (pip install msgpack).")
+        with open(path, "rb") as f:
+            for row in msgpack.Unpacker(f, use_list=True):
+                yield AnalysisRecord.from_row(row)
+    else:
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    yield AnalysisRecord.from_row(json.loads(line))
@@ -0,0 +1,252 @@
+# result_store.py
+
+import json
+import sqlite3
+import threading
+import time
+
+from .result_model import (
+    CATEGORIES, CATEGORY_BITS, PII_BITS, UNSCORED, load_flag_table, mask_to_categories,
+    read_records,
+)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    id INTEGER PRIMARY KEY,
+    kind INTEGER NOT NULL,
+    content_id TEXT NOT NULL,
+    campaign TEXT NOT NULL DEFAULT '',
+    created_at INTEGER NOT NULL,
+    category_mask INTEGER NOT NULL,
+    bias_score INTEGER NOT NULL,
+    visual_bias_score INTEGER NOT NULL DEFAULT 0,
+    pii_mask INTEGER NOT NULL DEFAULT 0,
+    harm_count INTEGER NOT NULL DEFAULT 0,
+    details TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_results_campaign_time ON results (campaign, created_at);
+CREATE INDEX IF NOT EXISTS idx_results_score ON results (bias_score);
+CREATE INDEX IF NOT EXISTS idx_results_pii ON results (campaign, created_at) WHERE pii_mask != 0;
+
+CREATE TABLE IF NOT EXISTS flags (
+    id INTEGER PRIMARY KEY,
+    message TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS audience_upload_stats (
+    campaign TEXT NOT NULL,
+    upload_id TEXT NOT NULL,
+    parameter TEXT NOT NULL,
+    value TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (campaign, upload_id, parameter, value)
+) WITHOUT ROWID;
+"""
+
+# One partial index per category: a filter such as "ableism flags in campaign X last week"
+# only walks the rows that actually carry that flag.
+_CATEGORY_INDEXES = "".join(
+    f"CREATE INDEX IF NOT EXISTS idx_results_{name} ON results (campaign, created_at) "
+    f"WHERE category_mask & {bit};\n"
+    for name, bit in CATEGORY_BITS.items()
+)
+
+_COLUMNS = ("id", "kind", "content_id", "campaign", "created_at", "category_mask",
+            "bias_score", "visual_bias_score", "pii_mask", "harm_count", "details")
+
+
+class ResultStore:
+    """
+    Local SQLite store for analysis results, indexed for audit queries by campaign, time,
+    bias category, PII and score. One store is shared by server threads and Streamlit
+    sessions: every use of the connection holds a lock, so one thread's transaction never
+    commits another's half-done writes.
+    """
+
+    def __init__(self, path="fairguard_results.db"):
+        self.path = path
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(_SCHEMA + _CATEGORY_INDEXES)
+        columns = {row[1] for row in self.conn.execute("PRAGMA table_info(results)")}
+        if "details" not in columns:  # Stores created before records carried details
+            with self.conn:
+                self.conn.execute("ALTER TABLE results ADD COLUMN details TEXT")
+
+    # --- Ingestion ---
+    def add_records(self, records, flag_table=None):
+        """
+        Inserts AnalysisRecords in a single transaction.
+        Args:
+            records: Iterable of AnalysisRecord.
+            flag_table: Optional FlagTable whose messages are stored for flag lookups.
+        Returns:
+            Number of records inserted.
+        """
+        rows = (
+            (r.kind, r.content_id, r.campaign, r.created_at or int(time.time()), r.category_mask,
+             r.bias_score, r.visual_bias_score, r.pii_mask, len(r.harm_ids),
+             json.dumps(r.details, separators=(",", ":")) if r.details is not None else None)
+            for r in records
+        )
+        with self._lock, self.conn:
+            cursor = self.conn.executemany(
+                "INSERT INTO results (kind, content_id, campaign, created_at, category_mask, "
+                "bias_score, visual_bias_score, pii_mask, harm_count, details) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            if flag_table is not None:
+                self.conn.executemany(
+                    "INSERT OR IGNORE INTO flags (id, message) VALUES (?, ?)",
+                    flag_table.messages.items(),
+                )
+        return cursor.rowcount
+
+    def import_log(self, log_path, batch_size=50000):
+        """
+        Bulk-loads a result log written by result_model.ResultWriter.
+        """
+        flag_table = load_flag_table(log_path)
+        total = 0
+        batch = []
+        for record in read_records(log_path):
+            batch.append(record)
+            if len(batch) >= batch_size:
+                total += self.add_records(batch)
+                batch = []
+        total += self.add_records(batch, flag_table)
+        return total
+
+    def add_audience_stats(self, campaign, upload_id, parameter_stats):
+        """
+        Stores per-parameter value counts ({parameter: {value: count}}) of one uploaded file
+        for a campaign. `upload_id` identifies the file (e.g. its content hash): uploading the
+        same file again replaces its counts instead of adding them a second time.
+        """
+        rows = [
+            (campaign, upload_id, parameter, str(value), int(count))
+            for parameter, counts in parameter_stats.items()
+            for value, count in counts.items()
+            if not isinstance(count, dict)  # e.g. the nested age min/max/avg summary
+        ]
+        with self._lock, self.conn:
+            self.conn.execute("DELETE FROM audience_upload_stats WHERE campaign = ? AND upload_id = ?",
+                              (campaign, upload_id))
+            self.conn.executemany(
+                "INSERT INTO audience_upload_stats (campaign, upload_id, parameter, value, count) "
+                "VALUES (?, ?, ?, ?, ?)",
+                rows,
+            )
+
+    # --- Queries ---
+    def _where(self, campaign=None, since=None, until=None, categories=(), has_pii=None,
+               min_score=None, kind=None):
+        clauses, params = [], []
+        if campaign is not None:
+            clauses.append("campaign = ?")
+            params.append(campaign)
+        if since is not None:
+            clauses.append("created_at >= ?")
+            params.append(int(since))
+        if until is not None:
+            clauses.append("created_at < ?")
+            params.append(int(until))
+        for category in categories:
+            # Literal bit (not a parameter) so the planner can match the partial index.
+            clauses.append(f"category_mask & {CATEGORY_BITS[category]}")
+        if has_pii is not None:
+            clauses.append("pii_mask != 0" if has_pii else "pii_mask = 0")
+        if min_score is not None:
+            clauses.append("bias_score >= ?")
+            params.append(int(min_score))
+        if kind is not None:
+            clauses.append("kind = ?")
+            params.append(kind)
+        return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+    def query(self, limit=1000, offset=0, **filters):
+        """
+        Returns matching rows as dicts, newest first.
+        Filters: campaign, since, until (epoch seconds), categories (names, all required),
+        has_pii, min_score, kind.
+        """
+        where, params = self._where(**filters)
+        with self._lock:
+            fetched = self.conn.execute(
+                f"SELECT {', '.join(_COLUMNS)} FROM results{where} ORDER BY created_at DESC LIMIT ? OFFSET ?",
+                params + [int(limit), int(offset)],
+            ).fetchall()
+        rows = []
+        for row in fetched:
+            item = dict(zip(_COLUMNS, row))
+            item["categories"] = mask_to_categories(item["category_mask"])
+            item["pii_kinds"] = [kind for kind, bit in PII_BITS.items() if item["pii_mask"] & bit]
+            item["details"] = json.loads(item["details"]) if item["details"] is not None else None
+            rows.append(item)
+        return rows
+
+    def aggregate(self, **filters):
+        """
+        Returns summary counts for the matching rows: total, biased, with PII, with harmful
+        content, average/max bias score (over scored rows only) and a per-category count.
+        """
+        where, params = self._where(**filters)
+        category_sums = ", ".join(
+            f"SUM((category_mask & {bit}) != 0)" for bit in CATEGORY_BITS.values()
+        )
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT COUNT(*), SUM(category_mask != 0), SUM(pii_mask != 0), SUM(harm_count > 0), "
+                f"AVG(NULLIF(bias_score, {UNSCORED})), MAX(bias_score), {category_sums} FROM results{where}",
+                params,
+            ).fetchone()
+        total, biased, pii, harmful, avg_score, max_score = row[:6]
+        return {
+            "total": total,
+            "biased": biased or 0,
+            "with_pii": pii or 0,
+            "with_harmful_content": harmful or 0,
+            "avg_bias_score": round(avg_score, 2) if avg_score is not None else 0,
+            "max_bias_score": max(max_score or 0, 0),
+            "categories": {name: count or 0 for name, count in zip(CATEGORIES, row[6:])},
+        }
+
+    def counts_by(self, column, **filters):
+        """
+        Returns {value: row count} grouped by "campaign", "kind" or "bias_score".
+        """
+        if column not in ("campaign", "kind", "bias_score"):
+            raise ValueError(f"Cannot group by '{column}'.")
+        where, params = self._where(**filters)
+        with self._lock:
+            return dict(self.conn.execute(
+                f"SELECT {column}, COUNT(*) FROM results{where} GROUP BY {column}", params
+            ).fetchall())
+
+    def parameter_stats(self, campaign=""):
+        """
+        Returns stored audience value counts, summed over the campaign's distinct uploads, as
+        {parameter: {value: count}}, the shape the dashboard charts expect.
+        """
+        stats = {}
+        with self._lock:
+            fetched = self.conn.execute(
+                "SELECT parameter, value, SUM(count) AS total FROM audience_upload_stats WHERE campaign = ? "
+                "GROUP BY parameter, value ORDER BY total DESC",
+                (campaign,),
+            ).fetchall()
+        for parameter, value, count in fetched:
+            stats.setdefault(parameter, {})[value] = count
+        return stats
+
+    def flag_message(self, fid):
+        with self._lock:
+            row = self.conn.execute("SELECT message FROM flags WHERE id = ?", (fid,)).fetchone()
+        return row[0] if row else None
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
@@ -0,0 +1,105 @@
+# rule_stats.py
+
+import os
+import threading
+import time
+
+
+class RuleStats:
+    """
+    Optional per-rule counters: evaluations, hits and cumulative evaluation time.
+    Disabled by default (set FAIRGUARD_RULE_STATS=1 or call enable()); when disabled the
+    rule engines skip all timing, so the only cost is one attribute check per analysis.
+    """
+
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self._counters = {}  # rule name -> [evaluations, hits, nanoseconds]
+        self._lock = threading.Lock()
+
+    def enable(self):
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+
+    def record_batch(self, samples):
+        """
+        Adds one analysis' samples, a list of (rule name, hit, elapsed ns), under a single lock.
+        """
+        with self._lock:
+            for name, hit, elapsed_ns in samples:
+                counter = self._counters.get(name)
+                if counter is None:
+                    counter = self._counters[name] = [0, 0, 0]
+                counter[0] += 1
+                counter[1] += hit
+                counter[2] += elapsed_ns
+
+    def report(self, sort_by="total_time"):
+        """
+        Returns one dict per rule with evaluations, hits, hit_rate, total_ms and avg_us,
+        sorted by "total_time", "avg_time", "hit_rate" or "hits" (descending).
+        """
+        with self._lock:
+            snapshot = {name: list(counter) for name, counter in self._counters.items()}
+        rows = []
+        for name, (evaluations, hits, elapsed_ns) in snapshot.items():
+            rows.append({
+                "rule": name,
+                "evaluations": evaluations,
+                "hits": hits,
+                "hit_rate": hits / evaluations if evaluations else 0.0,
+                "total_ms": elapsed_ns / 1e6,
+                "avg_us": elapsed_ns / evaluations / 1e3 if evaluations else 0.0,
+            })
+        keys = {
+            "total_time": lambda r: r["total_ms"],
+            "avg_time": lambda r: r["avg_us"],
+            "hit_rate": lambda r: r["hit_rate"],
+            "hits": lambda r: r["hits"],
+        }
+        rows.sort(key=keys[sort_by], reverse=True)
+        return rows
+
+    def format_report(self, sort_by="total_time"):
+        """
+        Renders report() as a plain-text table. Rules that never fired are marked so they can
+        be reviewed for removal.
+        """
+        lines = [f"{'rule':<40} {'evals':>10} {'hits':>8} {'hit %':>7} {'total ms':>10} {'avg us':>8}"]
+        for row in self.report(sort_by):
+            marker = "  <- never fired" if row["hits"] == 0 else ""
+            lines.append(
+                f"{row['rule']:<40} {row['evaluations']:>10} {row['hits']:>8} {row['hit_rate'] * 100:>6.1f}% "
+                f"{row['total_ms']:>10.2f} {row['avg_us']:>8.2f}{marker}"
+            )
+        return "\n".join(lines)
+
+
+def run_rules(rules, *args):
+    """
+    Evaluates (name, rule) pairs in order and returns the non-empty results.
+    Records per-rule counters in RULE_STATS when it is enabled.
+    """
+    if not RULE_STATS.enabled:
+        return [hit for _, rule in rules if (hit := rule(*args))]
+
+    hits, samples = [], []
+    clock = time.perf_counter_ns
+    for name, rule in rules:
+        start = clock()
+        hit = rule(*args)
+        samples.append((name, bool(hit), clock() - start))
+        if hit:
+            hits.append(hit)
+    RULE_STATS.record_batch(samples)
+    return hits
+
+
+# Process-wide counters shared by all rule engines (batch runs or a server's lifetime)
+RULE_STATS = RuleStats(enabled=os.environ.get("FAIRGUARD_RULE_STATS") == "1")
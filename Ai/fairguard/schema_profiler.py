@@ -0,0 +1,224 @@
+# schema_profiler.py
+
+import hashlib
+import json
+import os
+import re
+from collections import OrderedDict
+
+import pandas as pd
+
+# Common parameter name mappings (header-name hints)
+PARAMETER_MAPPINGS = {
+    'age': ['age', 'years', 'yrs', 'year'],
+    'gender': ['gender', 'sex', 'male/female', 'm/f'],
+    'location': ['location', 'city', 'state', 'country', 'region', 'address'],
+    'religion': ['religion', 'faith', 'belief', 'denomination'],
+    'race': ['race', 'ethnicity', 'ethnic'],
+    'disability': ['disability', 'disabled', 'handicap'],
+    'occupation': ['occupation', 'job', 'profession', 'work'],
+    'income': ['income', 'salary', 'wage', 'earnings'],
+    'education': ['education', 'degree', 'qualification'],
+    'marital': ['marital', 'maritalstatus', 'relationshipstatus']
+}
+
+DEFAULT_SAMPLE_ROWS = 2000
+MAX_CACHED_SCHEMAS = 256
+# Part of the cache key: bump when the key or schema format changes so stale disk entries miss
+SCHEMA_VERSION = 3
+
+# Value vocabularies used to fingerprint columns whose headers are not descriptive.
+VALUE_VOCABULARIES = {
+    'gender': {'male', 'female', 'm', 'f', 'man', 'woman', 'men', 'women', 'non-binary', 'nonbinary',
+               'non binary', 'other', 'transgender', 'trans', 'prefer not to say', 'unknown', 'x'},
+    'age_group': {'child', 'children', 'teen', 'teenager', 'youth', 'young', 'young adult', 'adult',
+                  'middle aged', 'middle-aged', 'senior', 'elderly', 'retired', 'minor'},
+    'religion': {'christian', 'muslim', 'hindu', 'buddhist', 'jewish', 'sikh', 'atheist', 'agnostic',
+                 'catholic', 'protestant', 'orthodox', 'none', 'other'},
+    'race': {'white', 'black', 'asian', 'hispanic', 'latino', 'latina', 'latinx', 'native american',
+             'pacific islander', 'mixed', 'multiracial', 'african american', 'caucasian', 'other'},
+    'marital': {'single', 'married', 'divorced', 'widowed', 'separated', 'partnered', 'engaged',
+                'domestic partnership'},
+    'education': {'highschool', 'high school', 'college', 'graduate', 'postgraduate', 'bachelor',
+                  'bachelors', 'master', 'masters', 'phd', 'doctorate', 'diploma', 'primary', 'secondary',
+                  'none'},
+    'income': {'low', 'medium', 'middle', 'high', 'lower', 'upper', 'lower-middle', 'upper-middle'},
+    'disability': {'yes', 'no', 'none', 'physical', 'visual', 'hearing', 'cognitive', 'mobility'},
+}
+
+# Parameter types whose groups are suitable for disparate-impact analysis.
+PROTECTED_TYPES = ('gender', 'age', 'age_group', 'religion', 'race', 'disability', 'marital', 'income')
+
+_AGE_RANGE = re.compile(r'^\s*(\d{1,3})\s*(?:-|–|to)\s*(\d{1,3})\s*$|^\s*(\d{1,3})\s*\+\s*$')
+_INTEGER = re.compile(r'^\s*[+-]?\d+(?:\.0+)?\s*$')
+
+_schema_cache = OrderedDict()
+
+
+def header_hash(headers):
+    """
+    Stable hash of a header row, used as the schema cache key. Headers are only stripped, not
+    lowercased: the cached schema names columns by their exact header, so "Gender" and
+    "gender" must not share an entry.
+    """
+    normalized = "\x1f".join([f"v{SCHEMA_VERSION}"] + [str(h).strip() for h in headers])
+    return hashlib.sha1(normalized.encode("utf-8")).hexdigest()
+
+
+def _header_type(header):
+    header_lower = header.lower()
+    for param_type, patterns in PARAMETER_MAPPINGS.items():
+        if any(pattern in header_lower for pattern in patterns):
+            return param_type
+    return None
+
+
+def _fingerprint(values):
+    """
+    Summarizes a column sample: row count, cardinality, numeric share and range, age-range
+    share and the best matching value vocabulary.
+    """
+    values = values[values != '']
+    n = len(values)
+    if n == 0:
+        return {'count': 0, 'cardinality': 0}
+
+    distinct = values.str.lower().value_counts()
+    numeric = pd.to_numeric(values[values.str.match(_INTEGER)], errors='coerce').dropna()
+    fingerprint = {
+        'count': n,
+        'cardinality': len(distinct),
+        'numeric_share': len(numeric) / n,
+        'age_range_share': float(values.str.match(_AGE_RANGE).mean()),
+    }
+    if len(numeric):
+        fingerprint['min'] = float(numeric.min())
+        fingerprint['max'] = float(numeric.max())
+
+    best_type, best_share = None, 0.0
+    for param_type, vocabulary in VALUE_VOCABULARIES.items():
+        share = distinct[distinct.index.isin(vocabulary)].sum() / n
+        if share > best_share:
+            best_type, best_share = param_type, share
+    fingerprint['vocabulary'] = best_type
+    fingerprint['vocabulary_share'] = float(best_share)
+    return fingerprint
+
+
+def classify_column(header, values):
+    """
+    Classifies one column from its header and a sample of its (string) values.
+    Returns (param_type or None, confidence, fingerprint). Identifier-like columns are
+    classified as 'identifier'.
+    """
+    fp = _fingerprint(values)
+    by_header = _header_type(header)
+    if fp['count'] == 0:
+        return by_header, 0.5 if by_header else 0.0, fp
+
+    numeric_share = fp['numeric_share']
+    is_age_like_numeric = numeric_share >= 0.9 and fp.get('min', -1) >= 0 and fp.get('max', 999) <= 120
+
+    # Unique numbers with no descriptive header are row identifiers, not attributes.
+    if by_header is None and numeric_share >= 0.9 and fp['cardinality'] == fp['count'] and fp['count'] >= 5:
+        return 'identifier', 0.9, fp
+
+    # A header-named age column stays 'age' while most values are numbers or bands ("18-25",
+    # "65+"): the audience match reads each value with parseInt() like the original JS, so
+    # "N/A" and blanks count as 0 instead of turning the column into a group column
+    if by_header == 'age' and numeric_share + fp['age_range_share'] > 0.5:
+        if is_age_like_numeric:
+            return 'age', 0.95, fp
+        return 'age', 0.9 if fp['age_range_share'] >= 0.8 else 0.7, fp
+
+    if by_header == 'age' or (by_header is None and (fp['age_range_share'] >= 0.8 or fp['vocabulary'] == 'age_group')):
+        if is_age_like_numeric:
+            return 'age', 0.6, fp
+        if fp['age_range_share'] >= 0.8 or (fp['vocabulary'] == 'age_group' and fp['vocabulary_share'] >= 0.6):
+            return 'age_group', 0.9 if by_header else 0.75, fp
+        if by_header:
+            return 'age_group', 0.5, fp
+
+    vocabulary_match = fp['vocabulary'] if fp['vocabulary_share'] >= 0.8 else None
+    if by_header and by_header == vocabulary_match:
+        return by_header, 0.95, fp
+    if by_header:
+        return by_header, 0.7, fp
+    if vocabulary_match and fp['cardinality'] <= max(len(VALUE_VOCABULARIES[vocabulary_match]), 12):
+        return vocabulary_match, 0.7, fp
+    return None, 0.0, fp
+
+
+def profile_dataframe(df, sample_rows=DEFAULT_SAMPLE_ROWS):
+    """
+    Profiles the first `sample_rows` rows of a DataFrame.
+    Returns a JSON-serializable schema:
+        {'header_hash', 'columns': {header: {'type', 'confidence', 'cardinality'}},
+         'sensitive_params': {param_type or header: header}, 'protected_attributes': [header, ...]}
+    """
+    sample = df.head(sample_rows)
+    columns = {}
+    sensitive_params = {}
+    protected_attributes = []
+
+    for header in sample.columns:
+        values = sample[header].astype(str).str.strip()
+        param_type, confidence, fp = classify_column(str(header), values)
+        columns[header] = {'type': param_type, 'confidence': round(confidence, 2),
+                           'cardinality': fp.get('cardinality', 0)}
+        if param_type == 'identifier':
+            continue
+        if param_type and param_type not in sensitive_params:
+            sensitive_params[param_type] = header
+        else:
+            # Unclassified (or second same-type) columns are still charted under their own name.
+            sensitive_params[header] = header
+        # Numeric ages have too many groups for disparate impact; age bands are groups already
+        is_grouped = param_type != 'age' or fp.get('age_range_share', 0) >= 0.8
+        if param_type in PROTECTED_TYPES and 2 <= fp.get('cardinality', 0) <= 50 and is_grouped:
+            protected_attributes.append(header)
+
+    return {
+        'header_hash': header_hash(list(sample.columns)),
+        'columns': columns,
+        'sensitive_params': sensitive_params,
+        'protected_attributes': protected_attributes,
+    }
+
+
+def _disk_cache_path(key):
+    cache_dir = os.environ.get("FAIRGUARD_SCHEMA_CACHE")
+    return os.path.join(cache_dir, f"{key}.json") if cache_dir else None
+
+
+def get_schema(df, sample_rows=DEFAULT_SAMPLE_ROWS):
+    """
+    Returns the schema for a DataFrame (or the first chunk of a CSV), profiling it only the
+    first time a given header row is seen. Schemas are cached in memory and, when
+    FAIRGUARD_SCHEMA_CACHE names a directory, on disk across restarts.
+    """
+    key = header_hash(list(df.columns))
+    schema = _schema_cache.get(key)
+    if schema is not None:
+        _schema_cache.move_to_end(key)
+        return schema
+
+    disk_path = _disk_cache_path(key)
+    if disk_path and os.path.exists(disk_path):
+        with open(disk_path, encoding="utf-8") as f:
+            schema = json.load(f)
+    else:
+        schema = profile_dataframe(df, sample_rows)
+        if disk_path:
+            os.makedirs(os.path.dirname(disk_path), exist_ok=True)
+            with open(disk_path, "w", encoding="utf-8") as f:
+                json.dump(schema, f, separators=(",", ":"))
+
+    _schema_cache[key] = schema
+    if len(_schema_cache) > MAX_CACHED_SCHEMAS:
+        _schema_cache.popitem(last=False)
+    return schema
+
+
+def clear_schema_cache():
+    _schema_cache.clear()
@@ -0,0 +1,54 @@
+# security_checks.py
+
+import re
+
+# Email addresses
+EMAIL_PATTERN = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b')
+# Phone numbers (simple patterns: XXX-XXX-XXXX, (XXX) XXX-XXXX, XXX XXX XXXX)
+PHONE_PATTERN = re.compile(r'\b(?:\d{3}[-.\s]??\d{3}[-.\s]??\d{4}|\(\d{3}\)\s*\d{3}[-.\s]??\d{4})\b')
+# Basic credit card pattern (highly simplified and not robust for real security)
+# This is just for demo purposes in a hackathon, real CC detection is complex.
+CREDIT_CARD_PATTERN = re.compile(r'\b(?:\d{4}[- ]){3}\d{4}\b')
+
+HARMFUL_TERMS = [
+    'kill', 'hate', 'destroy', 'bomb', 'attack', 'violence', 'exploit',
+    'manipulate', 'deceive', 'fraud', 'illegal', 'scam', 'cheat', 'offensive',
+    'slur', 'discriminat', 'sexist', 'racist'
+]
+
+
+def check_for_pii(text):
+    """
+    Checks text for common patterns of Personal Identifiable Information (PII).
+    """
+    pii_found = []
+
+    emails = EMAIL_PATTERN.findall(text)
+    if emails:
+        pii_found.extend([f"Email: {e}" for e in emails])
+
+    phone_numbers = PHONE_PATTERN.findall(text)
+    if phone_numbers:
+        pii_found.extend([f"Phone: {p}" for p in phone_numbers])
+
+    cc_numbers = CREDIT_CARD_PATTERN.findall(text)
+    if cc_numbers:
+        pii_found.extend([f"Credit Card (potential): {c}" for c in cc_numbers])
+
+    return {
+        "has_pii": len(pii_found) > 0,
+        "detected_items": pii_found
+    }
+
+
+def check_for_harmful_content(text):
+    """
+    Checks text for overtly harmful, offensive, or manipulative content.
+    """
+    text_lower = text.lower()
+    detected_harm = [term for term in HARMFUL_TERMS if term in text_lower]
+
+    return {
+        "has_harmful_content": len(detected_harm) > 0,
+        "detected_items": detected_harm
+    }
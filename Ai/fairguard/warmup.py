@@ -0,0 +1,141 @@
+# warmup.py
+#
+# Explicit warm-up phase: load each model (from FAIRGUARD_MODEL_DIR when set), run one dummy
+# inference so first-call JIT/allocation costs are paid up front, and only then report ready.
+# Run from the Ai folder to pre-check a deployment:  python -m fairguard.warmup ocr caption
+
+import os
+import sys
+import threading
+import time
+
+from . import models
+
+STARTING = "starting"
+WARMING = "warming"
+READY = "ready"
+FAILED = "failed"
+
+
+def _dummy_ocr(reader):
+    import numpy as np
+    reader.readtext(np.full((64, 256, 3), 255, dtype=np.uint8), detail=0)
+
+
+def _dummy_caption(captioner):
+    from PIL import Image
+    captioner(Image.new("RGB", (384, 384), "white"))
+
+
+def _dummy_detect(detector):
+    import numpy as np
+    detector(np.zeros((640, 640, 3), dtype=np.uint8), verbose=False)
+
+
+DUMMY_INFERENCE = {"ocr": _dummy_ocr, "caption": _dummy_caption, "detect": _dummy_detect}
+
+
+class Readiness:
+    """
+    Thread-safe warm-up state shared by the front-ends: "starting" -> "warming" -> "ready"
+    (or "failed"), with per-model load and warm-up timings. When FAIRGUARD_READY_FILE is set,
+    that file is created on "ready" so an exec readiness probe can check it.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.state = STARTING
+        self.models = {}  # name -> {"load_s", "warmup_s", "error"}
+        self.ready_file = os.environ.get("FAIRGUARD_READY_FILE") or None
+
+    def set_state(self, state):
+        with self._lock:
+            self.state = state
+        if self.ready_file:
+            if state == READY:
+                with open(self.ready_file, "w") as f:
+                    f.write(str(int(time.time())))
+            elif os.path.exists(self.ready_file):
+                os.remove(self.ready_file)
+
+    def record(self, name, **timings):
+        with self._lock:
+            self.models.setdefault(name, {}).update(timings)
+
+    @property
+    def is_ready(self):
+        return self.state == READY
+
+    def snapshot(self):
+        with self._lock:
+            return {"state": self.state, "models": {name: dict(info) for name, info in self.models.items()}}
+
+
+READINESS = Readiness()
+
+
+def warm_up(names=("ocr", "caption"), readiness=READINESS):
+    """
+    Loads each named model and runs one dummy inference on it, recording load and warm-up
+    times. Readiness only flips to "ready" after every model succeeded.
+    Args:
+        names: Models to warm ("ocr", "caption", "detect"); an empty list is ready at once.
+    Returns:
+        The readiness snapshot.
+    """
+    readiness.set_state(WARMING)
+    failed = False
+    for name in names:
+        try:
+            start = time.perf_counter()
+            model = models.get_model(name)
+            loaded = time.perf_counter()
+            DUMMY_INFERENCE[name](model)
+            readiness.record(name, load_s=round(loaded - start, 3),
+                             warmup_s=round(time.perf_counter() - loaded, 3), error=None)
+        except Exception as e:
+            readiness.record(name, error=f"{type(e).__name__}: {e}")
+            failed = True
+    readiness.set_state(FAILED if failed else READY)
+    return readiness.snapshot()
+
+
+def warm_up_in_background(names=("ocr", "caption"), readiness=READINESS):
+    """
+    Runs warm_up() on a daemon thread so a server can answer liveness checks meanwhile.
+    Returns:
+        The thread.
+    """
+    thread = threading.Thread(target=warm_up, args=(names, readiness), name="fairguard-warmup", daemon=True)
+    thread.start()
+    return thread
+
+
+def format_report(snapshot):
+    """
+    Human-readable warm-up report: state plus per-model load and warm-up seconds.
+    """
+    lines = [f"Model warm-up: {snapshot['state']}"]
+    for name, info in snapshot["models"].items():
+        if info.get("error"):
+            lines.append(f"  {name:<8} FAILED  {info['error']}")
+        else:
+            lines.append(f"  {name:<8} load {info['load_s']:7.2f} s   warm-up {info['warmup_s']:7.2f} s")
+    return "\n".join(lines)
+
+
+def parse_names(value):
+    """
+    Parses a comma-separated model list ("ocr,caption"); "none" or "" means no models.
+    """
+    names = [name.strip() for name in (value or "").split(",") if name.strip() and name.strip() != "none"]
+    unknown = [name for name in names if name not in models.MODEL_NAMES]
+    if unknown:
+        raise ValueError(f"Unknown model(s): {', '.join(unknown)}. Choose from {', '.join(models.MODEL_NAMES)}.")
+    return names
+
+
+if __name__ == "__main__":
+    snapshot = warm_up(parse_names(",".join(sys.argv[1:]) or "ocr,caption"))
+    print(format_report(snapshot))
+    raise SystemExit(0 if snapshot["state"] == READY else 1)
@@ -0,0 +1,140 @@
+# workers.py
+#
+# Process pool for image analysis whose workers share one physical copy of the model weights.
+# The parent loads (and warms) the models, freezes the GC so collections in the children do not
+# write to the inherited objects, then forks: weight tensors stay copy-on-write shared and only
+# per-request activations are private to each worker. Weights saved as safetensors (the default
+# for save_pretrained, see FAIRGUARD_MODEL_DIR in models.py) are memory-mapped while loading, so
+# the parent's load peak stays close to the final model size.
+#
+# Run from the Ai folder:  python -m fairguard.workers --processes 4 image1.jpg image2.jpg ...
+
+import argparse
+import gc
+import multiprocessing
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+from . import engine
+from .warmup import READY, format_report, parse_names, warm_up
+
+SMAPS_FIELDS = ("Rss", "Pss", "Shared_Clean", "Shared_Dirty", "Private_Clean", "Private_Dirty")
+
+
+def memory_report(pid="self"):
+    """
+    Memory of one process from /proc/<pid>/smaps_rollup (Linux 4.14+), in MB.
+    Returns:
+        {"pid", "rss", "pss", "uss", "shared"}: USS is the memory only this process holds,
+        PSS splits shared pages evenly between the processes mapping them. None if unavailable.
+    """
+    try:
+        with open(f"/proc/{pid}/smaps_rollup") as f:
+            lines = f.read().splitlines()
+    except OSError:
+        return None
+    kb = {}
+    for line in lines:
+        key, _, value = line.partition(":")
+        if key in SMAPS_FIELDS:
+            kb[key] = int(value.split()[0])
+    return {
+        "pid": os.getpid() if pid == "self" else pid,
+        "rss": kb.get("Rss", 0) / 1024,
+        "pss": kb.get("Pss", 0) / 1024,
+        "uss": (kb.get("Private_Clean", 0) + kb.get("Private_Dirty", 0)) / 1024,
+        "shared": (kb.get("Shared_Clean", 0) + kb.get("Shared_Dirty", 0)) / 1024,
+    }
+
+
+def _init_worker(torch_threads):
+    # N workers x all cores would oversubscribe the CPU; each worker gets a slice
+    torch = sys.modules.get("torch")  # Only present if the preloaded models brought it in
+    if torch is not None and torch_threads:
+        torch.set_num_threads(torch_threads)
+
+
+def _analyze_path(path):
+    try:
+        results = engine.analyze_image(path)
+    except Exception as e:
+        results = {"error": f"{type(e).__name__}: {e}"}
+    results["path"] = path
+    return results, memory_report()
+
+
+class SharedModelPool:
+    """
+    Preloads the models in this process, then forks `processes` workers that inherit them.
+    Use as a context manager; map_images() yields (result, worker_memory) in input order.
+    """
+
+    def __init__(self, processes=2, models=("ocr", "caption"), torch_threads=None):
+        snapshot = warm_up(models)
+        if snapshot["state"] != READY:
+            raise RuntimeError(format_report(snapshot))
+        self.warm_up_report = snapshot
+        if torch_threads is None:
+            torch_threads = max(1, (os.cpu_count() or 1) // processes)
+
+        gc.collect()
+        gc.freeze()  # Move everything loaded so far out of the GC's reach before forking
+        self._executor = ProcessPoolExecutor(
+            max_workers=processes,
+            mp_context=multiprocessing.get_context("fork"),
+            initializer=_init_worker,
+            initargs=(torch_threads,),
+        )
+
+    def map_images(self, paths):
+        return self._executor.map(_analyze_path, paths)
+
+    def close(self):
+        self._executor.shutdown()
+        gc.unfreeze()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def format_memory(parent, workers):
+    """
+    Table of parent and per-worker RSS / PSS / USS / shared memory (MB).
+    """
+    lines = [f"{'process':<14}{'RSS':>10}{'PSS':>10}{'USS':>10}{'shared':>10}"]
+    for label, report in [("parent", parent)] + [(f"worker {r['pid']}", r) for r in workers]:
+        if report:
+            lines.append(f"{label:<14}{report['rss']:>10.1f}{report['pss']:>10.1f}"
+                         f"{report['uss']:>10.1f}{report['shared']:>10.1f}")
+    total_pss = sum(r["pss"] for r in [parent] + workers if r)
+    lines.append(f"total PSS (actual footprint): {total_pss:.1f} MB")
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Analyze images in a pool of workers sharing model weights")
+    parser.add_argument("images", nargs="+")
+    parser.add_argument("--processes", type=int, default=2)
+    parser.add_argument("--models", default="ocr,caption")
+    args = parser.parse_args()
+
+    with SharedModelPool(args.processes, models=parse_names(args.models)) as pool:
+        print(format_report(pool.warm_up_report))
+        latest = {}
+        for result, memory in pool.map_images(args.images):
+            if "error" in result:
+                print(f"{result['path']}: {result['error']}")
+            else:
+                print(f"{result['path']}: overall {result['overall_score']}, "
+                      f"text {result['bias']['bias_score']}, visual {result['visual']['visual_bias_score']}")
+            if memory:
+                latest[memory["pid"]] = memory
+        print(format_memory(memory_report(), list(latest.values())))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,4 @@
+from PIL import Image
 from detect import detect_objects
 from caption import generate_captions
 from analyze import analyze_bias
@@ -5,13 +6,16 @@ from save_results import save_results
 
 IMAGE_PATH = "image 2.jpg"
 
-boxes = detect_objects(IMAGE_PATH)
-print("✅ Detected boxes:", boxes)
+detections = detect_objects(IMAGE_PATH)
+print("✅ Detected boxes:", detections)
 
-captions = generate_captions(IMAGE_PATH, boxes)
+captions = generate_captions(IMAGE_PATH, detections.to_boxes())
 print("✅ Generated captions:", captions)
 
-analysis = analyze_bias(captions)
+with Image.open(IMAGE_PATH) as image:
+    image_size = image.size
+analysis = analyze_bias(captions, image_size=image_size)
 print("✅ Ollama output:", analysis)
+print("✅ Prompt size:", analysis["prompt_metrics"])
 
-save_results(captions, analysis)
+save_results(IMAGE_PATH, analysis, captions)
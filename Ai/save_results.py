@@ -1,12 +1,26 @@
 # save_results.py
 
-import json
-
-def save_results(captions, analysis, output_file="results.json"):
-    result = {
-        "captions": captions,
-        "analysis": analysis
-    }
-    with open(output_file, "w") as f:
-        json.dump(result, f, indent=4)
-    print(f"✅ Results saved to {output_file}")
+from fairguard.result_model import ResultWriter, load_flag_table, make_record
+
+# LLM result fields kept in the record's details (categories become flags and the bitmask)
+DETAIL_FIELDS = ("scene", "suggestions", "model", "prompt_metrics")
+
+def save_results(image_path, analysis, captions=None, output_file="results.jsonl", campaign=""):
+    """
+    Appends one compact AnalysisRecord for an image's LLM bias analysis to the result log
+    (see fairguard/result_model.py); flag messages go to the "<output_file>.flags" sidecar
+    once and the record only stores their IDs. The LLM stage gives flags but no rule score,
+    so both scores are written as UNSCORED; the scene, suggestions, captions and prompt
+    metrics are kept in the record's details. The log can be bulk-loaded into the audit
+    store with ResultStore.import_log().
+    """
+    with open(image_path, "rb") as f:
+        content = f.read()
+    details = {field: analysis[field] for field in DETAIL_FIELDS if field in analysis}
+    if captions is not None:
+        details["captions"] = captions
+
+    with ResultWriter(output_file, load_flag_table(output_file)) as writer:
+        writer.write(make_record(writer.flag_table, content, None, visual_results=analysis,
+                                 campaign=campaign, details=details))
+    print(f"✅ Results appended to {output_file}")
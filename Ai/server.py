@@ -0,0 +1,154 @@
+# server.py
+#
+# Small JSON API + static file server for the Web dashboard.
+# Run from the Ai folder:  python server.py --port 8000  then open http://localhost:8000/
+
+import argparse
+import hashlib
+import json
+import os
+import threading
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from fairguard.audience_stats import compute_audience_match
+from fairguard.result_model import CATEGORIES
+from fairguard.result_store import ResultStore
+from fairguard.warmup import READINESS, format_report, parse_names, warm_up
+
+WEB_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Web")
+
+
+class _BodyReader:
+    """
+    File-like view over exactly Content-Length bytes of a request body, so uploads are parsed
+    as they stream in instead of being buffered in memory first. The bytes are hashed on the
+    way through, so the upload can be identified without a second pass.
+    """
+
+    def __init__(self, rfile, length):
+        self.rfile = rfile
+        self.remaining = length
+        self.digest = hashlib.sha256()
+
+    def read(self, size=-1):
+        if self.remaining <= 0:
+            return b""
+        if size is None or size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.rfile.read(size)
+        self.remaining -= len(data)
+        self.digest.update(data)
+        return data
+
+    def __iter__(self):
+        # pandas only needs read(); iteration support keeps it happy on older versions.
+        while True:
+            line = self.rfile.readline(self.remaining) if self.remaining > 0 else b""
+            if not line:
+                return
+            self.remaining -= len(line)
+            self.digest.update(line)
+            yield line
+
+
+class FairGuardHandler(SimpleHTTPRequestHandler):
+    """
+    Serves the Web dashboard and the /api/* endpoints.
+    """
+    store = None
+
+    def _send_json(self, payload, status=200):
+        body = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _filters(self, query):
+        filters = {}
+        if "campaign" in query:
+            filters["campaign"] = query["campaign"][0]
+        for key in ("since", "until", "min_score"):
+            if key in query:
+                filters[key] = int(query[key][0])
+        if "categories" in query:
+            filters["categories"] = [c for c in query["categories"][0].split(",") if c in CATEGORIES]
+        if "has_pii" in query:
+            filters["has_pii"] = query["has_pii"][0] in ("1", "true")
+        return filters
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+        if url.path == "/healthz":  # Liveness: the process is serving requests
+            return self._send_json({"status": "ok"})
+        if url.path == "/readyz":  # Readiness: models are loaded and warmed up
+            snapshot = READINESS.snapshot()
+            return self._send_json(snapshot, status=200 if READINESS.is_ready else 503)
+        try:
+            if url.path == "/api/audience/stats":
+                return self._send_json(self.store.parameter_stats(query.get("campaign", [""])[0]))
+            if url.path == "/api/results/aggregate":
+                return self._send_json(self.store.aggregate(**self._filters(query)))
+            if url.path == "/api/results":
+                limit = int(query.get("limit", ["100"])[0])
+                return self._send_json(self.store.query(limit=limit, **self._filters(query)))
+        except (ValueError, KeyError) as e:
+            return self._send_json({"error": str(e)}, status=400)
+        return super().do_GET()
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        if url.path != "/api/audience/match":
+            return self._send_json({"error": "Not found"}, status=404)
+
+        query = parse_qs(url.query)
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            body = _BodyReader(self.rfile, length)
+            results = compute_audience_match(
+                body,
+                gender=query.get("gender", ["both"])[0],
+                age_min=int(query.get("ageMin", ["18"])[0]),
+                age_max=int(query.get("ageMax", ["65"])[0]),
+            )
+        except Exception as e:
+            return self._send_json({"error": f"Could not analyze audience file: {e}"}, status=400)
+
+        # Only campaign uploads are kept; re-analyzing the same file replaces its counts
+        campaign = query.get("campaign", [""])[0]
+        if campaign:
+            self.store.add_audience_stats(campaign, body.digest.hexdigest(), results["parameterStats"])
+        self._send_json(results)
+
+
+def _warm_up_and_report(names):
+    print(format_report(warm_up(names)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="FairGuard dashboard API server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--store", default=os.environ.get("FAIRGUARD_STORE", "fairguard_results.db"))
+    parser.add_argument("--warm-up", default=os.environ.get("FAIRGUARD_WARMUP_MODELS", "none"),
+                        help="Comma-separated models to load and warm before /readyz reports ready "
+                             "(ocr, caption, detect; default none)")
+    args = parser.parse_args()
+
+    FairGuardHandler.store = ResultStore(args.store)
+    handler = partial(FairGuardHandler, directory=WEB_DIR)
+    server = ThreadingHTTPServer((args.host, args.port), handler)
+    print(f"✅ FairGuard server running on http://{args.host}:{args.port}/")
+
+    # Listen right away so /healthz answers; /readyz stays 503 until warm-up has finished
+    names = parse_names(args.warm_up)
+    threading.Thread(target=_warm_up_and_report, args=(names,), name="fairguard-warmup", daemon=True).start()
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
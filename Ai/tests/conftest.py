@@ -0,0 +1,8 @@
+# conftest.py
+#
+# Run from the Ai folder: python -m pytest tests
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
@@ -0,0 +1,66 @@
+# test_audience_stats.py
+
+import io
+
+import pytest
+
+pytest.importorskip("pandas")
+
+from fairguard.audience_stats import compute_audience_match
+from fairguard.schema_profiler import clear_schema_cache
+
+GENDERS = ["male", "female", "Female", "non-binary", ""]
+CITIES = ["Austin", "Boston", "Chicago", "Denver"]
+EXPORT = "gender,age,city\n" + "".join(
+    f"{GENDERS[i * 7 % 5]},{16 + i * 13 % 60},{CITIES[i * 3 % 4]}\n" for i in range(500))
+
+# Expected values from the original Web/script.js on EXPORT
+JS_PARAMETER_STATS = {
+    "age": {"stats": {"min": 16, "max": 75, "sum": 22710, "count": 500, "avg": 45}},
+    "gender": {"male": 100, "female": 200, "non-binary": 100},
+    "location": {"austin": 125, "denver": 125, "chicago": 125, "boston": 125},
+}
+JS_AGE_DATA = {"10-19": 34, "20-29": 84, "30-39": 83, "40-49": 83, "50-59": 83, "60-69": 83, "70-79": 50}
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache():
+    clear_schema_cache()
+    yield
+    clear_schema_cache()
+
+
+def _sorted(result):
+    result["matchHistogram"] = sorted(result["matchHistogram"])
+    return result
+
+
+@pytest.mark.parametrize("gender, age_min, age_max, expected", [
+    ("female", 25, 45, (76, 40.0, 35.0, 37)),
+    ("both", 18, 30, (109, 100.0, 21.8, 53)),
+    ("male", 40, 90, (56, 20.0, 59.8, 44)),
+])
+def test_matches_the_javascript_results(gender, age_min, age_max, expected):
+    result = compute_audience_match(io.StringIO(EXPORT), gender, age_min, age_max)
+    assert result["totalRecords"] == 500
+    assert (result["matchedRecords"], result["genderMatch"], result["ageMatch"], result["matchScore"]) == \
+        pytest.approx(expected)
+    assert result["parameterStats"] == JS_PARAMETER_STATS
+    assert {name: param["name"] for name, param in result["sensitiveParams"].items()} == \
+        {"age": "age", "gender": "gender", "location": "city"}
+    assert result["sensitiveParams"]["age"]["data"] == JS_AGE_DATA
+
+
+@pytest.mark.parametrize("chunksize", [7, 64, 499])
+def test_chunk_boundaries_do_not_change_the_result(chunksize):
+    whole = _sorted(compute_audience_match(io.StringIO(EXPORT), "female", 25, 45))
+    assert _sorted(compute_audience_match(io.StringIO(EXPORT), "female", 25, 45, chunksize=chunksize)) == whole
+
+
+def test_quoted_fields_keep_their_commas():
+    export = 'gender,age,city\n"female",30,"Austin, TX"\nmale,"41","Portland, OR"\n" female ",29,"Austin, TX"\n'
+    result = compute_audience_match(io.StringIO(export), "female", 25, 35, chunksize=2)
+    assert (result["totalRecords"], result["matchedRecords"]) == (3, 2)
+    assert result["parameterStats"]["location"] == {"austin, tx": 2, "portland, or": 1}
+    assert result["parameterStats"]["gender"] == {"female": 2, "male": 1}
+    assert result["parameterStats"]["age"]["stats"] == {"min": 29, "max": 41, "sum": 100, "count": 3, "avg": 33}
@@ -0,0 +1,79 @@
+# test_batch_ingest.py
+#
+# PDF documents opened for a batch run are closed however the run ends. pdfium is replaced by
+# a stand-in document that counts how often it is closed.
+
+import io
+import sys
+import types
+
+import pytest
+from PIL import Image
+
+from fairguard.batch_ingest import open_creatives, run_batched
+
+
+class _Page:
+    def render(self, scale):
+        return types.SimpleNamespace(to_pil=lambda: Image.new("RGB", (32, 32)))
+
+    def close(self):
+        pass
+
+
+class _Document:
+    closed = []
+
+    def __init__(self, fileobj):
+        self.pages = 5
+
+    def __len__(self):
+        return self.pages
+
+    def __getitem__(self, index):
+        return _Page()
+
+    def close(self):
+        _Document.closed.append(self)
+
+
+@pytest.fixture
+def pdfs(monkeypatch):
+    monkeypatch.setitem(sys.modules, "pypdfium2", types.SimpleNamespace(PdfDocument=_Document))
+    _Document.closed = []
+
+    def upload(name):
+        fileobj = io.BytesIO(b"%PDF-")
+        fileobj.name = name
+        return fileobj
+    return [upload("a.pdf"), upload("b.pdf")]
+
+
+def _load_all(batch):
+    return [creative.load().size for creative in batch]
+
+
+def test_completed_run_closes_every_document(pdfs):
+    with open_creatives(pdfs) as creatives:
+        results = [size for batch in run_batched(creatives, _load_all, batch_size=3) for size in batch]
+        assert len(results) == 10
+        assert len(_Document.closed) == 2
+    assert len(_Document.closed) == 2
+
+
+def test_failed_run_closes_documents_with_unloaded_pages(pdfs):
+    def fail(batch):
+        raise RuntimeError("model crashed")
+
+    with pytest.raises(RuntimeError):
+        with open_creatives(pdfs) as creatives:
+            for _ in run_batched(creatives, fail, batch_size=2, max_in_flight=1):
+                pass
+    assert len(_Document.closed) == 1  # Only a.pdf was opened before the run failed
+
+
+def test_stopped_run_closes_documents(pdfs):
+    with open_creatives(pdfs) as creatives:
+        for _ in run_batched(creatives, _load_all, batch_size=2, max_in_flight=1):
+            break
+    assert len(_Document.closed) == 1
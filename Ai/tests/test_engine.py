@@ -0,0 +1,16 @@
+# test_engine.py
+
+from fairguard.engine import analyze_visual
+
+CAPTION = "a man in a suit standing next to a car"
+
+
+def test_ocr_text_is_normalized_for_the_visual_rules():
+    for ocr_text in ("No more struggIing with bills", "Achieve financial freed0m today"):
+        results = analyze_visual(CAPTION, ocr_text)
+        assert results["bias_categories"]["racial_socioeconomic"], ocr_text
+
+
+def test_clean_ocr_text_does_not_trigger_the_visual_rules():
+    results = analyze_visual(CAPTION, "Test drive the new model this weekend")
+    assert not results["bias_categories"]["racial_socioeconomic"]
@@ -0,0 +1,109 @@
+# test_llm.py
+#
+# The Ollama stage against a fake server that streams NDJSON like the real one.
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from fairguard import llm
+from fairguard.memo import MemoCache
+
+REPLY = json.dumps({
+    "scene": "A man in a suit stands next to a car.",
+    "bias_categories": {"gender": ["Only a man is shown in a business role."]},
+    "suggestions": ["Show people of different genders."],
+})
+CAPTIONS = [{"box": [0, 0, 10, 10], "caption": "a man in a suit"}]
+
+
+@pytest.fixture
+def ollama(monkeypatch):
+    calls = []
+
+    class FakeOllama(BaseHTTPRequestHandler):
+        def do_POST(self):
+            calls.append(json.loads(self.rfile.read(int(self.headers["Content-Length"]))))
+            self.send_response(200)
+            self.send_header("Content-Type", "application/x-ndjson")
+            self.end_headers()
+            time.sleep(0.2)  # Long enough for concurrent callers to pile up
+            for i in range(0, len(REPLY), 7):  # Fragments split mid-token, like a real stream
+                self.wfile.write(json.dumps({"response": REPLY[i:i + 7], "done": False}).encode() + b"\n")
+                self.wfile.flush()
+            self.wfile.write(json.dumps({"response": "", "done": True}).encode() + b"\n")
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeOllama)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    monkeypatch.setattr(llm, "OLLAMA_URL", f"http://127.0.0.1:{server.server_address[1]}")
+    monkeypatch.setattr(llm, "_cache", MemoCache(max_entries=16, ttl=60, max_workers=4))
+    yield calls
+    server.shutdown()
+    server.server_close()
+
+
+def test_structured_result_is_parsed(ollama):
+    result = llm.analyze_captions(CAPTIONS)
+    assert result["bias_categories"]["gender"] == ["Only a man is shown in a business role."]
+    assert result["bias_categories"]["age"] == []
+    assert result["suggestions"] == ["Show people of different genders."]
+    assert result["prompt_metrics"]["captions_kept"] == 1
+    assert ollama[0]["format"] == llm.ANALYSIS_SCHEMA
+
+
+def test_concurrent_identical_requests_share_one_generation(ollama):
+    results = [None] * 5
+
+    def call(i):
+        results[i] = llm.analyze_captions(CAPTIONS)
+
+    threads = [threading.Thread(target=call, args=(i,)) for i in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(ollama) == 1
+    assert all(result == results[0] for result in results)
+
+
+def test_whitespace_only_prompt_change_is_a_cache_hit(ollama):
+    prompt = llm.build_prompt(CAPTIONS)[0]
+    first = llm.analyze_prompt(prompt)
+    assert llm.analyze_prompt("  " + prompt.replace("\n", "\n\n")) == first
+    assert len(ollama) == 1
+    llm.analyze_captions(["a woman"])
+    assert len(ollama) == 2
+
+
+def test_cached_result_is_not_changed_by_callers(ollama):
+    first = llm.analyze_captions(CAPTIONS)
+    first["bias_categories"]["gender"].append("Added by a caller.")
+    first["suggestions"].clear()
+    second = llm.analyze_captions(CAPTIONS)
+    assert len(ollama) == 1
+    assert second["bias_categories"]["gender"] == ["Only a man is shown in a business role."]
+    assert second["suggestions"] == ["Show people of different genders."]
+
+
+def test_streamed_text_reaches_callback(ollama):
+    fragments = []
+    llm.analyze_captions(CAPTIONS, on_text=fragments.append, use_cache=False)
+    assert "".join(fragments) == REPLY
+
+
+def test_error_chunk_raises():
+    with pytest.raises(llm.LLMError, match="model not found"):
+        list(llm.iter_ndjson([b'{"error": "model not found"}\n']))
+
+
+def test_json_wrapped_in_prose_is_recovered():
+    result = llm.parse_analysis("Here you go: " + REPLY + " Hope this helps.")
+    assert result["scene"].startswith("A man in a suit")
+    with pytest.raises(llm.LLMError):
+        llm.parse_analysis("no json here")
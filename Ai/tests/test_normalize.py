@@ -0,0 +1,32 @@
+# test_normalize.py
+#
+# Fuzzy term correction fires on obfuscated or OCR-noisy words, not on ordinary near misses.
+
+import pytest
+
+from fairguard.normalize import canonical_text
+
+
+@pytest.mark.parametrize("copy", [
+    "Sunset views from our South Beach resort.",
+    "Fresh mouth wash for fresh breath all day.",
+    "Backyard BBQ season is here.",
+    "Our sexiest swimwear line yet.",
+    "Retire early with a plan that works for you.",
+    "Our youngest chef wins the cook-off.",
+])
+def test_ordinary_words_are_not_corrected(copy):
+    assert canonical_text(copy) == canonical_text(copy, fuzzy=False)
+
+
+@pytest.mark.parametrize("copy, term", [
+    ("No more vi0lence on screen", "violence"),  # Leetspeak
+    ("Hаte speech is not welcome", "hate"),  # Cyrillic а
+    ("Made for the struggIing family", "struggling"),  # OCR read "l" as "I"
+    ("Stop the frauud now", "fraud"),  # Doubled letter
+    ("Our wheelchiar-friendly venue", "wheelchair"),  # Swapped neighbours
+    ("Escape p0vetry today", "poverty"),  # Folded and misspelled
+])
+def test_noisy_words_are_corrected(copy, term):
+    assert term not in copy.lower()
+    assert term in canonical_text(copy)
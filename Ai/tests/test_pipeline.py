@@ -0,0 +1,86 @@
+# test_pipeline.py
+#
+# The models are replaced by stand-ins that record how many calls into each model overlap.
+
+import threading
+import time
+
+import pytest
+
+from fairguard import models, pipeline
+from fairguard.batch_ingest import Creative
+
+
+class _Tracker:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.active = {}
+        self.peak = {}
+
+    def call(self, name, result):
+        with self.lock:
+            self.active[name] = self.active.get(name, 0) + 1
+            self.peak[name] = max(self.peak.get(name, 0), self.active[name])
+        time.sleep(0.002)
+        with self.lock:
+            self.active[name] -= 1
+        return result
+
+
+@pytest.fixture
+def tracker(monkeypatch):
+    tracker = _Tracker()
+    monkeypatch.setattr(models, "ocr_text", lambda image: tracker.call("ocr", "Call 555-123-4567 today"))
+    monkeypatch.setattr(models, "caption_image", lambda image: tracker.call("caption", "a man in a suit"))
+    monkeypatch.setattr(models, "caption_images",
+                        lambda images, batch_size: tracker.call("caption", ["a man in a suit"] * len(images)))
+    monkeypatch.setattr(models, "detect_batch",
+                        lambda images, batch_size: tracker.call("detect", [[]] * len(images)))
+    return tracker
+
+
+def _creatives(n, broken=()):
+    def load(i):
+        if i in broken:
+            raise ValueError("not an image")
+        return object()
+    return [Creative(f"ad{i}.png", b"%d" % i, lambda i=i: load(i)) for i in range(n)]
+
+
+def test_single_image_and_batch_calls_never_overlap(tracker):
+    def single():
+        for _ in range(5):
+            pipeline.ocr_text(b"image")
+            pipeline.caption_image(b"image")
+
+    def batch():
+        for _ in range(3):
+            pipeline.analyze_creatives(_creatives(4))
+
+    threads = [threading.Thread(target=fn) for fn in (single, single, batch, batch)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert tracker.peak == {"ocr": 1, "caption": 1, "detect": 1}
+
+
+def test_batch_results_and_decode_failures(tracker):
+    results = pipeline.analyze_creatives(_creatives(3, broken={1}))
+    assert [item["name"] for item in results] == ["ad0.png", "ad1.png", "ad2.png"]
+    assert results[1]["error"].startswith("Could not decode")
+    assert results[1]["extracted_text"] == "" and results[1]["caption"] == ""
+    assert results[0]["error"] == "" and results[0]["pii"]["has_pii"]
+    assert results[0]["detections"] == []
+
+    row = pipeline.summarize_creative(results[0])
+    assert row["Creative"] == "ad0.png" and row["Caption"] == "a man in a suit"
+
+
+def test_detection_failure_keeps_the_other_results(tracker, monkeypatch):
+    def fail(images, batch_size):
+        raise RuntimeError("no weights")
+    monkeypatch.setattr(models, "detect_batch", fail)
+    results = pipeline.analyze_creatives(_creatives(2))
+    assert all(item["error"] == "Detection failed: no weights" for item in results)
+    assert all(item["detections"] is None and item["caption"] for item in results)
@@ -0,0 +1,55 @@
+# test_prefilter.py
+
+import random
+
+from fairguard import bias_rules, security_checks
+from fairguard.bias_rules import analyze_text_for_bias
+from fairguard.normalize import canonical_text
+from fairguard.prefilter import UNGATED_RULES, analyze_copy, needs_full_analysis
+from fairguard.security_checks import check_for_harmful_content, check_for_pii
+
+
+def test_gate_sees_the_canonical_text():
+    for copy in ("It's not a sc@m, we promise", "Escape p0v3rty today", "Say no to r a c i s t jokes"):
+        assert needs_full_analysis(copy)
+        assert analyze_copy(copy) != analyze_copy(copy, normalize=False)
+    assert not needs_full_analysis("Fresh coffee, every morning.")
+
+
+def _rule_vocabulary():
+    # Every keyword list in the rule modules, so terms a new rule reads are sampled even if
+    # nobody added them to TEXT_RULE_TRIGGERS
+    terms = set()
+    for module in (bias_rules, security_checks):
+        for value in vars(module).values():
+            if isinstance(value, list) and value and all(isinstance(term, str) for term in value):
+                terms.update(value)
+    return sorted(terms)
+
+
+def _full_engine(text):
+    terms_text = canonical_text(text)
+    return analyze_text_for_bias(terms_text), check_for_pii(text), check_for_harmful_content(terms_text)
+
+
+def test_every_text_rule_is_gated_or_always_run():
+    for name, _ in bias_rules.TEXT_RULES:
+        assert name in bias_rules.TEXT_RULE_TRIGGERS or name in UNGATED_RULES, name
+
+
+def test_prescreen_matches_the_full_engine_on_a_seeded_sample():
+    rng = random.Random(7)
+    vocabulary = _rule_vocabulary() + [
+        "the", "offer", "today", "our", "new", "555-123-4567", "deals@example.com", "4111 1111 1111 1111",
+    ]
+    copies = [
+        "Discover our new summer collection, now in stores.",
+        "Are you a successful businessman looking to grow your empire?",
+        "Safety features designed especially for women drivers.",
+        "Retirees, find peace in our serene retirement community.",
+        "Escape p0verty with this one weird trick - it's not a sc@m!",
+        "Call 555-123-4567 for your offer!",
+    ]
+    copies += [" ".join(rng.choice(vocabulary) for _ in range(rng.randint(1, 6))) for _ in range(2000)]
+    mismatches = [copy for copy in copies if analyze_copy(copy) != _full_engine(copy)]
+    assert not mismatches, mismatches[:5]
@@ -0,0 +1,107 @@
+# test_preprocess.py
+
+import io
+import os
+
+import pytest
+from PIL import Image, ImageOps, ImageStat
+
+from fairguard.preprocess import EXIF_ORIENTATION, decode, for_caption, for_ocr, prepare
+
+AI_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ORIENTATIONS = range(1, 9)
+
+
+def _jpeg(orientation, size=(300, 100)):
+    # Wide white image with a red block in the top-left corner, so every flip/rotation is visible
+    image = Image.new("RGB", size, "white")
+    image.paste((255, 0, 0), (0, 0, size[0] // 5, size[1] // 2))
+    exif = Image.Exif()
+    exif[EXIF_ORIENTATION] = orientation
+    buffer = io.BytesIO()
+    image.save(buffer, "JPEG", quality=95, exif=exif.tobytes())
+    return buffer.getvalue()
+
+
+def _upright(data):
+    return ImageOps.exif_transpose(Image.open(io.BytesIO(data))).convert("RGB")
+
+
+def _red_corner(image):
+    # Which quarter of the image the red block ended up in
+    width, height = image.size
+    quarters = {
+        "top-left": (0, 0), "top-right": (width * 3 // 4, 0),
+        "bottom-left": (0, height * 3 // 4), "bottom-right": (width * 3 // 4, height * 3 // 4),
+    }
+    return max(quarters, key=lambda name: _redness(image.crop(quarters[name] + (
+        quarters[name][0] + width // 4, quarters[name][1] + height // 4))))
+
+
+def _redness(image):
+    r, g, b = ImageStat.Stat(image).mean
+    return r - (g + b) / 2
+
+
+def _assert_upright(image, data):
+    expected = _upright(data)
+    assert image.size[0] / image.size[1] == pytest.approx(expected.size[0] / expected.size[1], rel=0.05)
+    assert _red_corner(image) == _red_corner(expected)
+
+
+@pytest.mark.parametrize("orientation", ORIENTATIONS)
+def test_decode_applies_exif_orientation(orientation):
+    data = _jpeg(orientation)
+    _assert_upright(decode(data), data)
+    _assert_upright(decode(data, max_side=120), data)  # Downscaled path
+
+
+@pytest.mark.parametrize("orientation", ORIENTATIONS)
+def test_decoding_twice_does_not_rotate_again(orientation):
+    data = _jpeg(orientation)
+    _assert_upright(for_ocr(for_ocr(data)), data)
+    _assert_upright(for_caption(for_ocr(data)), data)
+
+
+@pytest.mark.parametrize("orientation", ORIENTATIONS)
+def test_prepare_returns_upright_images(orientation):
+    data = _jpeg(orientation, size=(1200, 400))
+    ocr_image, caption_image = prepare(data)
+    _assert_upright(ocr_image, data)
+    _assert_upright(caption_image, data)
+    assert max(caption_image.size) <= 512
+
+
+def test_large_jpeg_is_decoded_at_reduced_size():
+    data = _jpeg(6, size=(6000, 4000))
+    image = for_ocr(data)
+    assert max(image.size) == 2560
+    _assert_upright(image, data)
+
+
+def test_caller_image_is_not_modified():
+    image = Image.open(io.BytesIO(_jpeg(6)))
+    image.load()
+    size, exif = image.size, image.info.get("exif")
+    for_caption(image)
+    assert image.size == size and image.info.get("exif") == exif
+
+
+def test_caller_jpeg_is_not_drafted():
+    image = Image.open(io.BytesIO(_jpeg(1, size=(6000, 4000))))  # Not loaded yet
+    assert max(for_ocr(image).size) == 2560
+    image.load()
+    assert image.size == (6000, 4000) and image.mode == "RGB"
+
+
+def test_transparency_is_flattened_onto_white():
+    image = Image.new("RGBA", (40, 40), (0, 0, 0, 0))
+    decoded = decode(image)
+    assert decoded.mode == "RGB" and decoded.getpixel((20, 20)) == (255, 255, 255)
+
+
+def test_ocr_reads_the_same_words_as_full_resolution():
+    pytest.importorskip("easyocr")
+    from fairguard.preprocess import _compare
+    samples = [os.path.join(AI_DIR, "image 2.jpg"), os.path.join(AI_DIR, "uploaded_image.jpg")]
+    assert _compare(samples) >= 0.9
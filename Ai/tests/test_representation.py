@@ -0,0 +1,20 @@
+# test_representation.py
+
+from fairguard.representation import CampaignAggregator, SeenFilter
+
+
+def test_repeated_key_is_counted_once_per_campaign():
+    aggregator = CampaignAggregator()
+    assert aggregator.add_image("spring", "a woman at a desk", 1, key="h1")
+    assert not aggregator.add_image("spring", "a woman at a desk", 1, key="h1")
+    assert aggregator.add_image("autumn", "a woman at a desk", 1, key="h1")
+    assert aggregator.report("spring")["images"] == 1
+    assert aggregator.report("autumn")["images"] == 1
+
+
+def test_seen_filter_size_is_fixed():
+    seen = SeenFilter()
+    size = len(seen._bits)
+    assert all(seen.add(f"image-{i}") for i in range(5000))
+    assert not any(seen.add(f"image-{i}") for i in range(5000))
+    assert len(seen._bits) == size
@@ -0,0 +1,72 @@
+# test_result_model.py
+
+import pytest
+
+from fairguard.result_model import (
+    UNSCORED, AnalysisRecord, FlagTable, ResultWriter, flag_id, load_flag_table, make_record, read_records,
+)
+from fairguard.result_store import ResultStore
+
+
+def test_flag_ids_are_64_bit_and_fit_sqlite():
+    ids = {flag_id(f"LLM flag number {i}") for i in range(10000)}
+    assert len(ids) == 10000
+    assert all(-2 ** 63 <= fid < 2 ** 63 for fid in ids)
+    assert max(abs(fid) for fid in ids) >= 2 ** 32
+
+
+def test_intern_refuses_a_colliding_id():
+    table = FlagTable()
+    table.messages[flag_id("real message")] = "another message"
+    with pytest.raises(ValueError):
+        table.intern("real message")
+
+
+def test_flags_round_trip_through_log_and_store(tmp_path):
+    log = str(tmp_path / "results.jsonl")
+    with ResultWriter(log) as writer:
+        for i in range(50):
+            writer.write(make_record(writer.flag_table, f"copy {i}",
+                                     {"bias_categories": {"gender": [f"flag {i}"]}, "bias_score": 1}))
+    store = ResultStore(str(tmp_path / "results.db"))
+    assert store.import_log(log) == 50
+    flags = load_flag_table(log)
+    for i, record in enumerate(read_records(log)):
+        assert flags.lookup(record.flag_ids[0]) == f"flag {i}"
+        assert store.flag_message(record.flag_ids[0]) == f"flag {i}"
+
+
+def test_llm_results_keep_their_narrative_and_no_fake_score(tmp_path):
+    from save_results import save_results
+
+    image = tmp_path / "ad.jpg"
+    image.write_bytes(b"not really a jpeg")
+    analysis = {
+        "scene": "A man in a suit next to a car.",
+        "bias_categories": {"gender": ["Only a man is shown in a business role."], "age": []},
+        "suggestions": ["Show people of different genders."],
+        "model": "llama3.2:3b",
+        "prompt_metrics": {"prompt_tokens": 120},
+    }
+    captions = [{"box": [0, 0, 10, 10], "caption": "a man in a suit"}]
+    log = str(tmp_path / "results.jsonl")
+    save_results(str(image), analysis, captions, output_file=log)
+
+    record, = read_records(log)
+    assert (record.bias_score, record.visual_bias_score) == (UNSCORED, UNSCORED)
+    assert record.details["scene"] == analysis["scene"]
+    assert record.details["suggestions"] == analysis["suggestions"]
+    assert record.details["captions"] == captions
+    assert record.details["prompt_metrics"] == {"prompt_tokens": 120}
+
+    store = ResultStore(str(tmp_path / "results.db"))
+    store.import_log(log)
+    store.add_records([make_record(FlagTable(), "copy", {"bias_categories": {}, "bias_score": 4})])
+    assert store.aggregate()["avg_bias_score"] == 4
+    assert store.query(kind=1)[0]["details"]["scene"] == analysis["scene"]
+
+
+def test_rows_without_details_still_load():
+    row = [0, "abc-1", 0, [], 2, 0, 0, [], "", 0]
+    record = AnalysisRecord.from_row(row)
+    assert record.details is None and record.to_row() == row
@@ -0,0 +1,34 @@
+# test_result_store.py
+
+import threading
+
+from fairguard.result_model import FlagTable, make_record
+from fairguard.result_store import ResultStore
+
+
+def test_threads_share_one_store(tmp_path):
+    store = ResultStore(str(tmp_path / "results.db"))
+    errors = []
+
+    def worker(n):
+        try:
+            for i in range(100):
+                store.add_audience_stats("spring", f"upload-{n}", {"gender": {"male": i, "female": 1}})
+                record = make_record(FlagTable(), f"{n}-{i}",
+                                     {"bias_categories": {"gender": [f"flag {n}"]}, "bias_score": 1})
+                store.add_records([record], FlagTable())
+                store.query(limit=5)
+                store.aggregate()
+        except Exception as e:  # Collected so the assertion shows it
+            errors.append(repr(e))
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert store.aggregate()["total"] == 800
+    # Each upload's counts were replaced, not added: the last write per upload wins
+    assert store.parameter_stats("spring") == {"gender": {"male": 99 * 8, "female": 8}}
@@ -0,0 +1,54 @@
+# test_schema_profiler.py
+
+import io
+
+import pytest
+
+pd = pytest.importorskip("pandas")
+
+from fairguard.audience_stats import compute_audience_match
+from fairguard.schema_profiler import classify_column, clear_schema_cache
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache():
+    clear_schema_cache()
+    yield
+    clear_schema_cache()
+
+
+def _csv(rows):
+    return io.StringIO("\n".join(rows) + "\n")
+
+
+def test_age_header_with_missing_values_stays_age():
+    values = pd.Series([str(20 + i % 30) if i % 6 != 5 else "N/A" for i in range(60)])
+    assert classify_column("age", values)[0] == "age"
+    values = pd.Series(["18-24", "25-34", "", "N/A", "35-44", "65+"] * 10)
+    assert classify_column("Age", values)[0] == "age"
+
+
+def test_age_header_without_numbers_is_a_group_column():
+    values = pd.Series(["young", "adult", "senior", "N/A"] * 10)
+    assert classify_column("age", values)[0] == "age_group"
+
+
+def test_unparsable_ages_count_as_zero_like_the_js():
+    # Expected values from the original Web/script.js on the same file: parseInt("N/A") || 0
+    rows = ["id,gender,age"] + [f"{i},{'male' if i % 2 else 'female'},{'N/A' if i % 6 == 5 else 20 + i % 30}"
+                                for i in range(60)]
+    result = compute_audience_match(_csv(rows), "both", 30, 40)
+    assert result["sensitiveParams"]["age"]["name"] == "age"
+    assert (result["matchedRecords"], result["ageMatch"], result["matchScore"]) == (18, 30.0, 58)
+    assert result["sensitiveParams"]["age"]["data"] == {"0-9": 10, "20-29": 18, "30-39": 16, "40-49": 16}
+
+
+def test_blank_ages_are_matched_as_zero_but_not_counted_in_stats():
+    # Expected values from the original Web/script.js on the same file
+    rows = ["id,gender,Age"] + [
+        f"{i},{'male' if i % 2 else 'female'},{'' if i % 5 == 4 else ('N/A' if i % 7 == 3 else 18 + i % 40)}"
+        for i in range(70)]
+    result = compute_audience_match(_csv(rows), "female", 25, 45)
+    assert (result["matchedRecords"], result["genderMatch"], result["matchScore"]) == (13, 50.0, 46)
+    assert result["ageMatch"] == pytest.approx(42.857142857142854)
+    assert result["parameterStats"]["age"]["stats"] == {"min": 0, "max": 55, "sum": 1666, "count": 56, "avg": 30}
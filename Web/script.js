@@ -17,8 +17,8 @@ document.addEventListener('DOMContentLoaded', function() {
     // Chart instances
     let charts = {};
     
-    // Data storage
-    let csvData = [];
+    // Data storage (aggregates returned by the server; raw rows never reach the browser)
+    let matchHistogram = [];
     let sensitiveParams = {};
     let targetingInfo = {
         gender: 'both',
@@ -34,20 +34,6 @@ document.addEventListener('DOMContentLoaded', function() {
         parameterStats: {}
     };
 
-    // Common parameter name mappings
-    const parameterMappings = {
-        age: ['age', 'years', 'yrs', 'year'],
-        gender: ['gender', 'sex', 'male/female', 'm/f'],
-        location: ['location', 'city', 'state', 'country', 'region', 'address'],
-        religion: ['religion', 'faith', 'belief', 'denomination'],
-        race: ['race', 'ethnicity', 'ethnic'],
-        disability: ['disability', 'disabled', 'handicap'],
-        occupation: ['occupation', 'job', 'profession', 'work'],
-        income: ['income', 'salary', 'wage', 'earnings'],
-        education: ['education', 'degree', 'qualification'],
-        marital: ['marital', 'maritalstatus', 'relationshipstatus']
-    };
-
     // Initialize targeting info from inputs
     function updateTargetingInfoFromInputs() {
     const genderRadio = document.querySelector('input[name="gender"]:checked');
@@ -95,7 +81,7 @@ analyzeBtn.addEventListener('click', function() {
     }
     
     function updateAnalysis() {
-        if (csvData.length > 0) {
+        if (analysisResults.totalRecords > 0) {
             analyzeDataMatch();
             updateMatchScoreDisplay();
             generateInsights();
@@ -110,32 +96,34 @@ analyzeBtn.addEventListener('click', function() {
     dataSection.classList.add('hidden');
     
     try {
-        const text = await readFileAsText(file);
-        csvData = parseCSV(text);
-        
         // Update targeting info from current input values
         updateTargetingInfoFromInputs();
         
-        // Reset and detect sensitive parameters
-        sensitiveParams = {};
-        detectSensitiveParameters();
+        // Stream the file to the server, which parses it in chunks and returns only aggregates
+        const params = new URLSearchParams({
+            gender: targetingInfo.gender,
+            ageMin: targetingInfo.ageMin,
+            ageMax: targetingInfo.ageMax
+        });
+        const response = await fetch(`/api/audience/match?${params}`, {
+            method: 'POST',
+            headers: { 'Content-Type': 'text/csv' },
+            body: file
+        });
+        const payload = await response.json();
+        if (!response.ok) throw new Error(payload.error || response.statusText);
         
-        // Initialize analysis results with proper structure
+        sensitiveParams = payload.sensitiveParams;
+        matchHistogram = payload.matchHistogram;
         analysisResults = {
-            totalRecords: csvData.length,
-            matchedRecords: 0,
-            genderMatch: 0,
-            ageMatch: 0,
-            matchScore: 0,
-            parameterStats: {}
+            totalRecords: payload.totalRecords,
+            matchedRecords: payload.matchedRecords,
+            genderMatch: payload.genderMatch,
+            ageMatch: payload.ageMatch,
+            matchScore: payload.matchScore,
+            parameterStats: payload.parameterStats
         };
         
-        // Process data and calculate statistics
-        processDataAndCalculateStats();
-        
-        // Now calculate the match score
-        analyzeDataMatch();
-        
         // Update UI
         createCharts();
         generateInsights();
@@ -149,236 +137,23 @@ analyzeBtn.addEventListener('click', function() {
         alert('Error analyzing data. Please check the file format and try again.');
     }
 }
-
-function processDataAndCalculateStats() {
-    // Reset parameter stats
-    analysisResults.parameterStats = {};
-    
-    csvData.forEach(record => {
-        // Process each detected sensitive parameter
-        Object.entries(sensitiveParams).forEach(([paramType, paramInfo]) => {
-            const paramName = paramInfo.name;
-            const paramValue = record[paramName];
-            
-            if (paramValue === undefined || paramValue === '') return;
-            
-            // Initialize stats if not exists
-            if (!analysisResults.parameterStats[paramType]) {
-                analysisResults.parameterStats[paramType] = {};
-            }
-            
-            // Special handling for age
-            if (paramType === 'age') {
-                const age = parseInt(paramValue) || 0;
-                if (!isNaN(age)) {
-                    const ageGroup = Math.floor(age / 10) * 10;
-                    const ageRange = `${ageGroup}-${ageGroup + 9}`;
-                    sensitiveParams.age.data[ageRange] = (sensitiveParams.age.data[ageRange] || 0) + 1;
-                    
-                    if (!analysisResults.parameterStats.age.stats) {
-                        analysisResults.parameterStats.age.stats = {
-                            min: age,
-                            max: age,
-                            sum: age,
-                            count: 1
-                        };
-                    } else {
-                        analysisResults.parameterStats.age.stats.min = Math.min(
-                            analysisResults.parameterStats.age.stats.min, age);
-                        analysisResults.parameterStats.age.stats.max = Math.max(
-                            analysisResults.parameterStats.age.stats.max, age);
-                        analysisResults.parameterStats.age.stats.sum += age;
-                        analysisResults.parameterStats.age.stats.count++;
-                    }
-                }
-            } 
-            // Special handling for gender
-            else if (paramType === 'gender') {
-                const gender = paramValue.toLowerCase();
-                sensitiveParams.gender.data[gender] = (sensitiveParams.gender.data[gender] || 0) + 1;
-                analysisResults.parameterStats.gender[gender] = 
-                    (analysisResults.parameterStats.gender[gender] || 0) + 1;
-            }
-            // For all other parameters
-            else {
-                const value = paramValue.toString().toLowerCase();
-                sensitiveParams[paramType].data[value] = 
-                    (sensitiveParams[paramType].data[value] || 0) + 1;
-                
-                analysisResults.parameterStats[paramType][value] = 
-                    (analysisResults.parameterStats[paramType][value] || 0) + 1;
-            }
-        });
-    });
-    
-    // Calculate average age if available
-    if (analysisResults.parameterStats.age?.stats) {
-        const ageStats = analysisResults.parameterStats.age.stats;
-        ageStats.avg = Math.round(ageStats.sum / ageStats.count);
-    }
-}
-
-function updateTargetingInfoFromInputs() {
-    const genderRadio = document.querySelector('input[name="gender"]:checked');
-    targetingInfo.gender = genderRadio ? genderRadio.value : 'both';
-    targetingInfo.ageMin = parseInt(ageMin.value) || 18;
-    targetingInfo.ageMax = parseInt(ageMax.value) || 65;
-}
-    
-    function detectSensitiveParameters() {
-        sensitiveParams = {};
-        
-        if (csvData.length === 0) return;
-        
-        const firstRecord = csvData[0];
-        const headers = Object.keys(firstRecord);
-        
-        // Detect each parameter type based on common name patterns
-        for (const [paramType, patterns] of Object.entries(parameterMappings)) {
-            for (const header of headers) {
-                const headerLower = header.toLowerCase();
-                if (patterns.some(pattern => headerLower.includes(pattern))) {
-                    if (!sensitiveParams[paramType]) {
-                        sensitiveParams[paramType] = {
-                            name: header,
-                            data: {}
-                        };
-                    }
-                    break;
-                }
-            }
-        }
-        
-        // For any remaining headers, add them as generic parameters
-        headers.forEach(header => {
-            const headerLower = header.toLowerCase();
-            const isMapped = Object.values(parameterMappings).some(patterns => 
-                patterns.some(pattern => headerLower.includes(pattern)));
-            
-            if (!isMapped) {
-                sensitiveParams[header] = {
-                    name: header,
-                    data: {}
-                };
-            }
-        });
-    }
-    
-    function collectParameterStatistics() {
-        analysisResults.parameterStats = {};
-        
-        csvData.forEach(record => {
-            // Process each detected sensitive parameter
-            Object.entries(sensitiveParams).forEach(([paramType, paramInfo]) => {
-                const paramName = paramInfo.name;
-                const paramValue = record[paramName];
-                
-                if (paramValue === undefined || paramValue === '') return;
-                
-                // Initialize stats if not exists
-                if (!analysisResults.parameterStats[paramType]) {
-                    analysisResults.parameterStats[paramType] = {};
-                }
-                
-                // Special handling for age
-                if (paramType === 'age') {
-                    const age = parseInt(paramValue) || 0;
-                    if (!isNaN(age)) {
-                        const ageGroup = Math.floor(age / 10) * 10;
-                        const ageRange = `${ageGroup}-${ageGroup + 9}`;
-                        sensitiveParams.age.data[ageRange] = (sensitiveParams.age.data[ageRange] || 0) + 1;
-                        
-                        if (!analysisResults.parameterStats.age.stats) {
-                            analysisResults.parameterStats.age.stats = {
-                                min: age,
-                                max: age,
-                                sum: age,
-                                count: 1
-                            };
-                        } else {
-                            analysisResults.parameterStats.age.stats.min = Math.min(
-                                analysisResults.parameterStats.age.stats.min, age);
-                            analysisResults.parameterStats.age.stats.max = Math.max(
-                                analysisResults.parameterStats.age.stats.max, age);
-                            analysisResults.parameterStats.age.stats.sum += age;
-                            analysisResults.parameterStats.age.stats.count++;
-                        }
-                    }
-                } 
-                // Special handling for gender
-                else if (paramType === 'gender') {
-                    const gender = paramValue.toLowerCase();
-                    sensitiveParams.gender.data[gender] = (sensitiveParams.gender.data[gender] || 0) + 1;
-                    analysisResults.parameterStats.gender[gender] = 
-                        (analysisResults.parameterStats.gender[gender] || 0) + 1;
-                }
-                // For all other parameters
-                else {
-                    const value = paramValue.toString().toLowerCase();
-                    sensitiveParams[paramType].data[value] = 
-                        (sensitiveParams[paramType].data[value] || 0) + 1;
-                    
-                    analysisResults.parameterStats[paramType][value] = 
-                        (analysisResults.parameterStats[paramType][value] || 0) + 1;
-                }
-            });
-        });
-        
-        // Calculate average age if available
-        if (analysisResults.parameterStats.age?.stats) {
-            const ageStats = analysisResults.parameterStats.age.stats;
-            ageStats.avg = Math.round(ageStats.sum / ageStats.count);
-        }
-    }
-    
-    function readFileAsText(file) {
-        return new Promise((resolve, reject) => {
-            const reader = new FileReader();
-            reader.onload = event => resolve(event.target.result);
-            reader.onerror = error => reject(error);
-            reader.readAsText(file);
-        });
-    }
-    
-    function parseCSV(text) {
-        const lines = text.split('\n').filter(line => line.trim());
-        const headers = lines[0].split(',').map(h => h.trim());
-        
-        return lines.slice(1).map(line => {
-            const values = line.split(',');
-            return headers.reduce((obj, header, index) => {
-                obj[header] = values[index] ? values[index].trim() : '';
-                return obj;
-            }, {});
-        });
-    }
     
+    // Re-scores the current targeting from the server's (gender, age) histogram,
+    // so changing the targeting inputs does not require re-uploading the file.
     function analyzeDataMatch() {
-        analysisResults.totalRecords = csvData.length;
         let genderMatchCount = 0;
         let ageMatchCount = 0;
         let bothMatchCount = 0;
         
-        csvData.forEach(record => {
-            // Check gender match if gender parameter exists
-            let genderMatch = true;
-            if (sensitiveParams.gender) {
-                const gender = record[sensitiveParams.gender.name] ? 
-                    record[sensitiveParams.gender.name].toLowerCase() : '';
-                genderMatch = targetingInfo.gender === 'both' || 
-                            gender === targetingInfo.gender;
-            }
-            
-            // Check age match if age parameter exists
-            let ageMatch = true;
-            if (sensitiveParams.age) {
-                const age = parseInt(record[sensitiveParams.age.name]) || 0;
-                ageMatch = age >= targetingInfo.ageMin && age <= targetingInfo.ageMax;
-            }
-            
-            if (genderMatch) genderMatchCount++;
-            if (ageMatch) ageMatchCount++;
-            if (genderMatch && ageMatch) bothMatchCount++;
+        matchHistogram.forEach(([gender, age, count]) => {
+            const genderMatch = !sensitiveParams.gender || targetingInfo.gender === 'both' ||
+                                gender === targetingInfo.gender;
+            const ageMatch = !sensitiveParams.age ||
+                             (age >= targetingInfo.ageMin && age <= targetingInfo.ageMax);
+            
+            if (genderMatch) genderMatchCount += count;
+            if (ageMatch) ageMatchCount += count;
+            if (genderMatch && ageMatch) bothMatchCount += count;
         });
         
         // Calculate match percentages